@@ -0,0 +1,75 @@
+"""Measures the time spent importing waves in fresh interpreters.
+
+Usage::
+
+    python benchmarks/import_time.py [--runs 20] [--max-ms 50]
+
+Each statement is executed in a new Python process, so the modules are not
+cached, and the median of the runs is reported. If ``--max-ms`` is passed,
+exits with an error when importing the package takes longer, so it can be
+used to guard against regressions loading heavy dependencies eagerly.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+STATEMENTS = (
+    ("baseline", "pass"),
+    ("import waves", "import waves"),
+    ("from waves.catalog import probe", "from waves.catalog import probe"),
+    ("from waves import Sound", "from waves import Sound"),
+)
+
+
+def measure(statement, runs):
+    """Returns the median time, in seconds, spent executing a statement in
+    fresh interpreters.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Maximum time, over the baseline, allowed to 'import waves'.",
+    )
+    args = parser.parse_args(args)
+
+    baseline = None
+    for name, statement in STATEMENTS:
+        seconds = measure(statement, args.runs)
+        if baseline is None:
+            baseline = seconds
+            sys.stdout.write(f"{name:<36} {seconds * 1000:8.1f} ms\n")
+            continue
+        sys.stdout.write(
+            f"{name:<36} {seconds * 1000:8.1f} ms"
+            f" (+{(seconds - baseline) * 1000:.1f} ms)\n"
+        )
+        if name == "import waves":
+            import_waves = seconds - baseline
+
+    if args.max_ms is not None and import_waves * 1000 > args.max_ms:
+        sys.stderr.write(
+            f"'import waves' took {import_waves * 1000:.1f} ms, more than"
+            f" {args.max_ms} ms\n"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Measures the memory used by each sound opened from a file.
+
+Usage::
+
+    python benchmarks/memory_per_instance.py [--n-sounds 100000] [FILENAME]
+
+Opens the same file many times and reports the memory allocated by Python for
+each :py:class:`waves.Sound` instance, measured using :py:mod:`tracemalloc`.
+The memory used by the pool of opened files is not included, as is shared by
+all the sounds.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+
+DEFAULT_FILENAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "files",
+    "stereo.wav",
+)
+
+
+def measure(filename, n_sounds):
+    """Returns the number of bytes allocated for each sound opened from a file."""
+    from waves import Sound
+
+    Sound.from_file(filename)  # load the modules and fill the pool of files
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sounds = [Sound.from_file(filename) for _ in range(n_sounds)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(sounds) == n_sounds
+    return (after - before) / n_sounds
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("filename", nargs="?", default=DEFAULT_FILENAME)
+    parser.add_argument("--n-sounds", type=int, default=100000)
+    args = parser.parse_args(args)
+
+    n_bytes = measure(args.filename, args.n_sounds)
+    sys.stdout.write(f"{n_bytes:.0f} bytes per sound ({args.n_sounds} sounds)\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
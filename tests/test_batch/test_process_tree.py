@@ -0,0 +1,130 @@
+"""Tests for the batch processing of directory trees."""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.batch import JOURNAL_FILENAME, iter_files, process_tree
+
+
+def peak(sound):
+    return int(np.abs(sound.dataframes.astype(np.int32)).max())
+
+
+def halve(sound):
+    return sound.gain(-6.0206)
+
+
+@pytest.fixture
+def source(mono_filepath, stereo_filepath, tmp_path):
+    source = tmp_path / "source"
+    for i, subdirectory in enumerate(("a", "b/c", "d")):
+        (source / subdirectory).mkdir(parents=True)
+        shutil.copy(mono_filepath, str(source / subdirectory / f"mono{i}.wav"))
+        shutil.copy(stereo_filepath, str(source / subdirectory / f"stereo{i}.WAV"))
+    (source / "d" / "notes.txt").write_text("not a sound")
+    (source / "d" / "broken.wav").write_bytes(b"RIFF")
+    return str(source)
+
+
+def test_iter_files(source):
+    assert list(iter_files(source)) == [
+        os.path.join("a", "mono0.wav"),
+        os.path.join("a", "stereo0.WAV"),
+        os.path.join("b", "c", "mono1.wav"),
+        os.path.join("b", "c", "stereo1.WAV"),
+        os.path.join("d", "broken.wav"),
+        os.path.join("d", "mono2.wav"),
+        os.path.join("d", "stereo2.WAV"),
+    ]
+    assert list(iter_files(source, extensions=(".TXT",))) == [
+        os.path.join("d", "notes.txt")
+    ]
+
+
+@pytest.mark.parametrize("chunksize", (1, 4))
+def test_process_tree_operations(source, mono_sound, tmp_path, chunksize):
+    target = str(tmp_path / "target")
+    report = process_tree(
+        source,
+        target,
+        operations=[("gain", (-6,)), ("resample", (22050,), {"quality": "fast"})],
+        max_workers=2,
+        chunksize=chunksize,
+    )
+
+    assert report.n_files == 6
+    assert list(report.errors) == [os.path.join("d", "broken.wav")]
+    assert report.n_frames == sum(
+        Sound.from_file(os.path.join(target, relpath)).n_frames
+        for relpath in iter_files(target)
+    )
+    assert report.files_per_second > 0 and report.frames_per_second > 0
+
+    processed = Sound.from_file(os.path.join(target, "b", "c", "mono1.wav"))
+    assert processed.fps == 22050
+    assert np.array_equal(
+        processed.dataframes,
+        mono_sound.gain(-6).resample(22050, quality="fast").dataframes,
+    )
+
+
+def test_process_tree_function(source, stereo_sound, tmp_path):
+    target = str(tmp_path / "target")
+    report = process_tree(source, target, function=halve, subtype="float32")
+
+    assert report.n_files == 6
+    processed = Sound.from_file(os.path.join(target, "d", "stereo2.WAV"))
+    assert processed.dtype == np.float32
+    assert np.allclose(
+        processed.dataframes,
+        stereo_sound.dataframes / 2**16,
+        atol=2**-16,
+    )
+
+
+def test_process_tree_results(source, mono_sound, stereo_sound):
+    report = process_tree(source, function=peak, max_workers=3, chunksize=2)
+
+    assert report.n_files == 6
+    assert report.n_frames == 0
+    assert report.results == {
+        os.path.join(subdirectory, f"{name}{i}.{extension}"): peak(sound)
+        for i, subdirectory in enumerate(("a", os.path.join("b", "c"), "d"))
+        for name, extension, sound in (
+            ("mono", "wav", mono_sound),
+            ("stereo", "WAV", stereo_sound),
+        )
+    }
+
+
+def test_process_tree_resume(source, tmp_path):
+    target = str(tmp_path / "target")
+    journal = os.path.join(target, JOURNAL_FILENAME)
+    os.makedirs(target)
+    with open(journal, "w") as f:
+        f.write(f"{os.path.join('a', 'mono0.wav')}\n{os.path.join('d', 'mono2')}")
+
+    processed = []
+    report = process_tree(
+        source,
+        target,
+        function=halve,
+        callback=lambda relpath, n_frames, error: processed.append(relpath),
+    )
+    assert report.n_skipped == 1
+    assert report.n_files == 5
+    assert os.path.join("a", "mono0.wav") not in processed
+    assert not os.path.exists(os.path.join(target, "a", "mono0.wav"))
+
+    with open(journal) as f:
+        assert len(f.read().split()) == 7
+
+    report = process_tree(source, target, function=halve)
+    assert (report.n_files, report.n_skipped, report.n_errors) == (0, 6, 1)
+
+    report = process_tree(source, target, function=halve, resume=False)
+    assert (report.n_files, report.n_skipped) == (6, 0)
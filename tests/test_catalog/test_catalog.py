@@ -0,0 +1,120 @@
+"""Tests for the catalog of sounds layouts."""
+
+import os
+import shutil
+
+import pytest
+
+from waves import Sound
+from waves.catalog import Catalog, SoundInfo, probe
+
+
+@pytest.fixture
+def library(mono_filepath, stereo_filepath, tmp_path):
+    library = tmp_path / "library"
+    (library / "drums" / "kicks").mkdir(parents=True)
+    (library / "voices").mkdir()
+    shutil.copy(stereo_filepath, str(library / "drums" / "kicks" / "kick.wav"))
+    shutil.copy(mono_filepath, str(library / "voices" / "voice.wav"))
+    (library / "voices" / "broken.wav").write_bytes(b"not a sound")
+    (library / "voices" / "notes.txt").write_text("not a sound")
+    return str(library)
+
+
+@pytest.mark.parametrize(
+    ("subtype", "extension", "container"),
+    (
+        ("pcm16", "wav", "wav"),
+        ("pcm24", "wav", "wav"),
+        ("float32", "aiff", "aiff"),
+        ("pcm16", "rf64", "rf64"),
+        ("pcm16", "flac", "flac"),
+    ),
+)
+def test_probe(stereo_sound, tmp_path, subtype, extension, container):
+    filename = str(tmp_path / f"sound.{extension}")
+    stereo_sound[:1000].save(filename, subtype=subtype)
+
+    info = probe(filename)
+    assert info == SoundInfo(container, subtype, 2, 44100, 1000)
+    assert info.duration == 1000 / 44100
+
+    if extension == "flac":
+        assert probe(filename, fallback=False) is None
+
+
+def test_probe_matches_from_file(mono_sound, mono_filepath):
+    info = probe(mono_filepath)
+    assert (info.n_channels, info.fps, info.n_frames) == (
+        mono_sound.n_channels,
+        mono_sound.fps,
+        mono_sound.n_frames,
+    )
+
+
+def test_catalog_update_and_query(library, tmp_path):
+    database = str(tmp_path / "catalog.sqlite3")
+    kick = os.path.join(library, "drums", "kicks", "kick.wav")
+    voice = os.path.join(library, "voices", "voice.wav")
+
+    with Catalog(database) as catalog:
+        assert catalog.update(library) == (3, 0, 0, 0, 1)
+        assert len(catalog) == 3
+
+        assert [entry.filename for entry in catalog.query()] == [kick, voice]
+        assert [entry.filename for entry in catalog.query(n_channels=2)] == [kick]
+        assert [entry.filename for entry in catalog.query(min_duration=2)] == [voice]
+        assert list(catalog.query(max_duration=1)) == []
+
+        entry = next(catalog.query(encoding="pcm16", fps=44100, container="wav"))
+        assert entry.n_frames == 55216
+        assert entry.size == os.stat(kick).st_size
+
+    # persisted and incrementally updated
+    Sound.from_file(kick)[:1000].save(voice)
+    os.remove(os.path.join(library, "voices", "broken.wav"))
+    with Catalog(database) as catalog:
+        assert catalog.update(library) == (0, 1, 1, 1, 0)
+        assert [entry.n_frames for entry in catalog.query(n_channels=2)] == [
+            55216,
+            1000,
+        ]
+
+
+def test_catalog_update_subdirectory(library, tmp_path):
+    with Catalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        catalog.update(library)
+        assert catalog.update(os.path.join(library, "voices")) == (0, 0, 0, 2, 0)
+        assert len(catalog) == 3
+
+
+def test_catalog_doesnt_open_pcm_files(library, tmp_path, monkeypatch):
+    import pysndfile
+
+    def fail(*args, **kwargs):
+        raise AssertionError("libsndfile used")
+
+    monkeypatch.setattr(pysndfile, "PySndfile", fail)
+    with Catalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        assert catalog.update(library, fallback=False).added == 3
+        assert sum(entry.n_frames for entry in catalog.query()) == 55216 + 106022
+
+
+def test_catalog_update_zero_rate_header(library, tmp_path):
+    kick = os.path.join(library, "drums", "kicks", "kick.wav")
+    with open(kick, "rb") as f:
+        data = bytearray(f.read())
+    rate_offset = data.index(b"fmt ") + 12
+    data[rate_offset : rate_offset + 4] = bytes(4)
+    zero_rate = os.path.join(library, "voices", "zero_rate.wav")
+    with open(zero_rate, "wb") as f:
+        f.write(data)
+
+    assert probe(zero_rate, fallback=False) is None
+    with Catalog(str(tmp_path / "catalog.sqlite3")) as catalog:
+        update = catalog.update(library)
+        assert (update.added, update.errors) == (4, 2)
+        assert [entry.filename for entry in catalog.query()] == [
+            kick,
+            os.path.join(library, "voices", "voice.wav"),
+        ]
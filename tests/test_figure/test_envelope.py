@@ -0,0 +1,73 @@
+"""Tests for the envelope rendering of sound figures."""
+
+import matplotlib
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.figure import envelope, figure
+
+
+matplotlib.use("Agg")
+
+
+@pytest.mark.parametrize("n_bins", (1, 7, 640, 55216))
+@pytest.mark.parametrize("buffersize", (1000, 4096, None))
+def test_envelope_matches_data(stereo_sound, n_bins, buffersize):
+    data = stereo_sound.dataframes
+    times, minimums, maximums = envelope(stereo_sound, n_bins, buffersize=buffersize)
+
+    edges = np.arange(n_bins + 1) * len(data) // n_bins
+    assert np.array_equal(minimums, np.minimum.reduceat(data, edges[:-1], axis=0))
+    assert np.array_equal(maximums, np.maximum.reduceat(data, edges[:-1], axis=0))
+    assert len(times) == n_bins
+    assert 0 <= times[0] <= times[-1] < stereo_sound.duration
+
+
+def test_envelope_mono_shorter_than_bins(mono_sound):
+    times, minimums, maximums = envelope(mono_sound[:100], 800)
+    assert minimums.shape == maximums.shape == (100, 1)
+    assert np.array_equal(minimums[:, 0], mono_sound.dataframes[:100])
+
+
+def test_envelope_function_stopped_early(mono_sound):
+    frames = mono_sound.dataframes
+
+    def index_to_frame(i):
+        if i >= 5000:
+            raise StopIteration
+        return frames[i]
+
+    sound = Sound.from_dataframes(index_to_frame, fps=mono_sound.fps)
+    sound.n_frames = 10000
+    times, minimums, maximums = envelope(sound, 100, buffersize=1000)
+    assert len(times) == len(minimums) == len(maximums) == 50
+    assert np.array_equal(minimums[:, 0], frames[:5000].reshape(50, 100).min(axis=1))
+
+
+def test_figure_envelope_independent_of_duration(stereo_sound):
+    fig, axes = figure(stereo_sound, n_bins=500)
+    assert len(axes) == 2
+    for ax in axes:
+        assert not ax.lines
+        (collection,) = ax.collections
+        assert len(collection.get_paths()[0].vertices) < 2000
+    matplotlib.pyplot.close(fig)
+
+
+def test_figure_full_resolution(mono_sound):
+    sound = mono_sound[:3000]
+    fig, axes = figure(sound, full_resolution=True, n_bins=2000)
+    (line,) = axes[0].lines
+    assert np.array_equal(line.get_ydata(), sound.dataframes)
+    matplotlib.pyplot.close(fig)
+
+    # short ranges are plotted frame by frame
+    fig, axes = figure(sound[:1000], n_bins=2000)
+    assert len(axes[0].lines[0].get_ydata()) == 1000
+    matplotlib.pyplot.close(fig)
+
+
+def test_figure_unknown_duration(mono_ttf_gen):
+    with pytest.raises(ValueError, match="duration"):
+        figure(Sound.from_datatimes(mono_ttf_gen()))
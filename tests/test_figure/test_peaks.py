@@ -0,0 +1,137 @@
+"""Tests for the multi-resolution peak files."""
+
+import concurrent.futures
+import os
+import shutil
+
+import matplotlib
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.figure import figure
+from waves.sound.peaks import PeakPyramid, get_peaks, sidecar_filename
+
+
+matplotlib.use("Agg")
+
+
+@pytest.fixture
+def stereo_copy(stereo_filepath, tmp_path):
+    filename = str(tmp_path / "stereo.wav")
+    shutil.copy(stereo_filepath, filename)
+    return filename
+
+
+@pytest.mark.parametrize("buffersize", (256, 1000, None))
+def test_build_levels(stereo_sound, buffersize):
+    pyramid = PeakPyramid.build(stereo_sound, base=256, factor=4, buffersize=buffersize)
+    data = stereo_sound.dataframes.astype(np.float64)
+
+    assert pyramid.n_frames == stereo_sound.n_frames
+    assert pyramid.dtype == np.int16
+    bin_frames = 256
+    for minimums, maximums, rms in pyramid.levels:
+        indexes = np.arange(0, len(data), bin_frames)
+        counts = np.diff(np.append(indexes, len(data)))[:, np.newaxis]
+        assert np.array_equal(minimums, np.minimum.reduceat(data, indexes, axis=0))
+        assert np.array_equal(maximums, np.maximum.reduceat(data, indexes, axis=0))
+        assert np.allclose(
+            rms, np.sqrt(np.add.reduceat(data**2, indexes, axis=0) / counts)
+        )
+        bin_frames *= 4
+    assert len(pyramid.levels[-1][0]) == 1
+
+
+@pytest.mark.parametrize(
+    "start, stop, n_bins", ((0, None, 10), (0, 44100, 100), (1000, 30000, 7))
+)
+def test_query_matches_data(stereo_sound, start, stop, n_bins):
+    pyramid = PeakPyramid.build(stereo_sound)
+    times, minimums, maximums, rms = pyramid.query(start, stop, n_bins=n_bins)
+    data = stereo_sound.dataframes[start:stop]
+
+    assert minimums.shape == maximums.shape == rms.shape == (n_bins, 2)
+    assert np.array_equal(minimums.min(axis=0), data.min(axis=0))
+    assert np.array_equal(maximums.max(axis=0), data.max(axis=0))
+    assert np.all(np.diff(times) > 0)
+    bounds = np.maximum(np.abs(minimums.astype(float)), np.abs(maximums.astype(float)))
+    assert np.all(rms <= bounds)
+
+
+def test_query_too_zoomed_in(stereo_sound):
+    pyramid = PeakPyramid.build(stereo_sound, base=256)
+    assert pyramid.query(0, 256 * 100, n_bins=100) is not None
+    assert pyramid.query(0, 256 * 100 - 1, n_bins=100) is None
+
+
+def test_sidecar_reused_and_rebuilt_when_stale(stereo_copy, stereo_sound):
+    sound = Sound.from_file(stereo_copy)
+    pyramid = get_peaks(sound)
+    assert os.path.exists(sidecar_filename(stereo_copy))
+    assert not pyramid.is_stale(stereo_copy)
+
+    loaded = get_peaks(Sound.from_file(stereo_copy))
+    assert loaded.source == pyramid.source
+    for level, loaded_level in zip(pyramid.levels, loaded.levels):
+        for array, loaded_array in zip(level, loaded_level):
+            assert np.array_equal(array, loaded_array)
+
+    stereo_sound[:1000].save(stereo_copy)
+    assert loaded.is_stale(stereo_copy)
+    rebuilt = get_peaks(Sound.from_file(stereo_copy))
+    assert rebuilt.n_frames == 1000
+    assert PeakPyramid.load(sidecar_filename(stereo_copy)).n_frames == 1000
+
+
+@pytest.mark.parametrize("length", (None, 0, 100, -100))
+def test_sidecar_invalid_file(stereo_copy, length):
+    sidecar = sidecar_filename(stereo_copy)
+    if length is None:
+        content = b"not a peak file"
+    else:
+        # empty or truncated peak files
+        get_peaks(Sound.from_file(stereo_copy))
+        with open(sidecar, "rb") as f:
+            content = f.read()[:length]
+    with open(sidecar, "wb") as f:
+        f.write(content)
+
+    assert PeakPyramid.load(sidecar) is None
+    assert get_peaks(Sound.from_file(stereo_copy)).n_frames == 55216
+    assert PeakPyramid.load(sidecar).n_frames == 55216
+
+
+def test_sidecar_saved_concurrently(stereo_copy):
+    pyramid = PeakPyramid.build(Sound.from_file(stereo_copy))
+    sidecar = sidecar_filename(stereo_copy)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(pyramid.save, [sidecar] * 32))
+
+    assert PeakPyramid.load(sidecar).n_frames == 55216
+    assert sorted(os.listdir(os.path.dirname(sidecar))) == [
+        "stereo.wav",
+        "stereo.wav.peaks",
+    ]
+
+
+def test_get_peaks_of_slice_summarizes_whole_file(stereo_copy):
+    pyramid = get_peaks(Sound.from_file(stereo_copy)[1000:2000])
+    assert pyramid.n_frames == 55216
+
+
+def test_get_peaks_requires_file(stereo_ttf_gen):
+    sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(1)
+    with pytest.raises(ValueError, match="files"):
+        get_peaks(sound)
+
+
+def test_figure_from_peaks(stereo_copy):
+    sound = Sound.from_file(stereo_copy)[10000:50000]
+    fig, axes = figure(sound, n_bins=100, peaks=True)
+    assert os.path.exists(sidecar_filename(stereo_copy))
+
+    _, minimums, _, _ = get_peaks(sound).query(10000, 50000, n_bins=100)
+    vertices = axes[0].collections[0].get_paths()[0].vertices
+    assert vertices[:, 1].min() == minimums[:, 0].min()
+    matplotlib.pyplot.close(fig)
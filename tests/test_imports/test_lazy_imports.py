@@ -0,0 +1,58 @@
+"""Tests for the lazy loading of the package and its dependencies."""
+
+import subprocess
+import sys
+
+import pytest
+
+import waves
+
+
+HEAVY_MODULES = ("numpy", "pysndfile", "matplotlib", "pygame")
+
+
+def _imported_modules(statement):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}\nimport sys\nprint(' '.join(sys.modules))",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="PEP 562 requires Python 3.7")
+@pytest.mark.parametrize(
+    "statement",
+    (
+        "import waves",
+        "import waves.sound",
+        "from waves import __version__",
+        "from waves.catalog import probe; probe({mono_filepath!r})",
+    ),
+)
+def test_heavy_dependencies_not_imported(statement, mono_filepath):
+    statement = statement.format(mono_filepath=mono_filepath)
+    assert not _imported_modules(statement) & set(HEAVY_MODULES)
+
+
+def test_lazy_attributes():
+    assert waves.Sound is waves.sound.main.Sound
+    assert waves.mono_ttf_gen is waves.sound.generator.mono_ttf_gen
+    assert waves.sound.cache.get_cache() is None
+    assert "Sound" in dir(waves)
+    assert "ops" in dir(waves.sound)
+
+    with pytest.raises(AttributeError, match="unknown"):
+        waves.unknown
+    with pytest.raises(AttributeError, match="unknown"):
+        waves.sound.unknown
+
+
+def test_import_sound_loads_dependencies():
+    modules = _imported_modules("from waves import Sound")
+    assert {"numpy", "pysndfile", "waves.sound.main"} <= modules
@@ -0,0 +1,85 @@
+"""Tests for the automatic sizing of blocks of frames."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.buffersize import MIN_BUFFERSIZE, BufferSizer, get_sizer
+
+
+@pytest.fixture
+def sizer():
+    sizer = get_sizer()
+    memory_budget, throughputs = (sizer.memory_budget, sizer._throughputs.copy())
+    yield sizer
+    sizer.memory_budget, sizer._throughputs = (memory_budget, throughputs)
+
+
+def test_choose_power_of_two_bounded_by_sound(stereo_sound):
+    sizer = BufferSizer()
+    assert sizer.choose(stereo_sound) == stereo_sound.n_frames
+
+    sizer.memory_budget = 100000
+    buffersize = sizer.choose(stereo_sound)
+    assert buffersize == sizer.last_buffersize == 16384
+    assert MIN_BUFFERSIZE <= buffersize <= stereo_sound.n_frames
+    assert sizer.choose(stereo_sound[:100]) == 100
+
+
+def test_choose_from_throughput(stereo_sound):
+    sizer = BufferSizer(memory_budget=2**30, target_seconds=0.01)
+    sizer.observe("file", 4 * 2**20, 1.0)  # 1 Mi frames per second
+    assert sizer.choose(stereo_sound) == 8192
+
+    sizer.observe("file", 4 * 2**20, 1.0)
+    sizer.observe("function", 4 * 2**10, 1.0)
+    assert sizer.choose(stereo_sound, source="file") == 8192
+    assert sizer.choose(stereo_sound, source="function") == MIN_BUFFERSIZE
+
+
+def test_choose_capped_by_memory_budget(stereo_sound):
+    sizer = BufferSizer(memory_budget=2**12)
+    sizer.observe("file", 2**40, 1.0)
+    assert sizer.choose(stereo_sound) == 2**10
+    assert stereo_sound.n_channels * 2 * sizer.choose(stereo_sound) <= 2**12
+
+    sizer.memory_budget = 1000  # lower than the minimum
+    assert sizer.choose(stereo_sound) == 128
+
+
+def test_iter_chunks_auto_buffersize(sizer, stereo_filepath):
+    sizer.memory_budget = 2**14
+    sound = Sound.from_file(stereo_filepath)
+    chunks = list(sound.iter_chunks())
+
+    assert len(chunks[0]) == sizer.last_buffersize == 2**12
+    assert np.array_equal(np.concatenate(chunks), sound.dataframes)
+    assert sizer.throughputs["file"] > 0
+
+
+def test_iter_chunks_explicit_buffersize_wins(sizer, stereo_sound):
+    sizer.memory_budget = 2**14
+    chunks = list(stereo_sound.iter_chunks(buffersize=10000))
+    assert [len(chunk) for chunk in chunks[:-1]] == [10000] * (len(chunks) - 1)
+
+
+def test_iter_chunks_auto_buffersize_out(stereo_sound):
+    out = np.empty((3000, 2), dtype=stereo_sound.dtype)
+    chunks = list(stereo_sound.iter_chunks(out=out))
+    assert len(chunks[0]) == 3000
+
+
+def test_iter_datatimes_auto_buffersize(sizer, stereo_ttf_gen):
+    sizer.memory_budget = 2**12
+    sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(0.1)
+    times = [time for time, _ in sound.iter_datatimes]
+    assert np.allclose(times, np.arange(sound.n_frames) / sound.fps)
+
+
+def test_save_auto_buffersize(sizer, stereo_sound, tmp_path):
+    sizer.memory_budget = 2**14
+    filename = str(tmp_path / "saved.wav")
+
+    assert stereo_sound.save(filename) == stereo_sound.n_frames
+    assert sizer.last_buffersize == 2**12
+    assert np.array_equal(Sound.from_file(filename).dataframes, stereo_sound.dataframes)
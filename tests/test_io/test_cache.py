@@ -0,0 +1,81 @@
+"""Tests for the process-wide cache of decoded audio data."""
+
+import os
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound import cache
+
+
+@pytest.fixture
+def decoded_cache():
+    yield cache.enable(max_bytes=2**20)
+    cache.disable()
+
+
+def test_cache_disabled_by_default(mono_sound):
+    assert cache.get_cache() is None
+    assert mono_sound.data is not mono_sound.data
+
+
+def test_cache_shared_between_sounds(decoded_cache, mono_filepath):
+    data = Sound.from_file(mono_filepath).data
+    assert decoded_cache.stats["misses"] == 1
+
+    other_data = Sound.from_file(mono_filepath).data
+    assert decoded_cache.stats["hits"] == 1
+    assert decoded_cache.hit_rate == 0.5
+
+    assert other_data is data
+    assert not data.flags.writeable
+    assert decoded_cache.n_bytes == data.nbytes
+
+
+def test_cache_eviction(decoded_cache, mono_sound, stereo_sound):
+    decoded_cache.max_bytes = max(
+        sound.n_frames * sound.n_channels * sound.n_bytes
+        for sound in (mono_sound, stereo_sound)
+    )
+
+    mono_sound.data
+    stereo_sound.data
+    assert len(decoded_cache) == 1
+    assert decoded_cache.evictions == 1
+    assert decoded_cache.n_bytes <= decoded_cache.max_bytes
+
+    stereo_sound.data
+    assert decoded_cache.hits == 1
+    mono_sound.data
+    assert decoded_cache.misses == 3
+
+
+def test_cache_invalidated_by_modification(decoded_cache, stereo_sound, tmp_path):
+    filename = (tmp_path / "stereo.wav").as_posix()
+    stereo_sound.save(filename)
+    sound = Sound.from_file(filename)
+    data = sound.data
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert np.array_equal(sound.data, data)
+    assert decoded_cache.misses == 2
+
+
+def test_cache_budget_reduced(decoded_cache, mono_sound, stereo_sound):
+    mono_data, stereo_data = (mono_sound.data, stereo_sound.data)
+    assert len(decoded_cache) == 2
+
+    # the least recently used arrays are discarded until the rest fit
+    mono_sound.data
+    assert cache.enable(max_bytes=mono_data.nbytes) is decoded_cache
+    assert len(decoded_cache) == 1
+    assert decoded_cache.n_bytes == mono_data.nbytes
+    assert decoded_cache.evictions == 1
+    assert mono_sound.data is mono_data
+
+    cache.enable(max_bytes=2**20)
+    assert stereo_sound.data is not stereo_data
+    assert len(decoded_cache) == 2
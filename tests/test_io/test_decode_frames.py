@@ -0,0 +1,69 @@
+"""Tests for the vectorized PCM frames decoder."""
+
+import numpy as np
+import pytest
+
+from waves.sound.pcm import decode_frames
+
+
+@pytest.mark.parametrize("byteorder", ("<", ">"))
+@pytest.mark.parametrize("n_channels", (1, 2, 5))
+@pytest.mark.parametrize(
+    "encoding, dtype",
+    (("pcm16", "i2"), ("pcm32", "i4"), ("float32", "f4"), ("float64", "f8")),
+)
+def test_decode_frames(byteorder, n_channels, encoding, dtype):
+    frames = (np.arange(300 * n_channels) * 7 - 10000).reshape(300, n_channels)
+    data = frames.astype(byteorder + dtype).tobytes()
+    decoded = decode_frames(data, n_channels, encoding=encoding, byteorder=byteorder)
+
+    assert decoded.dtype == np.dtype(dtype)
+    assert decoded.dtype.isnative
+    assert np.array_equal(decoded, frames[:, 0] if n_channels == 1 else frames)
+
+
+@pytest.mark.parametrize("byteorder", ("<", ">"))
+@pytest.mark.parametrize("n_channels", (1, 3))
+def test_decode_frames_pcm24(byteorder, n_channels):
+    samples = np.arange(-(2**23), 2**23, 4099).astype(np.int32)
+    samples = samples[: len(samples) // n_channels * n_channels]
+    # 24 bits samples are the most significant bytes of the shifted samples
+    packed = (samples << 8).astype(byteorder + "i4").view(np.uint8).reshape(-1, 4)
+    packed = packed[:, 1:] if byteorder == "<" else packed[:, :3]
+
+    decoded = decode_frames(packed.tobytes(), n_channels, "pcm24", byteorder)
+    expected = samples << 8
+    assert decoded.dtype == np.int32
+    assert np.array_equal(
+        decoded, expected if n_channels == 1 else expected.reshape(-1, n_channels)
+    )
+
+
+def test_decode_frames_8bits():
+    data = bytes(range(256))
+    assert np.array_equal(
+        decode_frames(data, encoding="pcmu8"), np.arange(-128, 128, dtype=np.int8)
+    )
+    assert np.array_equal(
+        decode_frames(data, encoding="pcms8"), np.arange(256).astype(np.int8)
+    )
+
+
+def test_decode_frames_zero_copy():
+    data = np.arange(100, dtype="<i2").tobytes()
+    decoded = decode_frames(data, n_channels=2)
+    assert not decoded.flags.owndata
+    assert decoded.shape == (50, 2)
+
+
+@pytest.mark.parametrize(
+    "kwargs, match",
+    (
+        ({"encoding": "pcm12"}, "encoding"),
+        ({"byteorder": "="}, "byte order"),
+        ({"n_channels": 3}, "multiple"),
+    ),
+)
+def test_decode_frames_invalid(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        decode_frames(bytes(8), **kwargs)
@@ -0,0 +1,110 @@
+"""Tests for ``from_array`` and ``from_buffer`` zero-copy class methods."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+def test_from_array_interleaved(stereo_sound):
+    frames = stereo_sound.dataframes.copy()
+    sound = Sound.from_array(frames, fps=stereo_sound.fps)
+
+    assert (sound.n_frames, sound.n_channels, sound.n_bytes) == (len(frames), 2, 2)
+    assert sound.dtype == np.int16
+    assert sound.dataframes is frames or np.shares_memory(sound.dataframes, frames)
+    assert np.shares_memory(sound.data, frames)
+    assert np.shares_memory(sound[100:200].dataframes, frames)
+    for chunk in sound.iter_chunks(buffersize=1000):
+        assert np.shares_memory(chunk, frames)
+
+
+def test_from_array_planar(stereo_sound):
+    data = np.ascontiguousarray(stereo_sound.data)
+    sound = Sound.from_array(data, planar=True)
+
+    assert sound.n_channels == 2
+    assert np.array_equal(sound.dataframes, stereo_sound.dataframes)
+    assert np.shares_memory(sound.dataframes, data)
+
+
+@pytest.mark.parametrize("shape", ((1000,), (1000, 1)))
+def test_from_array_mono(shape):
+    array = np.arange(1000, dtype=np.float32).reshape(shape)
+    sound = Sound.from_array(array, fps=8000)
+
+    assert (sound.n_channels, sound.n_bytes, sound.dtype) == (1, 4, np.float32)
+    assert sound.dataframes.shape == (1000,)
+    assert sound.duration == 0.125
+
+
+def test_from_array_modified_in_place():
+    array = np.zeros(100, dtype=np.int16)
+    sound = Sound.from_array(array)
+    array[10] = 7
+    assert sound.dataframes[10] == 7
+
+
+@pytest.mark.parametrize(
+    "array", (np.zeros((2, 2, 2), dtype=np.int16), np.array(["a", "b"]))
+)
+def test_from_array_invalid(array):
+    with pytest.raises(ValueError, match="dimensional"):
+        Sound.from_array(array)
+
+
+def test_from_array_save(stereo_sound, tmp_path):
+    filename = str(tmp_path / "saved.wav")
+    sound = Sound.from_array(stereo_sound.data, planar=True, fps=stereo_sound.fps)
+
+    assert sound.save(filename) == stereo_sound.n_frames
+    assert np.array_equal(Sound.from_file(filename).dataframes, stereo_sound.dataframes)
+
+
+def test_from_buffer_bytes(stereo_sound):
+    raw = stereo_sound.dataframes.tobytes()
+    sound = Sound.from_buffer(raw, dtype=np.int16, n_channels=2, fps=stereo_sound.fps)
+
+    assert np.array_equal(sound.dataframes, stereo_sound.dataframes)
+    assert not sound.dataframes.flags.writeable
+    assert np.concatenate(list(sound.iter_chunks(4096))).tobytes() == raw
+
+
+def test_from_buffer_shares_memory():
+    raw = bytearray(400)
+    sound = Sound.from_buffer(memoryview(raw), dtype="<i2", n_channels=2)
+    raw[0:2] = (1000).to_bytes(2, "little")
+
+    assert sound.n_frames == 100
+    assert sound.dataframes[0, 0] == 1000
+
+
+def test_from_buffer_planar_big_endian(stereo_sound, tmp_path):
+    raw = np.ascontiguousarray(stereo_sound.data).astype(">i2").tobytes()
+    sound = Sound.from_buffer(raw, dtype=">i2", n_channels=2, planar=True)
+
+    assert np.array_equal(sound.dataframes, stereo_sound.dataframes)
+    filename = str(tmp_path / "saved.wav")
+    sound.save(filename, subtype="pcm16")
+    assert np.array_equal(Sound.from_file(filename).dataframes, stereo_sound.dataframes)
+
+
+def test_from_buffer_invalid_size():
+    with pytest.raises(ValueError, match="multiple"):
+        Sound.from_buffer(bytes(7), dtype=np.int16, n_channels=2)
+
+
+def test_from_array_unsigned(tmp_path):
+    sound = Sound.from_array(np.full(1000, 128, dtype=np.uint8))
+    assert (sound.dtype, sound.n_bytes) == (np.int8, 1)
+    assert not sound.dataframes.any()
+    assert not sound.gain(0).dataframes.any()
+
+    filename = str(tmp_path / "silence.wav")
+    sound.save(filename, subtype="float32")
+    assert not Sound.from_file(filename).dataframes.any()
+
+    samples = np.array([0, 32768, 65535], dtype=">u2")
+    sound = Sound.from_buffer(samples.tobytes(), dtype=">u2")
+    assert sound.dtype == np.int16
+    assert sound.dataframes.tolist() == [-32768, 0, 32767]
@@ -4,6 +4,7 @@ import struct
 import wave
 
 import numpy as np
+import pytest
 
 from waves import Sound
 
@@ -57,3 +58,51 @@ def test_from_byteframes_stereo(stereo_filepath):
         hexframe = index_to_hexframe(i)
         assert frame[0] == np.frombuffer(hexframe[0], dtype=np.int16)[0]
         assert frame[1] == np.frombuffer(hexframe[1], dtype=np.int16)[0]
+
+
+@pytest.mark.parametrize(
+    "encoding, byteorder, dtype",
+    (
+        ("pcm16", "<", "<i2"),
+        ("pcm16", ">", ">i2"),
+        ("pcm32", ">", ">i4"),
+        ("float32", "<", "<f4"),
+    ),
+)
+@pytest.mark.parametrize("n_channels", (1, 3, 6))
+def test_from_byteframes_n_channels(encoding, byteorder, dtype, n_channels):
+    frames = (np.arange(2000 * n_channels) - 3000).reshape(2000, n_channels)
+    frames = frames.astype(dtype)
+
+    def index_to_hexframe(i):
+        if i >= len(frames):
+            raise StopIteration
+        if n_channels == 1:
+            return frames[i].tobytes()
+        return [frames[i, j : j + 1].tobytes() for j in range(n_channels)]
+
+    sound = Sound.from_byteframes(
+        index_to_hexframe, encoding=encoding, byteorder=byteorder
+    )
+    assert sound.n_channels == n_channels
+    assert sound.vectorized
+    expected = frames.astype(np.dtype(dtype).newbyteorder("="))
+    assert np.array_equal(
+        sound.dataframes, expected[:, 0] if n_channels == 1 else expected
+    )
+    assert sound.n_frames == 2000
+
+
+def test_from_byteframes_pcm24_and_u8():
+    samples = [b"\x01\x02\x83", b"\xff\xff\x7f"]
+    sound = Sound.from_byteframes(lambda i: samples, encoding="pcm24").with_duration(1)
+    assert sound.dtype == np.int32
+    assert sound.dataframes[0].tolist() == [-2097020672, 2147483392]
+
+    sound = Sound.from_byteframes(lambda i: b"\x00", encoding="pcmu8")
+    assert sound.time_to_frame(0) == -128
+
+
+def test_from_byteframes_invalid_encoding():
+    with pytest.raises(ValueError, match="encoding"):
+        Sound.from_byteframes(lambda i: b"\x00\x00", encoding="pcm24")
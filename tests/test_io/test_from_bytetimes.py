@@ -57,3 +57,17 @@ def test_from_bytetimes_stereo(stereo_filepath):
         hexframe = time_to_hexframe(t)
         assert frame[0] == np.frombuffer(hexframe[0], dtype=np.int16)[0]
         assert frame[1] == np.frombuffer(hexframe[1], dtype=np.int16)[0]
+
+
+def test_from_bytetimes_n_channels():
+    frames = (np.arange(8000) * 7).astype(">i2").reshape(1000, 8)
+    fps = 1000
+
+    def time_to_hexframe(t):
+        frame = frames[int(round(t * fps))]
+        return [frame[j : j + 1].tobytes() for j in range(8)]
+
+    sound = Sound.from_bytetimes(time_to_hexframe, fps=fps, byteorder=">")
+    sound.n_frames = 1000
+    assert sound.n_channels == 8
+    assert np.array_equal(sound.dataframes, frames.astype(np.int16))
@@ -0,0 +1,77 @@
+"""Tests for opening memory mapped files using ``from_file`` class method."""
+
+import sys
+
+import numpy as np
+import pysndfile as snd
+import pytest
+
+from waves import Sound
+from waves.sound.pcm import read_header
+
+
+def _write(filename, data, container, encoding, fps=44100):
+    with snd.PySndfile(
+        filename,
+        "w",
+        format=snd.construct_format(container, encoding),
+        channels=1 if data.ndim == 1 else data.shape[1],
+        samplerate=fps,
+    ) as f:
+        f.write_frames(data)
+
+
+@pytest.mark.parametrize("filepath_fixture", ("mono_filepath", "stereo_filepath"))
+def test_from_file_mmap(filepath_fixture, request):
+    filepath = request.getfixturevalue(filepath_fixture)
+    sound = Sound.from_file(filepath, mmap=True)
+    decoded_sound = Sound.from_file(filepath)
+
+    assert isinstance(sound.buffer, np.memmap)
+    assert np.shares_memory(sound.data, sound.buffer)
+    assert np.shares_memory(sound.dataframes, sound.buffer)
+
+    assert np.array_equal(sound.data, decoded_sound.data)
+    assert np.array_equal(sound.dataframes, decoded_sound.dataframes)
+    assert sound.metadata == decoded_sound.metadata
+
+    chunks = list(sound.iter_chunks(buffersize=1000))
+    assert np.array_equal(np.concatenate(chunks), decoded_sound.dataframes)
+
+
+@pytest.mark.parametrize(
+    ("container", "encoding", "dtype", "mapped"),
+    (
+        ("wav", "pcm16", np.int16, True),
+        ("wav", "float32", np.float32, True),
+        ("wav", "pcm24", np.int32, False),
+        # AIFF samples are big endian, mapped only in big endian machines
+        ("aiff", "pcm16", np.int16, sys.byteorder == "big"),
+        ("aiff", "pcm32", np.int32, sys.byteorder == "big"),
+    ),
+)
+def test_from_file_mmap_formats(
+    stereo_sound, tmp_path, container, encoding, dtype, mapped
+):
+    filename = (tmp_path / f"stereo.{container}").as_posix()
+    _write(filename, stereo_sound.dataframes, container, encoding)
+
+    header = read_header(filename)
+    assert header.container == container
+    assert header.encoding == encoding
+    assert header.n_channels == 2
+    assert header.fps == 44100
+    assert header.n_frames == stereo_sound.n_frames
+
+    sound = Sound.from_file(filename, mmap=True)
+    assert isinstance(sound.buffer, np.memmap) is mapped
+    assert sound.dataframes.dtype == np.dtype(sound.dtype)
+    assert sound.dataframes.dtype.isnative
+    assert np.array_equal(
+        sound.dataframes, Sound.from_file(filename).dataframes.astype(dtype)
+    )
+
+
+def test_from_file_mmap_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Sound.from_file((tmp_path / "foo.wav").as_posix(), mmap=True)
@@ -0,0 +1,62 @@
+"""Tests for ``from_files`` concurrent opener class method."""
+
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+@pytest.fixture
+def filenames(mono_filepath, stereo_filepath, tmp_path):
+    missing = os.path.join(str(tmp_path), "missing.wav")
+    return [mono_filepath, stereo_filepath, missing, str(tmp_path)] * 5
+
+
+@pytest.mark.parametrize("max_workers", (1, 3, None))
+def test_from_files_ordered(filenames, max_workers):
+    results = list(Sound.from_files(filenames, max_workers=max_workers))
+
+    assert [filename for filename, _ in results] == filenames
+    for (filename, sound), expected in zip(results, itertools.cycle(range(4))):
+        if expected < 2:
+            assert isinstance(sound, Sound)
+            assert sound.n_channels == expected + 1
+            assert sound.buffer is None
+        elif expected == 2:
+            assert isinstance(sound, FileNotFoundError)
+        else:
+            assert isinstance(sound, IsADirectoryError)
+
+
+def test_from_files_as_completed(filenames):
+    results = list(Sound.from_files(filenames, max_workers=4, ordered=False))
+
+    assert sorted(filename for filename, _ in results) == sorted(filenames)
+    assert sum(isinstance(sound, Sound) for _, sound in results) == 10
+
+
+@pytest.mark.parametrize("mmap", (False, True))
+def test_from_files_decode(mono_sound, stereo_sound, filenames, mmap):
+    results = Sound.from_files(filenames[:2], decode=True, mmap=mmap)
+
+    for (_, sound), expected in zip(results, (mono_sound, stereo_sound)):
+        assert sound.buffer is not None
+        assert isinstance(sound.buffer, np.memmap) is mmap
+        assert np.array_equal(sound.dataframes, expected.dataframes)
+
+
+def test_from_files_lazy_iterable(mono_filepath):
+    opened = []
+
+    def filenames():
+        for i in range(1000):
+            opened.append(i)
+            yield mono_filepath
+
+    results = Sound.from_files(filenames(), max_workers=2)
+    next(results)
+    assert len(opened) <= 6
+    results.close()
@@ -0,0 +1,154 @@
+"""Tests for the pool of opened files shared by the sounds."""
+
+import concurrent.futures
+import os
+import shutil
+import threading
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.handles import get_pool
+
+
+@pytest.fixture
+def pool():
+    pool = get_pool()
+    max_handles = pool.max_handles
+    pool.clear()
+    yield pool
+    pool.max_handles = max_handles
+    pool.clear()
+
+
+@pytest.fixture
+def filenames(mono_filepath, tmp_path):
+    filenames = []
+    for i in range(10):
+        filename = os.path.join(str(tmp_path), f"{i}.wav")
+        shutil.copy(mono_filepath, filename)
+        filenames.append(filename)
+    return filenames
+
+
+def test_pool_bounds_opened_files(pool, filenames, mono_sound):
+    pool.max_handles = 4
+    stats = pool.stats
+    sounds = [Sound.from_file(filename) for filename in filenames * 3]
+    assert len(pool) == 4
+
+    for sound in sounds:
+        assert np.array_equal(
+            sound[1000:2000].dataframes, mono_sound.dataframes[1000:2000]
+        )
+    assert len(pool) == 4
+    assert pool.evictions > stats["evictions"]
+    assert pool.reopens > stats["reopens"]
+    assert pool.stats["size"] == 4
+
+
+def test_pool_reuses_opened_files(pool, mono_filepath):
+    stats = pool.stats
+    sound = Sound.from_file(mono_filepath)
+    chunks = list(sound.iter_chunks(buffersize=10000))
+
+    assert len(chunks) == 11
+    assert pool.opens - stats["opens"] == 1
+    assert pool.hits - stats["hits"] == 11
+    assert 0 < pool.hit_rate <= 1
+
+
+def test_pool_interleaved_reads(pool, stereo_sound, stereo_filepath):
+    data = stereo_sound.dataframes
+    first, second = (Sound.from_file(stereo_filepath), Sound.from_file(stereo_filepath))
+
+    chunks = zip(
+        first[:20000].iter_chunks(buffersize=1000),
+        second[30000:50000].iter_chunks(buffersize=1000),
+    )
+    first_chunks, second_chunks = zip(*chunks)
+    assert np.array_equal(np.concatenate(first_chunks), data[:20000])
+    assert np.array_equal(np.concatenate(second_chunks), data[30000:50000])
+    assert len(pool) == 1
+
+
+def test_pool_reopens_closed_file(pool, mono_sound):
+    data = mono_sound.dataframes
+    pool.close(mono_sound.filename)
+    assert len(pool) == 0
+
+    assert np.array_equal(mono_sound.dataframes, data)
+    assert len(pool) == 1
+
+
+def test_concurrent_reads_same_sound(pool, stereo_sound):
+    data = stereo_sound.dataframes
+    barrier = threading.Barrier(4)
+
+    def read(i):
+        barrier.wait()
+        return np.concatenate(
+            list(stereo_sound[i * 10000 : (i + 1) * 10000].iter_chunks(buffersize=333))
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        chunks = list(executor.map(read, range(4)))
+
+    assert np.array_equal(np.concatenate(chunks), data[:40000])
+    assert pool.in_use == 0
+    assert 1 <= len(pool) <= 4
+
+
+def test_concurrent_iterators_same_thread(pool, mono_sound):
+    data = mono_sound.dataframes
+    first, second = (mono_sound.iter_chunks(1000), mono_sound[500:].iter_chunks(1000))
+
+    for i, (a, b) in enumerate(zip(first, second)):
+        assert np.array_equal(a, data[i * 1000 : (i + 1) * 1000])
+        assert np.array_equal(b, data[i * 1000 + 500 : (i + 1) * 1000 + 500])
+    assert len(pool) == 1
+
+
+def test_pool_reopens_overwritten_file(pool, mono_sound, tmp_path):
+    filename = str(tmp_path / "overwritten.wav")
+    mono_sound[:1000].save(filename)
+    assert len(Sound.from_file(filename).data) == 1000
+    n_handles = len(pool)
+
+    # the idle descriptor of the previous content is replaced
+    mono_sound[:3000].save(filename)
+    sound = Sound.from_file(filename)
+    assert np.array_equal(sound.dataframes, mono_sound.dataframes[:3000])
+    assert len(pool) == n_handles
+
+    # and reopened when modified after opening the sound
+    mono_sound[:2000].save(filename)
+    assert np.array_equal(sound[:2000].dataframes, mono_sound.dataframes[:2000])
+    assert len(pool) == n_handles
+
+
+def test_pool_closed_files_bounded(pool, filenames):
+    pool.max_handles = 1
+    reopens = pool.reopens
+    sounds = [Sound.from_file(filename) for filename in filenames]
+    assert len(pool._closed) == 4  # the last files closed of the 9 evicted
+
+    sounds[0].data  # closed, but forgotten
+    assert pool.reopens == reopens
+    sounds[8].data
+    assert pool.reopens == reopens + 1
+
+
+def test_sound_f_not_owned_by_pool(pool, mono_sound):
+    n_handles = len(pool)
+    f = mono_sound.f
+    assert f is not mono_sound.f
+    assert len(pool) == n_handles
+
+    # reading or closing it doesn't affect the readers of the pool
+    f.seek(1000, mode="r")
+    f.read_frames(10)
+    f.close()
+    assert np.array_equal(mono_sound[:1000].dataframes, mono_sound.dataframes[:1000])
+    assert pool.in_use == 0
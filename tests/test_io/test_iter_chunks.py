@@ -0,0 +1,116 @@
+"""Tests for ``iter_chunks`` generator method."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+def test_iter_chunks_stereo_from_file(stereo_sound):
+    chunks = list(stereo_sound.iter_chunks(buffersize=1000))
+
+    assert all(chunk.shape == (1000, 2) for chunk in chunks[:-1])
+    assert np.array_equal(np.concatenate(chunks), stereo_sound.dataframes)
+
+
+@pytest.mark.parametrize("vectorized", (True, False))
+@pytest.mark.parametrize("buffersize", (1000, 1024, 4410))
+def test_iter_chunks_from_function(stereo_ttf_gen, vectorized, buffersize):
+    sound = Sound.from_datatimes(stereo_ttf_gen(), vectorized=vectorized)
+    sound.duration = 0.1
+    chunks = list(sound.iter_chunks(buffersize=buffersize))
+
+    assert all(chunk.shape == (buffersize, 2) for chunk in chunks[:-1])
+    assert np.array_equal(np.concatenate(chunks), sound.dataframes)
+
+
+@pytest.mark.parametrize("vectorized", (True, False))
+def test_iter_chunks_from_dataframes_until_stop(mono_sound, vectorized):
+    frames = mono_sound.dataframes
+
+    def index_to_frame(i):
+        try:
+            return frames[i]
+        except IndexError:
+            raise StopIteration
+
+    sound = Sound.from_dataframes(
+        index_to_frame, fps=mono_sound.fps, vectorized=vectorized
+    )
+    assert sound.n_frames is None
+
+    chunks = list(sound.iter_chunks(buffersize=1024))
+    assert np.array_equal(np.concatenate(chunks), frames)
+    assert sound.n_frames == mono_sound.n_frames
+
+
+def test_iter_chunks_infinite(mono_ttf_gen):
+    sound = Sound.from_datatimes(mono_ttf_gen())
+
+    chunks = list(itertools.islice(sound.iter_chunks(buffersize=512), 10))
+    assert [len(chunk) for chunk in chunks] == [512] * 10
+    assert np.array_equal(
+        np.concatenate(chunks), sound.time_to_frame(np.arange(5120) / sound.fps)
+    )
+    assert sound.n_frames is None
+
+
+def test_iter_chunks_from_byteframes(stereo_sound):
+    hexdata = stereo_sound.dataframes.tobytes()
+
+    def index_to_hexframe(i):
+        if i >= stereo_sound.n_frames:
+            raise StopIteration
+        return [hexdata[i * 4 : i * 4 + 2], hexdata[i * 4 + 2 : i * 4 + 4]]
+
+    sound = Sound.from_byteframes(index_to_hexframe, fps=stereo_sound.fps)
+    chunks = list(sound.iter_chunks(buffersize=10000))
+
+    assert np.array_equal(np.concatenate(chunks), stereo_sound.dataframes)
+
+
+@pytest.mark.parametrize("mmap", (False, True))
+@pytest.mark.parametrize("buffersize", (1000, 4096, 60000))
+def test_iter_chunks_exact_sizes(stereo_filepath, mmap, buffersize):
+    sound = Sound.from_file(stereo_filepath, mmap=mmap)[100:]
+    sizes = [len(chunk) for chunk in sound.iter_chunks(buffersize=buffersize)]
+
+    assert sum(sizes) == sound.n_frames
+    assert sizes[:-1] == [buffersize] * (len(sizes) - 1)
+    assert 0 < sizes[-1] <= buffersize
+
+
+@pytest.mark.parametrize("mmap", (False, True))
+def test_iter_chunks_out_from_file(stereo_filepath, mmap):
+    sound = Sound.from_file(stereo_filepath, mmap=mmap)
+    out = np.empty((1000, 2), dtype=sound.dtype)
+
+    chunks = []
+    for chunk in sound.iter_chunks(buffersize=1000, out=out):
+        assert chunk.base is out
+        chunks.append(chunk.copy())
+    assert np.array_equal(np.concatenate(chunks), sound.dataframes)
+
+
+def test_iter_chunks_out_from_function(stereo_ttf_gen):
+    sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(0.1)
+    out = np.empty((2048, 2), dtype=sound.dtype)
+
+    chunks = [chunk.copy() for chunk in sound.iter_chunks(1024, out=out)]
+    assert np.array_equal(np.concatenate(chunks), sound.dataframes)
+
+
+def test_iter_chunks_out_from_operation(mono_sound):
+    sound = mono_sound.gain(-6)
+    out = np.empty(512, dtype=sound.dtype)
+
+    chunks = [chunk.copy() for chunk in sound.iter_chunks(512, out=out)]
+    assert np.array_equal(np.concatenate(chunks), sound.dataframes)
+
+
+@pytest.mark.parametrize("shape", ((999, 2), (1000,), (1000, 1)))
+def test_iter_chunks_out_invalid_shape(stereo_sound, shape):
+    with pytest.raises(ValueError, match="shape"):
+        next(stereo_sound.iter_chunks(1000, out=np.empty(shape, dtype="int16")))
@@ -0,0 +1,49 @@
+"""Tests for ``iter_timechunks`` generator method."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+@pytest.mark.parametrize("buffersize", (1, 1000, 1024, 106022, 200000))
+def test_iter_timechunks_from_file(mono_sound, buffersize):
+    chunks = list(mono_sound.iter_timechunks(buffersize=buffersize))
+
+    assert all(len(chunk) == buffersize for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= buffersize
+
+    times = np.concatenate(chunks)
+    assert len(times) == mono_sound.n_frames
+    assert np.array_equal(times, np.arange(mono_sound.n_frames) / mono_sound.fps)
+
+
+def test_iter_timechunks_start_stop(stereo_sound):
+    chunks = list(stereo_sound.iter_timechunks(buffersize=3, start=10, stop=17))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert np.array_equal(np.concatenate(chunks), np.arange(10, 17) / 44100)
+
+
+def test_iter_timechunks_infinite(mono_ttf_gen):
+    sound = Sound.from_datatimes(mono_ttf_gen(), fps=48000)
+    assert sound.n_frames is None
+
+    # frames far from the start are not affected by accumulated errors
+    start = 48000 * 3600 * 24
+    chunk = next(sound.iter_timechunks(buffersize=4, start=start))
+    assert np.array_equal(np.rint(chunk * sound.fps), np.arange(start, start + 4))
+
+    chunks = itertools.islice(sound.iter_timechunks(buffersize=8), 3)
+    assert np.array_equal(np.concatenate(list(chunks)), np.arange(24) / 48000)
+
+
+def test_time_sequence_indexes_not_drifted():
+    fps, n_frames = (44100, 44100 * 60)
+    sound = Sound.from_dataframes(np.int32, fps=fps, n_frames=n_frames)
+
+    for i, t in enumerate(sound.time_sequence):
+        if i % 44099 == 0:
+            assert int(round(t * fps)) == i
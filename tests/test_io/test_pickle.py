@@ -0,0 +1,68 @@
+"""Tests for pickling sounds."""
+
+import concurrent.futures
+import pickle
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+def _sum_frames(sound):
+    return int(sound.dataframes.astype(np.int64).sum())
+
+
+@pytest.mark.parametrize("mmap", (False, True), ids=("decoded", "mmap"))
+def test_pickle_sound_from_file(stereo_filepath, mmap):
+    sound = Sound.from_file(stereo_filepath, mmap=mmap)
+    data = sound.dataframes
+
+    dumped = pickle.dumps(sound)
+    assert len(dumped) < 1024
+
+    loaded = pickle.loads(dumped)
+    assert loaded._f is None
+    assert np.array_equal(loaded.dataframes, data)
+    assert len(pickle.dumps(loaded)) == len(dumped)
+
+    assert isinstance(loaded.buffer, np.memmap) is mmap
+    assert (loaded.n_frames, loaded.n_channels, loaded.fps, loaded.dtype) == (
+        sound.n_frames,
+        sound.n_channels,
+        sound.fps,
+        sound.dtype,
+    )
+    assert loaded.metadata == sound.metadata
+
+
+def test_pickle_view(mono_sound):
+    view = mono_sound[1000:5000]
+    loaded = pickle.loads(pickle.dumps(view))
+
+    assert (loaded.offset, loaded.n_frames) == (1000, 4000)
+    assert np.array_equal(loaded.dataframes, mono_sound.dataframes[1000:5000])
+
+
+def test_pickle_operations(stereo_sound, mono_sound):
+    processed = stereo_sound[:20000].gain(-3).mix(stereo_sound[10000:]).resample(48000)
+    expected = processed.dataframes
+
+    dumped = pickle.dumps(processed)
+    assert len(dumped) < 4096
+    assert np.array_equal(pickle.loads(dumped).dataframes, expected)
+
+
+def test_pickle_buffer():
+    buffer = np.arange(100, dtype=np.int16)
+    sound = Sound(n_frames=100, n_channels=1, buffer=buffer)
+
+    assert np.array_equal(pickle.loads(pickle.dumps(sound)).dataframes, buffer)
+
+
+def test_send_to_process_pool(mono_sound, stereo_sound):
+    sounds = [mono_sound, stereo_sound, stereo_sound[100:200].gain(6)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(_sum_frames, sounds))
+
+    assert results == [_sum_frames(sound) for sound in sounds]
@@ -1,8 +1,13 @@
 """Tests for saving files using ``save`` method."""
 
+import tracemalloc
+
 import numpy as np
+import pysndfile as snd
+import pytest
 
 from waves import Sound
+from waves.sound.pcm import read_header
 
 
 def test_save_mono_from_file(mono_sound, tmp_path):
@@ -64,3 +69,146 @@ def test_save_stereo_from_function(tmp_path):
 
     resulting_sound = Sound.from_file(filename)
     assert np.array_equal(resulting_sound.data, stereo_sound.data)
+
+
+def test_save_from_function_bounded_memory(stereo_ttf_gen, tmp_path):
+    sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(30)
+    full_size = sound.n_frames * sound.n_channels * sound.n_bytes
+
+    filename = tmp_path / "save_from_function_bounded_memory.wav"
+    tracemalloc.start()
+    try:
+        n_frames = sound.save(filename, buffersize=4096)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert n_frames == sound.n_frames
+    assert peak < full_size / 10
+    assert Sound.from_file(filename.as_posix()).n_frames == sound.n_frames
+
+
+def test_save_from_function_ended_early(mono_sound, tmp_path):
+    frames = mono_sound.dataframes
+
+    def index_to_frame(i):
+        try:
+            return frames[i]
+        except IndexError:
+            raise StopIteration
+
+    sound = Sound.from_dataframes(index_to_frame, fps=mono_sound.fps)
+    sound.duration = 10
+
+    filename = tmp_path / "save_from_function_ended_early.wav"
+    assert sound.save(filename) == mono_sound.n_frames
+
+    resulting_sound = Sound.from_file(filename.as_posix())
+    assert np.array_equal(resulting_sound.data, frames)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "dtype", "n_bytes"),
+    (("pcm16", np.int16, 2), ("pcm24", np.int32, 3), ("float32", np.float32, 4)),
+)
+def test_save_preserves_subtype(stereo_sound, tmp_path, encoding, dtype, n_bytes):
+    source_filename = (tmp_path / f"source_{encoding}.wav").as_posix()
+    with snd.PySndfile(
+        source_filename,
+        "w",
+        format=snd.construct_format("wav", encoding),
+        channels=2,
+        samplerate=stereo_sound.fps,
+    ) as f:
+        f.write_frames(stereo_sound.dataframes)
+
+    sound = Sound.from_file(source_filename)
+    assert sound.dtype is dtype
+    assert sound.n_bytes == n_bytes
+
+    filename = (tmp_path / f"save_{encoding}.wav").as_posix()
+    sound.save(filename)
+
+    assert read_header(filename).encoding == encoding
+    assert np.array_equal(Sound.from_file(filename).data, sound.data)
+
+
+@pytest.mark.parametrize(
+    ("container", "encoding"), (("wav", "pcmu8"), ("aiff", "pcms8"))
+)
+def test_save_8bits_round_trip(stereo_sound, tmp_path, container, encoding):
+    # 8 bits samples keep the most significant byte of the 16 bits ones
+    frames = stereo_sound.dataframes & -0x100
+    sound = Sound.from_array(frames, fps=stereo_sound.fps, n_bytes=1)
+
+    filename = (tmp_path / f"save_8bits.{container}").as_posix()
+    sound.save(filename)
+    assert read_header(filename).encoding == encoding
+
+    resulting_sound = Sound.from_file(filename)
+    assert (resulting_sound.dtype, resulting_sound.n_bytes) == (np.int16, 1)
+    assert np.array_equal(resulting_sound.dataframes, frames)
+
+    filename = (tmp_path / f"save_8bits_again.{container}").as_posix()
+    resulting_sound.save(filename)
+    assert read_header(filename).encoding == encoding
+
+
+@pytest.mark.parametrize(
+    ("subtype", "maximum"), (("pcm24", 0x7FFFFF00), ("pcm32", 0x7FFFFFFF))
+)
+def test_save_float_full_scale(tmp_path, subtype, maximum):
+    samples = np.array([1, -1, 0.5, -0.5, 1.5, -1.5], dtype=np.float32)
+    filename = (tmp_path / f"full_scale_{subtype}.wav").as_posix()
+    Sound.from_array(samples).save(filename, subtype=subtype)
+
+    data = Sound.from_file(filename).data
+    assert data.dtype == np.int32
+    assert data.tolist() == [
+        maximum,
+        -0x80000000,
+        0x40000000,
+        -0x40000000,
+        maximum,
+        -0x80000000,
+    ]
+
+
+def test_save_explicit_subtype_and_container(stereo_sound, tmp_path):
+    filename = (tmp_path / "save_float.aiff").as_posix()
+    stereo_sound.save(filename, subtype="float32")
+
+    header = read_header(filename)
+    assert (header.container, header.encoding) == ("aiff", "float32")
+
+    data = Sound.from_file(filename).data
+    assert data.dtype == np.float32
+    assert np.allclose(data * 32768, stereo_sound.data)
+
+    filename = (tmp_path / "save_w64.wav").as_posix()
+    stereo_sound.save(filename, container="w64", subtype="pcm24")
+    assert np.array_equal(Sound.from_file(filename).data >> 16, stereo_sound.data)
+
+
+def test_save_rf64(stereo_ttf_gen, tmp_path):
+    n_frames = 44100 * 100
+
+    def index_to_frame(i):
+        if np.max(i) >= n_frames:
+            raise StopIteration
+        return stereo_ttf_gen()(i / 44100)
+
+    # longer than the limit of WAV files, but ends before
+    sound = Sound.from_dataframes(index_to_frame, fps=44100).with_duration(7 * 3600)
+    filename = (tmp_path / "save_rf64.wav").as_posix()
+
+    assert sound.save(filename, buffersize=44100) == n_frames
+    assert read_header(filename).container == "rf64"
+    assert Sound.from_file(filename).n_frames == n_frames
+
+    # unknown duration, so saved as RF64 only if needed
+    sound = Sound.from_dataframes(index_to_frame, fps=44100)
+    filename = (tmp_path / "save_unknown_duration.wav").as_posix()
+
+    assert sound.save(filename, buffersize=44100) == n_frames
+    assert read_header(filename).container == "wav"
@@ -0,0 +1,88 @@
+"""Tests for views of sounds created slicing them."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound import cache
+
+
+@pytest.mark.parametrize("mmap", (False, True), ids=("decoded", "mmap"))
+def test_slice_from_file(stereo_filepath, mmap):
+    sound = Sound.from_file(stereo_filepath, mmap=mmap)
+    data = sound.dataframes.copy()
+
+    view = sound[1000:3000]
+    assert view.n_frames == 2000
+    assert view.offset == 1000
+    assert np.array_equal(view.dataframes, data[1000:3000])
+    assert np.array_equal(view.data, data[1000:3000].T)
+    assert np.array_equal(
+        np.concatenate(list(view.iter_chunks(buffersize=300))), data[1000:3000]
+    )
+
+    subview = view[-500:-100]
+    assert subview.offset == 2500
+    assert np.array_equal(subview.dataframes, data[2500:2900])
+
+    if mmap:
+        assert np.shares_memory(view.dataframes, sound.buffer)
+
+
+def test_slice_by_time(mono_sound):
+    data = mono_sound.dataframes
+
+    view = mono_sound[0.5:1.5]
+    assert view.offset == 22050
+    assert view.duration == 1
+    assert np.array_equal(view.dataframes, data[22050:66150])
+
+    assert mono_sound[2.0:].n_frames == mono_sound.n_frames - 88200
+    assert mono_sound[:1000000].n_frames == mono_sound.n_frames
+    assert mono_sound[5000:100].n_frames == 0
+
+
+def test_slice_interleaved_reads(stereo_sound):
+    data = stereo_sound.dataframes
+    view = stereo_sound[10000:20000]
+
+    chunks = zip(
+        stereo_sound.iter_chunks(buffersize=1000), view.iter_chunks(buffersize=1000)
+    )
+    for i, (chunk, view_chunk) in enumerate(chunks):
+        start = i * 1000
+        assert np.array_equal(chunk, data[start : start + 1000])
+        assert np.array_equal(view_chunk, data[10000 + start : 11000 + start])
+
+
+def test_slice_from_function(stereo_ttf_gen):
+    sound = Sound.from_datatimes(stereo_ttf_gen())
+    data = sound[:2.0].dataframes
+
+    view = sound[1.0:2.0]
+    assert np.array_equal(view.dataframes, data[44100:])
+    assert np.array_equal(view[100:200].dataframes, data[44200:44300])
+
+    # infinite views
+    assert sound[1.0:].n_frames is None
+    with pytest.raises(ValueError):
+        sound[-10:]
+
+
+def test_slice_cached(stereo_sound):
+    decoded_cache = cache.enable()
+    try:
+        view = stereo_sound[100:200]
+        assert np.array_equal(view.dataframes, stereo_sound.dataframes[100:200])
+        assert np.array_equal(view.dataframes, stereo_sound[100:200].dataframes)
+        assert decoded_cache.hits == 2
+        assert decoded_cache.misses == 2
+    finally:
+        cache.disable()
+
+
+def test_slice_invalid(stereo_sound):
+    with pytest.raises(TypeError):
+        stereo_sound[5]
+    with pytest.raises(ValueError):
+        stereo_sound[::2]
@@ -0,0 +1,41 @@
+"""Tests for the compact representation of sounds."""
+
+import sys
+
+import pytest
+
+from waves import Sound
+
+
+def test_sound_has_no_instance_dict(stereo_sound):
+    assert not hasattr(stereo_sound, "__dict__")
+    with pytest.raises(AttributeError):
+        stereo_sound.unknown_attribute = 1
+
+    assert sys.getsizeof(stereo_sound) < 256
+
+
+def test_metadata_loaded_lazily(stereo_sound, stereo_filepath):
+    assert stereo_sound._metadata is None
+    assert stereo_sound.metadata["SF_STR_TITLE"] == b"Bass Drum 1"
+    assert stereo_sound._metadata is stereo_sound.metadata
+
+    view = stereo_sound[100:200]
+    assert view.metadata is stereo_sound.metadata
+    assert Sound.from_file(stereo_filepath)[100:200].metadata == stereo_sound.metadata
+
+
+def test_metadata_not_shared_between_instances(mono_ttf_gen):
+    first = Sound.from_datatimes(mono_ttf_gen())
+    second = Sound.from_datatimes(mono_ttf_gen())
+
+    first.metadata["SF_STR_TITLE"] = b"First"
+    assert second.metadata == {}
+    assert Sound().metadata is not Sound().metadata
+
+
+def test_lazy_methods_dispatched(mono_sound):
+    assert mono_sound.gain.func.__name__ == "gain"
+    assert mono_sound.figure.func.__module__ == "waves.sound.figure"
+    with pytest.raises(AttributeError):
+        mono_sound.unknown_method
@@ -0,0 +1,55 @@
+"""Tests for rendering blocks of frames using vectorized functions."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+def test_vectorized_builtin_generators(mono_ttf_gen, stereo_ttf_gen):
+    mono_sound = Sound.from_datatimes(mono_ttf_gen()).with_duration(0.1)
+    stereo_sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(0.1)
+
+    assert mono_sound.vectorized
+    assert stereo_sound.vectorized
+
+    for sound in (mono_sound, stereo_sound):
+        expected = [sound.time_to_frame(i / sound.fps) for i in range(sound.n_frames)]
+        assert np.array_equal(sound.dataframes, np.array(expected))
+
+
+@pytest.mark.parametrize("vectorized", (None, True, False))
+def test_vectorized_from_dataframes(mono_sound, stereo_sound, vectorized):
+    for source_sound in (mono_sound, stereo_sound):
+        frames = source_sound.dataframes
+
+        def index_to_frame(i):
+            try:
+                return frames[i]
+            except IndexError:
+                raise StopIteration
+
+        sound = Sound.from_dataframes(
+            index_to_frame, fps=source_sound.fps, vectorized=vectorized
+        )
+
+        assert sound.vectorized is (vectorized is not False)
+        assert np.array_equal(sound.dataframes, frames)
+        assert sound.n_frames == source_sound.n_frames
+
+
+def test_vectorized_detection_fallback():
+    fps, frequencies, volume = (44100, (110, 440), 0.5)
+    amplitude = np.iinfo(np.int16).max * volume
+
+    # channel-first blocks are rendered frame by frame
+    def time_to_frame(t):
+        return [
+            (np.sin(frequencies[0] * 2 * np.pi * t) * amplitude).astype(np.int16),
+            (np.sin(frequencies[1] * 2 * np.pi * t) * amplitude).astype(np.int16),
+        ]
+
+    sound = Sound.from_datatimes(time_to_frame, fps=fps).with_duration(0.1)
+
+    assert not sound.vectorized
+    assert sound.dataframes.shape == (sound.n_frames, 2)
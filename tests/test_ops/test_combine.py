@@ -0,0 +1,100 @@
+"""Tests for lazy operations combining sounds or their channels."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+def test_mix(mono_sound):
+    data = mono_sound.dataframes.astype(np.int32)
+
+    mixed = mono_sound.mix(mono_sound[:1000], weights=(0.5, 0.25))
+    assert mixed.n_frames == mono_sound.n_frames
+
+    expected = np.rint(data * 0.5)
+    expected[:1000] += np.rint(data[:1000] * 0.25)
+    assert np.abs(mixed.dataframes.astype(np.int32) - expected).max() <= 1
+
+
+def test_mix_clipped(stereo_sound):
+    mixed = stereo_sound.mix(stereo_sound, stereo_sound, stereo_sound)
+    data = stereo_sound.dataframes.astype(np.int64) * 4
+
+    assert np.array_equal(
+        mixed.dataframes, np.clip(data, -(2**15), 2**15 - 1).astype(np.int16)
+    )
+
+
+def test_mix_function_until_stop(mono_sound):
+    frames = mono_sound.dataframes
+
+    def index_to_frame(i):
+        if np.max(i) >= 2000:
+            raise StopIteration
+        return frames[i]
+
+    sound = Sound.from_dataframes(index_to_frame, fps=mono_sound.fps)
+    mixed = sound.mix(sound, weights=(0.5, 0.5))
+
+    assert mixed.n_frames is None
+    assert np.array_equal(mixed.dataframes, frames[:2000])
+    assert mixed.n_frames == 2000
+
+
+def test_mix_incompatible(mono_sound, stereo_sound):
+    with pytest.raises(ValueError, match="number of channels"):
+        mono_sound.mix(stereo_sound)
+    with pytest.raises(ValueError, match="weight"):
+        mono_sound.mix(mono_sound, weights=(1,))
+
+
+def test_concat(stereo_sound, stereo_ttf_gen):
+    data = stereo_sound.dataframes
+    generated = Sound.from_datatimes(stereo_ttf_gen(), fps=stereo_sound.fps)
+    generated.duration = 0.1
+
+    joined = stereo_sound[:3000].concat(stereo_sound[-2000:], generated)
+    assert joined.n_frames == 3000 + 2000 + 4410
+
+    expected = np.concatenate((data[:3000], data[-2000:], generated.dataframes))
+    assert np.array_equal(joined.dataframes, expected)
+    assert np.array_equal(joined[2500:5500].dataframes, expected[2500:5500])
+    assert np.array_equal(
+        np.concatenate(list(joined.iter_chunks(buffersize=700))), expected
+    )
+
+
+def test_concat_without_duration(mono_sound, mono_ttf_gen):
+    infinite = Sound.from_datatimes(mono_ttf_gen())
+
+    joined = mono_sound.concat(infinite)
+    assert joined.n_frames is None
+    assert np.array_equal(
+        next(joined[mono_sound.n_frames - 10 :].iter_chunks(buffersize=20)),
+        np.concatenate((mono_sound.dataframes[-10:], infinite[:10].dataframes)),
+    )
+
+    with pytest.raises(ValueError, match="last sound"):
+        infinite.concat(mono_sound)
+
+
+@pytest.mark.parametrize("channels", ((0,), (1,), (1, 0), (0, 0, 1)))
+def test_select_channels(stereo_sound, channels):
+    selected = stereo_sound.select_channels(*channels)
+    assert selected.n_channels == len(channels)
+
+    expected = stereo_sound.dataframes[:, list(channels)]
+    if len(channels) == 1:
+        expected = expected[:, 0]
+    assert np.array_equal(selected.dataframes, expected)
+
+
+def test_select_channels_mono_to_stereo(mono_sound):
+    stereo = mono_sound.select_channels(0, 0)
+
+    assert stereo.n_channels == 2
+    assert np.array_equal(stereo.data, [mono_sound.data, mono_sound.data])
+
+    with pytest.raises(IndexError):
+        mono_sound.select_channels(1)
@@ -0,0 +1,121 @@
+"""Tests for lazy elementwise operations over sounds."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.ops import Elementwise
+from waves.sound.pcm import convert_samples
+
+
+def _expected_gain(data, db):
+    samples = convert_samples(data, np.float64) * 10 ** (db / 20)
+    return convert_samples(samples, data.dtype)
+
+
+@pytest.mark.parametrize("db", (-6, 0, 3))
+def test_gain_from_file(stereo_sound, db):
+    data = stereo_sound.dataframes
+
+    processed = stereo_sound.gain(db)
+    assert processed.operation is not None
+    assert processed.n_frames == stereo_sound.n_frames
+    assert np.array_equal(processed.dataframes, _expected_gain(data, db))
+
+
+def test_gain_clipped(mono_sound):
+    data = mono_sound.gain(60).dataframes
+    assert data.max() == np.iinfo(np.int16).max
+    assert data.min() == np.iinfo(np.int16).min
+
+
+def test_fused_operations(stereo_sound):
+    processed = stereo_sound.gain(-3).gain(-3).fade(fade_in=0.01)
+
+    assert isinstance(processed.operation, Elementwise)
+    assert processed.operation.sound is stereo_sound
+    assert len(processed.operation.functions) == 3
+    assert np.array_equal(
+        processed.dataframes[441:], _expected_gain(stereo_sound.dataframes[441:], -6)
+    )
+
+
+def test_fade(mono_sound):
+    processed = mono_sound.fade(fade_in=0.1, fade_out=0.2)
+    data = convert_samples(processed.dataframes, np.float64)
+    original = convert_samples(mono_sound.dataframes, np.float64)
+
+    factors = np.ones(mono_sound.n_frames)
+    factors[:4410] = np.arange(4410) / 4410
+    factors[-8820:] = np.arange(8820, 0, -1) / 8820
+    assert np.allclose(data, original * factors, atol=2**-15)
+
+
+def test_fade_of_slice_fused(mono_sound):
+    view = mono_sound.gain(0)[1000:2000]
+    processed = view.fade(fade_in=100 / mono_sound.fps, fade_out=100 / mono_sound.fps)
+    expected = mono_sound[1000:2000].fade(
+        fade_in=100 / mono_sound.fps, fade_out=100 / mono_sound.fps
+    )
+
+    assert processed.operation.sound is mono_sound
+    assert processed.offset == 1000
+    assert np.array_equal(processed.dataframes, expected.dataframes)
+
+
+def test_fade_out_without_duration(mono_ttf_gen):
+    sound = Sound.from_datatimes(mono_ttf_gen())
+
+    with pytest.raises(ValueError, match="without duration"):
+        sound.fade(fade_out=1)
+
+
+def test_elementwise_chunks_sliced(stereo_sound):
+    processed = stereo_sound.gain(-6)
+    data = processed.dataframes
+
+    assert np.array_equal(processed[5000:7000].dataframes, data[5000:7000])
+    assert np.array_equal(
+        np.concatenate(list(processed.iter_chunks(buffersize=999))), data
+    )
+
+
+def test_elementwise_float_buffer_not_modified():
+    buffer = np.linspace(-1, 1, 1000)
+    sound = Sound(
+        n_frames=1000, n_bytes=8, n_channels=1, dtype=np.float64, buffer=buffer
+    )
+
+    assert np.allclose(sound.gain(-6.0206).dataframes, buffer / 2)
+    assert np.array_equal(buffer, np.linspace(-1, 1, 1000))
+
+
+def test_elementwise_from_function(stereo_ttf_gen):
+    sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(0.1)
+    processed = sound.gain(-6)
+
+    assert np.array_equal(processed.dataframes, _expected_gain(sound.dataframes, -6))
+
+
+def test_save_operations(stereo_sound, tmp_path):
+    filename = (tmp_path / "processed.wav").as_posix()
+    processed = stereo_sound.gain(-6).fade(fade_out=0.5)
+
+    assert processed.save(filename, buffersize=3000) == stereo_sound.n_frames
+    assert np.array_equal(Sound.from_file(filename).dataframes, processed.dataframes)
+
+
+def test_operations_dont_read_metadata(stereo_filepath):
+    from waves.sound.handles import get_pool
+
+    sound = Sound.from_file(stereo_filepath)
+    pool = get_pool()
+    stats = (pool.hits, pool.opens)
+
+    processed = sound.gain(-3).fade(fade_in=0.1).mix(sound).concat(sound)
+    processed = processed.select_channels(1, 0).resample(22050)
+    assert (pool.hits, pool.opens) == stats
+    assert sound._metadata is None and processed._metadata is None
+
+    assert processed.metadata["SF_STR_TITLE"] == b"Bass Drum 1"
+    assert processed.metadata is sound.metadata
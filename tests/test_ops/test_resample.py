@@ -0,0 +1,90 @@
+"""Tests for the lazy sample rate conversion of sounds."""
+
+import numpy as np
+import pytest
+
+from waves import Sound
+from waves.sound.resample import filter_table
+
+
+def _sine_sound(fps, n_channels=1, frequency=1000, duration=1):
+    samples = np.sin(2 * np.pi * frequency * np.arange(int(fps * duration)) / fps)
+    if n_channels > 1:
+        samples = np.stack([samples] * n_channels, axis=1)
+    return Sound(
+        n_frames=len(samples),
+        n_bytes=8,
+        n_channels=n_channels,
+        fps=fps,
+        dtype=np.float64,
+        buffer=samples,
+    )
+
+
+@pytest.mark.parametrize("quality", ("fast", "medium", "high"))
+@pytest.mark.parametrize("fps", (48000, 96000, 22050, 16000, 44101))
+def test_resample_sine(quality, fps):
+    sound = _sine_sound(44100)
+    resampled = sound.resample(fps, quality=quality)
+    assert resampled.fps == fps
+    assert resampled.n_frames == fps
+
+    data = resampled.dataframes
+    expected = np.sin(2 * np.pi * 1000 * np.arange(fps) / fps)
+    tolerance = {"fast": 1e-3, "medium": 1e-4, "high": 1e-5}[quality]
+    assert np.abs(data - expected)[100:-100].max() < tolerance
+
+
+def test_resample_removes_aliased_frequencies():
+    data = _sine_sound(48000, frequency=20000).resample(16000).dataframes
+    assert np.abs(data[100:-100]).max() < 1e-3
+
+
+@pytest.mark.parametrize("fps", (48000, 44101))
+@pytest.mark.parametrize("buffersize", (100, 1024, 7000))
+def test_resample_chunks_equal_data(stereo_sound, fps, buffersize):
+    data = stereo_sound.resample(fps).dataframes
+    assert data.dtype == stereo_sound.dtype
+    assert data.shape == (stereo_sound.resample(fps).n_frames, 2)
+
+    chunks = list(stereo_sound.resample(fps).iter_chunks(buffersize=buffersize))
+    assert np.array_equal(np.concatenate(chunks), data)
+    assert np.array_equal(
+        stereo_sound.resample(fps)[3000:9000].dataframes, data[3000:9000]
+    )
+
+
+def test_resample_function_until_stop(mono_sound):
+    frames = mono_sound.dataframes
+
+    def index_to_frame(i):
+        if np.max(i) >= 10000:
+            raise StopIteration
+        return frames[i]
+
+    sound = Sound.from_dataframes(index_to_frame, fps=mono_sound.fps)
+    resampled = sound.resample(22050)
+
+    assert resampled.n_frames is None
+    assert len(resampled.dataframes) == 5000
+    assert resampled.n_frames == 5000
+
+
+def test_resample_same_fps(mono_sound):
+    resampled = mono_sound.resample(mono_sound.fps)
+    assert resampled.operation is None
+    assert np.array_equal(resampled.dataframes, mono_sound.dataframes)
+
+
+def test_resample_invalid_quality(mono_sound):
+    with pytest.raises(ValueError, match="quality"):
+        mono_sound.resample(48000, quality="best")
+
+
+def test_filter_tables_cached(mono_sound):
+    mono_sound.resample(48000)
+    hits = filter_table.cache_info().hits
+
+    mono_sound.resample(48000)
+    assert filter_table.cache_info().hits > hits
+    assert not filter_table(160, 147).flags.writeable
@@ -0,0 +1,129 @@
+"""Tests for the Pygame streaming player, using the SDL dummy audio driver."""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from waves import Sound
+
+
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+pytest.importorskip("pygame")
+
+from waves.players.pygame import StreamPlayer  # noqa: E402
+
+
+def test_play_whole_sound(stereo_sound):
+    sound = stereo_sound[:8820]  # 0.2 seconds
+    start = time.perf_counter()
+    player = sound.play(wait=False, buffersize=1000)
+    assert time.perf_counter() - start < 0.1
+    assert player.is_playing
+
+    assert player.wait(timeout=5)
+    assert not player.is_playing
+    assert player.position == pytest.approx(sound.duration)
+    assert time.perf_counter() - start >= 0.15
+
+
+def test_play_mono_wait(mono_sound):
+    player = mono_sound[:4410].play(buffersize=441)
+    assert not player.is_playing
+    assert player.position == pytest.approx(0.1)
+
+
+def test_stop_infinite_sound(stereo_ttf_gen):
+    sound = Sound.from_datatimes(stereo_ttf_gen(), fps=44100)
+    player = sound.play(wait=0.2, buffersize=2205)
+    assert player.is_playing
+    assert 0.05 < player.position < 0.4
+
+    player.stop()
+    assert player.wait(timeout=1)
+    position = player.position
+    time.sleep(0.05)
+    assert player.position == position
+
+
+def test_chunks_read_lazily():
+    n_read = []
+
+    def chunks():
+        while True:
+            n_read.append(1)
+            yield np.zeros((441, 2), dtype=np.int16)
+
+    player = StreamPlayer(chunks(), n_buffers=3).play()
+    time.sleep(0.1)
+    played = player.position * 100
+    player.stop()
+    assert player.wait(timeout=1)
+    assert len(n_read) <= played + 3 + 3
+
+
+@pytest.fixture
+def played(monkeypatch):
+    """Records the samples of the Pygame sounds created while playing."""
+    from pygame import mixer, sndarray
+
+    played = []
+    mixer_sound = mixer.Sound
+
+    def recorded_sound(*args, **kwargs):
+        pg_sound = mixer_sound(*args, **kwargs)
+        played.append(sndarray.array(pg_sound))
+        return pg_sound
+
+    monkeypatch.setattr(mixer, "Sound", recorded_sound)
+    return played
+
+
+def test_played_samples(played):
+    frames = np.arange(4410 * 2, dtype=np.int16).reshape(4410, 2)
+    sound = Sound.from_array(frames, fps=44100)
+    sound.play(buffersize=441, n_buffers=4)
+    assert len(played) == 10
+    assert np.array_equal(np.concatenate(played), frames)
+
+
+def test_play_loops_maxtime(played):
+    frames = np.arange(441 * 2, dtype=np.int16).reshape(441, 2)
+    sound = Sound.from_array(frames, fps=44100)
+
+    player = sound.play(buffersize=200, loops=2)
+    assert np.array_equal(np.concatenate(played), np.concatenate([frames] * 3))
+    assert player.position == pytest.approx(0.03)
+
+    del played[:]
+    player = sound.play(buffersize=200, loops=-1, maxtime=25)
+    assert not player.is_playing
+    assert np.array_equal(
+        np.concatenate(played), np.concatenate([frames] * 3)[: 44100 * 25 // 1000]
+    )
+
+
+def test_play_fade_ms(played):
+    frames = np.full((4410, 2), 10000, dtype=np.int16)
+    Sound.from_array(frames, fps=44100).play(buffersize=441, loops=1, fade_ms=50)
+
+    samples = np.concatenate(played)
+    assert samples[0, 0] == 0
+    assert (np.diff(samples[:2205, 0]) >= 0).all()
+    assert (samples[2205:] == 10000).all()
+
+
+def test_play_unknown_argument(mono_sound):
+    with pytest.raises(TypeError):
+        mono_sound.play(volume=0.5)
+
+
+def test_play_pcm24(stereo_sound, tmp_path):
+    filename = str(tmp_path / "pcm24.wav")
+    stereo_sound[:4410].save(filename, subtype="pcm24")
+    sound = Sound.from_file(filename)
+    assert sound.n_bytes == 3
+
+    player = sound.play(buffersize=441)
+    assert player.position == pytest.approx(0.1)
@@ -1,10 +1,40 @@
 """Breaks code base."""
 
-from waves.sound.generator import mono_ttf_gen, stereo_ttf_gen
-from waves.sound.main import Sound
+import importlib
+import sys
 
 
+# public objects, imported only when accessed so importing the package doesn't
+# load numpy nor libsndfile
+_LAZY_ATTRIBUTES = {
+    "Sound": "waves.sound.main",
+    "mono_ttf_gen": "waves.sound.generator",
+    "stereo_ttf_gen": "waves.sound.generator",
+}
+
+# subpackages and submodules, imported only when accessed as attributes
+_LAZY_SUBMODULES = ("batch", "catalog", "players", "sound")
+
 __all__ = ("Sound", "mono_ttf_gen", "stereo_ttf_gen")
 
 __title__ = "waves"
 __version__ = "0.2.6"
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    elif name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
+
+
+if sys.version_info < (3, 7):  # module '__getattr__' is not supported (PEP 562)
+    from waves.sound.generator import mono_ttf_gen, stereo_ttf_gen  # noqa: F401
+    from waves.sound.main import Sound  # noqa: F401
@@ -0,0 +1,287 @@
+"""Batch processing of the sounds stored in directory trees.
+
+The files are distributed in chunks to a pool of processes. The workers only
+receive the paths of the files, open and process each sound in a streaming
+pass, and write the result directly using :py:meth:`waves.Sound.save`, so no
+audio data is sent between processes:
+
+>>> from waves.batch import process_tree
+>>>
+>>> report = process_tree(
+...     "tests/files",
+...     "/tmp/waves-batch-example",
+...     operations=[("gain", (-6,)), ("resample", (48000,))],
+...     resume=False,
+... )
+>>> report.n_files, report.n_errors
+(2, 0)
+
+The paths of the files processed are appended to a journal file, so if the
+processing is interrupted, calling :py:func:`waves.batch.process_tree` again
+only processes the remaining files.
+"""
+import collections
+import concurrent.futures
+import os
+import time
+
+from waves.sound.main import Sound
+
+
+#: Extensions of the files processed by default.
+DEFAULT_EXTENSIONS = (".wav", ".aif", ".aiff", ".aifc", ".flac", ".rf64", ".w64")
+
+#: Name of the journal file created in the target directory by default.
+JOURNAL_FILENAME = ".waves-batch-journal"
+
+
+class BatchReport:
+    """Report of the files processed by :py:func:`waves.batch.process_tree`."""
+
+    def __init__(self):
+        #: Number of files processed successfully.
+        self.n_files = 0
+
+        #: Number of files skipped because they were processed before.
+        self.n_skipped = 0
+
+        #: Number of frames of the files processed successfully.
+        self.n_frames = 0
+
+        #: Paths of the files which couldn't be processed, relative to the
+        #: source directory, with the message of the error raised for each one.
+        self.errors = {}
+
+        #: Values returned by the function for each file, relative to the source
+        #: directory, if they are not sounds nor ``None``.
+        self.results = {}
+
+        self._start = time.perf_counter()
+        self._end = None
+
+    @property
+    def n_errors(self):
+        """Returns the number of files which couldn't be processed."""
+        return len(self.errors)
+
+    @property
+    def seconds(self):
+        """Returns the time spent processing the files, in seconds."""
+        return (self._end or time.perf_counter()) - self._start
+
+    @property
+    def files_per_second(self):
+        """Returns the number of files processed successfully per second."""
+        return self.n_files / self.seconds
+
+    @property
+    def frames_per_second(self):
+        """Returns the number of frames processed successfully per second."""
+        return self.n_frames / self.seconds
+
+    def __repr__(self):
+        return (
+            f"<BatchReport files={self.n_files} skipped={self.n_skipped}"
+            f" errors={self.n_errors} files/s={self.files_per_second:.1f}"
+            f" frames/s={self.frames_per_second:.0f}>"
+        )
+
+
+def iter_files(directory, extensions=DEFAULT_EXTENSIONS):
+    """Generates the paths of the files with some extensions stored in a
+    directory tree, relative to the directory, in alphabetical order.
+    """
+    extensions = tuple(extension.lower() for extension in extensions)
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield os.path.relpath(os.path.join(root, filename), directory)
+
+
+def _apply(sound, function, operations):
+    for operation in operations:
+        name, args, kwargs = (operation[0], (), {})
+        if len(operation) > 1:
+            args = operation[1]
+        if len(operation) > 2:
+            kwargs = operation[2]
+        sound = getattr(sound, name)(*args, **kwargs)
+    return sound if function is None else function(sound)
+
+
+def _process_file(relpath, source, target, function, operations, save_kwargs):
+    result = _apply(
+        Sound.from_file(os.path.join(source, relpath)), function, operations
+    )
+    if not isinstance(result, Sound):
+        return (0, result)
+    if target is None:
+        return (sum(len(chunk) for chunk in result.iter_chunks()), None)
+
+    filename = os.path.join(target, relpath)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    # write to a temporary file, so interrupted files are not left as processed
+    partial_filename = os.path.join(
+        os.path.dirname(filename), f".partial-{os.path.basename(filename)}"
+    )
+    n_frames = result.save(partial_filename, **save_kwargs)
+    os.replace(partial_filename, filename)
+    return (n_frames, None)
+
+
+def _process_files(relpaths, *args):
+    """Processes a chunk of files in a worker, returning for each one its path, the
+    number of frames processed, the value returned by the function and the error
+    raised, if any.
+    """
+    processed = []
+    for relpath in relpaths:
+        try:
+            n_frames, result = _process_file(relpath, *args)
+        except Exception as err:
+            processed.append((relpath, 0, None, f"{type(err).__name__}: {err}"))
+        else:
+            processed.append((relpath, n_frames, result, None))
+    return processed
+
+
+def _read_journal(journal):
+    try:
+        with open(journal, encoding="utf-8") as f:
+            return set(line.rstrip("\n") for line in f if line.endswith("\n"))
+    except FileNotFoundError:
+        return set()
+
+
+def process_tree(
+    source,
+    target=None,
+    function=None,
+    operations=(),
+    extensions=DEFAULT_EXTENSIONS,
+    max_workers=None,
+    chunksize=8,
+    journal=None,
+    resume=True,
+    callback=None,
+    **save_kwargs,
+):
+    """Processes all the sounds stored in a directory tree using a pool of
+    processes.
+
+    Parameters
+    ----------
+
+    source : str
+      Directory whose files will be processed, including its subdirectories.
+
+    target : str, optional
+      Directory in which the resulting sounds are saved, with the same relative
+      paths that their source files. If not defined, the results are rendered
+      but not saved.
+
+    function : function, optional
+      Function executed in the workers for each sound, after the ``operations``.
+      Must be picklable, so defined at the top level of a module. If returns a
+      :py:class:`waves.Sound` instance it's saved, otherwise the value returned
+      is stored in :py:attr:`waves.batch.BatchReport.results` if is not
+      ``None``.
+
+    operations : list, optional
+      Chain of operations applied to each sound, as tuples with the name of a
+      method of :py:class:`waves.Sound` and, optionally, a tuple of positional
+      arguments and a dictionary of keyword arguments, like
+      ``[("gain", (-6,)), ("fade", (), {"fade_in": 0.5})]``.
+
+    extensions : tuple, optional
+      Extensions of the files processed.
+
+    max_workers : int, optional
+      Maximum number of processes used. By default, the number of processors.
+
+    chunksize : int, optional
+      Number of files sent to a worker at once.
+
+    journal : str, optional
+      Path to the file in which the paths of the files processed are written.
+      By default, ``.waves-batch-journal`` inside the target directory, if
+      defined.
+
+    resume : bool, optional
+      Skip the files written in the journal by previous runs. If disabled, the
+      journal is truncated.
+
+    callback : function, optional
+      Function called after each file is processed with its relative path, the
+      number of frames processed and the message of the error raised, if any.
+
+    save_kwargs
+      Arguments passed to :py:meth:`waves.Sound.save` to save the results, like
+      ``subtype`` or ``buffersize``.
+
+    Returns
+    -------
+
+    :py:class:`waves.batch.BatchReport`
+      Report of the files processed, with the throughput reached.
+    """
+    if journal is None and target is not None:
+        journal = os.path.join(target, JOURNAL_FILENAME)
+    processed = _read_journal(journal) if journal and resume else set()
+    if journal:
+        os.makedirs(os.path.dirname(os.path.abspath(journal)), exist_ok=True)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_pending = max_workers << 1
+    args = (source, target, function, list(operations), save_kwargs)
+
+    report = BatchReport()
+    journal_file = None
+    if journal:
+        journal_file = open(journal, "a" if resume else "w", encoding="utf-8")
+        if journal_file.tell():
+            # the last line could have been left incomplete by an interruption
+            journal_file.write("\n")
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            relpaths = iter_files(source, extensions=extensions)
+            pending = collections.deque()
+
+            def submit():
+                chunk = []
+                for relpath in relpaths:
+                    if relpath in processed:
+                        report.n_skipped += 1
+                        continue
+                    chunk.append(relpath)
+                    if len(chunk) == chunksize:
+                        break
+                if chunk:
+                    pending.append(pool.submit(_process_files, chunk, *args))
+
+            for _ in range(max_pending):
+                submit()
+            while pending:
+                for relpath, n_frames, result, error in pending.popleft().result():
+                    if error is None:
+                        report.n_files += 1
+                        report.n_frames += n_frames
+                        if result is not None:
+                            report.results[relpath] = result
+                        if journal_file is not None:
+                            journal_file.write(f"{relpath}\n")
+                    else:
+                        report.errors[relpath] = error
+                    if callback is not None:
+                        callback(relpath, n_frames, error)
+                if journal_file is not None:
+                    journal_file.flush()
+                submit()
+    finally:
+        if journal_file is not None:
+            journal_file.close()
+
+    report._end = time.perf_counter()
+    return report
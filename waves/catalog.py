@@ -0,0 +1,312 @@
+"""Catalog of the layout of the sounds stored in large libraries.
+
+The layout of uncompressed PCM files is read parsing only their headers, in
+pure Python, without opening them with libsndfile nor reading their audio
+data:
+
+>>> from waves.catalog import probe
+>>>
+>>> probe("tests/files/stereo.wav")
+SoundInfo(container='wav', encoding='pcm16', n_channels=2, fps=44100, \
+n_frames=55216)
+>>> probe("tests/files/stereo.wav").duration
+1.252...
+
+The layouts of all the files of a library can be stored in a SQLite database,
+which is updated incrementally, probing only the files added or modified since
+the last update, and queried without reading the files:
+
+>>> from waves.catalog import Catalog
+>>>
+>>> with Catalog("/tmp/waves-catalog-example.sqlite3") as catalog:
+...     _ = catalog.update("tests/files")
+...     [info.filename for info in catalog.query(n_channels=2, min_duration=1)]
+['tests/files/stereo.wav']
+"""
+import collections
+import os
+import sqlite3
+
+from waves.sound.pcm import read_header
+
+
+#: Extensions of the files cataloged by default.
+DEFAULT_EXTENSIONS = (".wav", ".aif", ".aiff", ".aifc", ".flac", ".rf64", ".w64")
+
+_SOUND_INFO_FIELDS = ("container", "encoding", "n_channels", "fps", "n_frames")
+
+
+class SoundInfo(collections.namedtuple("SoundInfo", _SOUND_INFO_FIELDS)):
+    """Layout of the audio data of a file."""
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """Returns the duration of the sound, in seconds."""
+        return self.n_frames / self.fps
+
+
+#: Entry of a file stored in a :py:class:`waves.catalog.Catalog`.
+CatalogEntry = collections.namedtuple(
+    "CatalogEntry", ("filename", "mtime_ns", "size") + _SOUND_INFO_FIELDS
+)
+
+
+#: Counts of the changes done by :py:meth:`waves.catalog.Catalog.update`.
+CatalogUpdate = collections.namedtuple(
+    "CatalogUpdate", ("added", "updated", "removed", "unchanged", "errors")
+)
+
+
+def probe(filename, fallback=True):
+    """Reads the layout of the audio data of a file.
+
+    Uncompressed PCM WAV, RF64 and AIFF files are probed parsing their headers
+    using :py:func:`waves.sound.pcm.read_header`.
+
+    Parameters
+    ----------
+
+    filename : str
+      Path to the file in the disk.
+
+    fallback : bool, optional
+      Open with libsndfile the files whose headers can't be parsed, like
+      compressed files. If disabled, ``None`` is returned for them.
+
+    Returns
+    -------
+
+    :py:class:`waves.catalog.SoundInfo`
+      Layout of the audio data of the file.
+    """
+    header = read_header(filename)
+    if header is not None:
+        return SoundInfo(
+            container=header.container,
+            encoding=header.encoding,
+            n_channels=header.n_channels,
+            fps=header.fps,
+            n_frames=header.n_frames,
+        )
+    elif not fallback:
+        return None
+
+    import pysndfile as snd
+
+    f = snd.PySndfile(filename, "r")
+    try:
+        return SoundInfo(
+            container=f.major_format_str(),
+            encoding=f.encoding_str(),
+            n_channels=f.channels(),
+            fps=f.samplerate(),
+            n_frames=f.frames(),
+        )
+    finally:
+        f.close()
+
+
+def _iter_stats(directory, extensions):
+    """Generates the path, modification time and size of each file with some
+    extensions stored in a directory tree.
+    """
+    directories = [directory]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    stat = entry.stat()
+                    yield (entry.path, stat.st_mtime_ns, stat.st_size)
+
+
+class Catalog:
+    """Catalog of the layout of the sounds stored in directory trees, persisted
+    in a SQLite database.
+
+    Parameters
+    ----------
+
+    database : str
+      Path to the SQLite database file, created if doesn't exist.
+    """
+
+    def __init__(self, database):
+        #: Path to the SQLite database file.
+        self.database = database
+
+        self._connection = sqlite3.connect(database)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sounds ("
+            " filename TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " container TEXT,"
+            " encoding TEXT,"
+            " n_channels INTEGER,"
+            " fps INTEGER,"
+            " n_frames INTEGER,"
+            " duration REAL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sounds_layout"
+            " ON sounds (n_channels, duration)"
+        )
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM sounds").fetchone()[0]
+
+    def close(self):
+        """Closes the connection to the database."""
+        self._connection.close()
+
+    def update(self, directory, extensions=DEFAULT_EXTENSIONS, fallback=True):
+        """Updates the entries of the files stored in a directory tree.
+
+        Only the files whose modification time or size have changed since the
+        last update are probed, and the entries of the files removed from the
+        directory tree are deleted. The files which can't be probed are stored
+        without layout, so they're not probed again until they're modified.
+
+        Parameters
+        ----------
+
+        directory : str
+          Directory whose files will be cataloged, including its
+          subdirectories.
+
+        extensions : tuple, optional
+          Extensions of the files cataloged.
+
+        fallback : bool, optional
+          Open with libsndfile the files whose headers can't be parsed, as in
+          :py:func:`waves.catalog.probe`.
+
+        Returns
+        -------
+
+        :py:class:`waves.catalog.CatalogUpdate`
+          Number of entries added, updated, removed and unchanged, and number of
+          files which couldn't be probed.
+        """
+        directory = os.path.normpath(directory)
+        prefix = os.path.join(directory, "")
+        stored = {
+            filename: (mtime_ns, size)
+            for filename, mtime_ns, size in self._connection.execute(
+                "SELECT filename, mtime_ns, size FROM sounds"
+                " WHERE substr(filename, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+        }
+
+        added, updated, unchanged, errors, rows = (0, 0, 0, 0, [])
+        extensions = tuple(extension.lower() for extension in extensions)
+        for filename, mtime_ns, size in _iter_stats(directory, extensions):
+            previous = stored.pop(filename, None)
+            if previous == (mtime_ns, size):
+                unchanged += 1
+                continue
+            try:
+                info = probe(filename, fallback=fallback)
+                if info is not None and info.n_frames is not None:
+                    duration = info.duration
+                else:
+                    duration = None
+            except Exception:
+                info = None
+            if info is None:
+                errors += 1
+                info, duration = (SoundInfo(None, None, None, None, None), None)
+
+            rows.append((filename, mtime_ns, size) + tuple(info) + (duration,))
+            if previous is None:
+                added += 1
+            else:
+                updated += 1
+
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO sounds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._connection.executemany(
+                "DELETE FROM sounds WHERE filename = ?",
+                ((filename,) for filename in stored),
+            )
+        return CatalogUpdate(added, updated, len(stored), unchanged, errors)
+
+    def query(
+        self,
+        n_channels=None,
+        fps=None,
+        container=None,
+        encoding=None,
+        min_duration=None,
+        max_duration=None,
+    ):
+        """Generates the entries of the files which match some conditions,
+        ordered by their paths.
+
+        Parameters
+        ----------
+
+        n_channels : int, optional
+          Number of channels of the sounds.
+
+        fps : int, optional
+          Number of frames per second of the sounds.
+
+        container : str, optional
+          Major format of the files, like ``"wav"`` or ``"aiff"``.
+
+        encoding : str, optional
+          Encoding of the samples, like ``"pcm16"`` or ``"float32"``.
+
+        min_duration : float, optional
+          Minimum duration of the sounds, in seconds.
+
+        max_duration : float, optional
+          Maximum duration of the sounds, in seconds.
+
+        Returns
+        -------
+
+        generator
+          Generates a :py:class:`waves.catalog.CatalogEntry` for each file.
+        """
+        conditions, parameters = (["n_frames IS NOT NULL"], [])
+        for column, value in (
+            ("n_channels", n_channels),
+            ("fps", fps),
+            ("container", container),
+            ("encoding", encoding),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if min_duration is not None:
+            conditions.append("duration >= ?")
+            parameters.append(min_duration)
+        if max_duration is not None:
+            conditions.append("duration <= ?")
+            parameters.append(max_duration)
+
+        cursor = self._connection.execute(
+            f"SELECT {', '.join(CatalogEntry._fields)} FROM sounds"
+            f" WHERE {' AND '.join(conditions)} ORDER BY filename",
+            parameters,
+        )
+        for row in cursor:
+            yield CatalogEntry(*row)
@@ -1,12 +1,22 @@
 """Pygame sound playing utilities."""
 
+import collections
 import os
+import threading
 import time
 
 
 # hide pygame welcome message
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
+# serializes the calls to the mixer of the streaming players with its
+# reinitializations, as a quitted mixer can't be used
+_mixer_lock = threading.RLock()
+
+# format reported by the mixer for each format requested, as they differ for
+# floating point samples, requested with positive sizes but reported negative
+_mixer_formats = {}
+
 
 def play_sound(data, frequency=44100, size=2, n_channels=2, wait=True, **kwargs):
     """Plays sound using Pygame.
@@ -33,3 +43,165 @@ def play_sound(data, frequency=44100, size=2, n_channels=2, wait=True, **kwargs)
         time.sleep(wait)
 
     return pg_sound
+
+
+def _init_mixer(frequency, size, n_channels):
+    """Initializes the Pygame mixer, reinitializing it if its format differs,
+    which stops the streaming players using the previous format. Returns the
+    mixer and its format.
+    """
+    from pygame import mixer
+
+    requested = (frequency, size, n_channels)
+    with _mixer_lock:
+        current = mixer.get_init()
+        if current is None or current != _mixer_formats.get(requested):
+            if current:
+                mixer.quit()
+            mixer.init(frequency=frequency, size=size, channels=n_channels)
+            _mixer_formats[requested] = mixer.get_init()
+        return (mixer, mixer.get_init())
+
+
+class StreamPlayer:
+    """Plays a stream of chunks of frames using Pygame, without storing the
+    whole sound in memory.
+
+    A thread converts the next chunks to Pygame sounds, keeping up to
+    ``n_buffers`` of them ready, and queues each one in a mixer channel when the
+    previous one starts playing, so the memory used and the latency to start
+    playing don't depend on the duration of the sound, which can be infinite.
+
+    Parameters
+    ----------
+
+    chunks : iterable
+      Chunks of frames to play, as arrays of shape ``(n_frames,)`` for mono
+      sounds or ``(n_frames, n_channels)``, in the format of the mixer. Each
+      chunk is copied before reading the next one, so they can share memory.
+
+    frequency : int, optional
+      Number of frames per second.
+
+    size : int, optional
+      Number of bits of each sample, negative for signed integer samples.
+      ``32`` for floating point samples.
+
+    n_channels : int, optional
+      Number of channels.
+
+    n_buffers : int, optional
+      Number of chunks converted ahead of playing.
+    """
+
+    def __init__(self, chunks, frequency=44100, size=-16, n_channels=2, n_buffers=4):
+        #: Number of frames per second.
+        self.frequency = frequency
+
+        #: Number of chunks converted ahead of playing.
+        self.n_buffers = n_buffers
+
+        self._chunks = iter(chunks)
+        self._mixer, self._format = _init_mixer(frequency, size, n_channels)
+        self._channel = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._finished = threading.Event()
+        self._clock = (0, None, 0)  # frames played, start of current, its frames
+
+    @property
+    def is_playing(self):
+        """Returns if the player has been started and hasn't finished nor been
+        stopped.
+        """
+        return self._thread is not None and not self._finished.is_set()
+
+    @property
+    def position(self):
+        """Returns the time played since the start, in seconds."""
+        n_frames, started_at, n_current = self._clock
+        if started_at is not None:
+            elapsed = (time.perf_counter() - started_at) * self.frequency
+            n_frames += min(int(elapsed), n_current)
+        return n_frames / self.frequency
+
+    def play(self):
+        """Starts playing in background, returning immediately."""
+        if self._thread is None:
+            self._channel = self._mixer.find_channel(True)
+            self._thread = threading.Thread(target=self._feed, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops playing, returning immediately."""
+        self._stopped.set()
+        if self._channel is not None:
+            with _mixer_lock:
+                self._freeze_clock()
+                if self._mixer.get_init() == self._format:
+                    self._channel.stop()
+        if self._thread is None:
+            self._finished.set()
+
+    def wait(self, timeout=None):
+        """Waits until the end of the stream, or until ``timeout`` seconds have
+        passed. Returns if has finished.
+        """
+        return self._finished.wait(timeout)
+
+    def _freeze_clock(self):
+        """Stops advancing the position, keeping the time played until now."""
+        self._clock = (round(self.position * self.frequency), None, 0)
+
+    def _schedule(self, ring, scheduled, exhausted):
+        """Queues the next buffer when the channel has room for it, returning
+        if all the buffers have been played.
+        """
+        # advance the clock for the buffers whose playing has ended
+        n_frames, started_at, n_current = self._clock
+        playing = self._channel.get_sound()
+        while scheduled and scheduled[0][0] is not playing:
+            n_frames += scheduled.popleft()[1]
+            started_at = time.perf_counter() if scheduled else None
+            n_current = scheduled[0][1] if scheduled else 0
+        self._clock = (n_frames, started_at, n_current)
+
+        if ring and self._channel.get_queue() is None:
+            buffer = ring.popleft()
+            if scheduled:
+                self._channel.queue(buffer[0])
+            else:
+                self._channel.play(buffer[0])
+                self._clock = (n_frames, time.perf_counter(), buffer[1])
+            scheduled.append(buffer)
+        return exhausted and not ring and not scheduled
+
+    def _feed(self):
+        ring, scheduled, exhausted = (collections.deque(), collections.deque(), False)
+        try:
+            while not self._stopped.is_set():
+                while len(ring) < self.n_buffers and not exhausted:
+                    try:
+                        chunk = next(self._chunks)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    # chunks can be views of the same array refilled at each
+                    # read, so each one is copied to a Pygame sound before the
+                    # next one is read
+                    with _mixer_lock:
+                        if self._mixer.get_init() != self._format:
+                            break
+                        ring.append((self._mixer.Sound(array=chunk), len(chunk)))
+
+                with _mixer_lock:
+                    if self._mixer.get_init() != self._format:
+                        break  # reinitialized for other format by other player
+                    if self._schedule(ring, scheduled, exhausted):
+                        break
+                self._stopped.wait(0.005)
+        finally:
+            with _mixer_lock:
+                self._freeze_clock()
+            self._finished.set()
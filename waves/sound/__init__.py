@@ -1 +1,31 @@
 """Sound interfaces."""
+
+import importlib
+
+
+# submodules, imported only when accessed as attributes of the package
+_LAZY_SUBMODULES = (
+    "buffersize",
+    "cache",
+    "figure",
+    "generator",
+    "handles",
+    "io",
+    "main",
+    "ops",
+    "peaks",
+    "pcm",
+    "play",
+    "plot",
+    "resample",
+)
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
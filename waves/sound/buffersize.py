@@ -0,0 +1,173 @@
+"""Automatic sizing of the blocks of frames read and written in streaming passes.
+
+Reading or rendering a block of frames has a fixed cost for each call, so
+small blocks spend most of the time in that overhead, while large blocks use
+more memory. When ``buffersize`` is not defined, :py:meth:`waves.Sound.iter_chunks`
+and :py:meth:`waves.Sound.save` choose it using the process-wide
+:py:class:`waves.sound.buffersize.BufferSizer`, from the size of the sound, its
+number of channels and type of the samples, the throughput observed in previous
+reads and a memory budget for each block:
+
+>>> from waves import Sound
+>>> from waves.sound.buffersize import get_sizer
+>>>
+>>> sound = Sound.from_file("tests/files/stereo.wav")
+>>> chunks = list(sound.iter_chunks())
+>>> len(chunks[0]) == get_sizer().last_buffersize
+True
+
+Explicit values of ``buffersize`` are always used as they are.
+"""
+import threading
+import time
+
+import numpy as np
+
+
+#: Default maximum number of bytes of each block of frames.
+DEFAULT_MEMORY_BUDGET = 0b1 << 23  # 8 MiB
+
+#: Default time spent reading each block, in seconds, for which the overhead of
+#: each call is negligible.
+DEFAULT_TARGET_SECONDS = 0.01
+
+#: Minimum number of frames of the blocks chosen, unless the sound is shorter.
+MIN_BUFFERSIZE = 0b10000000000  # 1024 frames
+
+# Number of bytes of the blocks used while the throughput is not known
+_INITIAL_BLOCK_BYTES = 0b1 << 18  # 256 KiB
+
+# Weight of each new measure in the average throughput
+_THROUGHPUT_SMOOTHING = 0.25
+
+_sizer = None
+_sizer_lock = threading.Lock()
+
+
+class BufferSizer:
+    """Chooses the number of frames of the blocks read from sounds.
+
+    The number of frames is the power of two which takes about
+    ``target_seconds`` to read at the throughput observed, for the bytes of each
+    frame of the sound. It's at least
+    :py:data:`waves.sound.buffersize.MIN_BUFFERSIZE`, but never exceeds the
+    memory budget nor the number of frames of the sound. The throughput is
+    averaged separately for each source of frames, like files or functions.
+
+    Parameters
+    ----------
+
+    memory_budget : int, optional
+      Maximum number of bytes of each block of frames.
+
+    target_seconds : float, optional
+      Time spent reading each block, in seconds.
+    """
+
+    def __init__(
+        self,
+        memory_budget=DEFAULT_MEMORY_BUDGET,
+        target_seconds=DEFAULT_TARGET_SECONDS,
+    ):
+        #: Maximum number of bytes of each block of frames.
+        self.memory_budget = memory_budget
+
+        #: Time spent reading each block, in seconds.
+        self.target_seconds = target_seconds
+
+        #: Number of frames of the last block size chosen.
+        self.last_buffersize = None
+
+        self._throughputs = {}  # source: bytes per second
+        self._lock = threading.Lock()
+
+    @property
+    def throughputs(self):
+        """Returns a dictionary with the average throughput observed for each
+        source of frames, in bytes per second.
+        """
+        return dict(self._throughputs)
+
+    @property
+    def stats(self):
+        """Returns a dictionary with the parameters and the last block size
+        chosen.
+        """
+        return {
+            "memory_budget": self.memory_budget,
+            "target_seconds": self.target_seconds,
+            "last_buffersize": self.last_buffersize,
+            "throughputs": self.throughputs,
+        }
+
+    def observe(self, source, n_bytes, seconds):
+        """Records the time spent reading a number of bytes from a source."""
+        if seconds <= 0:
+            return
+        throughput = n_bytes / seconds
+        with self._lock:
+            previous = self._throughputs.get(source)
+            if previous is not None:
+                throughput = previous + _THROUGHPUT_SMOOTHING * (throughput - previous)
+            self._throughputs[source] = throughput
+
+    def choose(self, sound, source="file"):
+        """Returns the number of frames of the blocks read from a sound.
+
+        Parameters
+        ----------
+
+        sound : :py:class:`waves.Sound`
+          Sound read.
+
+        source : str, optional
+          Source of the frames of the sound, whose throughput is used.
+
+        Returns
+        -------
+
+        int
+          Number of frames of each block.
+        """
+        frame_bytes = sound.n_channels * np.dtype(sound.dtype).itemsize
+        throughput = self._throughputs.get(source)
+        if throughput is None:
+            n_bytes = _INITIAL_BLOCK_BYTES
+        else:
+            n_bytes = throughput * self.target_seconds
+        n_frames = max(int(n_bytes // frame_bytes), MIN_BUFFERSIZE)
+        n_frames = max(min(n_frames, self.memory_budget // frame_bytes), 1)
+
+        buffersize = 1
+        while buffersize << 1 <= n_frames:
+            buffersize <<= 1
+        if sound.n_frames is not None:
+            buffersize = max(min(buffersize, sound.n_frames), 1)
+
+        self.last_buffersize = buffersize
+        return buffersize
+
+    def observed(self, chunks, source="file"):
+        """Generates the chunks of an iterator, recording the time spent
+        producing each one as throughput of a source. The time spent by the
+        consumer between chunks is not measured.
+        """
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            self.observe(source, chunk.nbytes, time.perf_counter() - start)
+            yield chunk
+
+
+def get_sizer():
+    """Returns the process-wide sizer of blocks of frames."""
+    global _sizer
+
+    if _sizer is None:
+        with _sizer_lock:
+            if _sizer is None:
+                _sizer = BufferSizer()
+    return _sizer
@@ -0,0 +1,217 @@
+"""Process-wide cache of decoded audio data.
+
+The cache is disabled by default. When enabled, the data decoded from files
+by the sounds is stored in memory, so reading the data of the same file again,
+even from other :py:class:`waves.Sound` instances, doesn't decode it again:
+
+>>> from waves import Sound
+>>> from waves.sound import cache
+>>>
+>>> decoded_cache = cache.enable(max_bytes=2 ** 24)
+>>> Sound.from_file("tests/files/mono.wav").data.shape
+(106022,)
+>>> Sound.from_file("tests/files/mono.wav").data.shape
+(106022,)
+>>> decoded_cache.hits, decoded_cache.misses
+(1, 1)
+>>> cache.disable()
+"""
+import collections
+import os
+import threading
+
+import numpy as np
+
+
+#: Default memory budget of the cache, in bytes.
+DEFAULT_MAX_BYTES = 0b1 << 28  # 256 MiB
+
+_decoded_cache = None
+
+
+class DecodedCache:
+    """Least recently used cache of decoded audio data with a memory budget.
+
+    The arrays are identified by the path of the file, its modification time, its
+    size and the type used to decode it, so modified files are decoded again.
+    Cached arrays are shared between all the sounds that read them, so they're
+    returned as read only arrays.
+
+    Parameters
+    ----------
+
+    max_bytes : int, optional
+      Maximum number of bytes of decoded data stored. When exceeded, the least
+      recently used arrays are discarded.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+
+        #: Number of bytes of decoded data currently stored.
+        self.n_bytes = 0
+
+        #: Number of reads served from the cache.
+        self.hits = 0
+
+        #: Number of reads which needed to decode the data.
+        self.misses = 0
+
+        #: Number of arrays discarded to keep the cache under the memory budget.
+        self.evictions = 0
+
+        self._arrays = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._arrays)
+
+    @staticmethod
+    def key(filename, dtype, frames=None):
+        """Builds the key which identifies the data of a file decoded as ``dtype``.
+
+        If ``frames`` is defined, must be a tuple with the index of the first frame
+        and the number of frames decoded.
+        """
+        stat = os.stat(filename)
+        return (
+            os.path.realpath(filename),
+            stat.st_mtime_ns,
+            stat.st_size,
+            np.dtype(dtype).str,
+            frames,
+        )
+
+    @property
+    def max_bytes(self):
+        """Maximum number of bytes of decoded data stored. Reducing it discards
+        the least recently used arrays exceeding the new budget.
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict(0)
+
+    def _evict(self, n_bytes):
+        """Discards the least recently used arrays until ``n_bytes`` more bytes
+        fit in the memory budget.
+        """
+        while self._arrays and self.n_bytes + n_bytes > self._max_bytes:
+            _, evicted = self._arrays.popitem(last=False)
+            self.n_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        """Returns the fraction of reads served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def stats(self):
+        """Returns a dictionary with the statistics of usage of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "n_arrays": len(self),
+            "n_bytes": self.n_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def get(self, key):
+        """Returns the array stored for a key, or ``None`` if is not cached."""
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is None:
+                self.misses += 1
+            else:
+                self._arrays.move_to_end(key)
+                self.hits += 1
+            return array
+
+    def put(self, key, array):
+        """Stores an array for a key, discarding the least recently used arrays if
+        needed to fit in the memory budget. Arrays larger than the budget are not
+        stored.
+
+        Returns the array stored, which is marked as read only.
+        """
+        array.setflags(write=False)
+        if array.nbytes > self.max_bytes:
+            return array
+
+        with self._lock:
+            previous = self._arrays.pop(key, None)
+            if previous is not None:
+                self.n_bytes -= previous.nbytes
+            self._evict(array.nbytes)
+            self._arrays[key] = array
+            self.n_bytes += array.nbytes
+        return array
+
+    def get_or_decode(self, filename, dtype, decode, frames=None):
+        """Returns the data of a file decoded as ``dtype`` from the cache, calling
+        ``decode`` to decode and store it if is not cached.
+        """
+        key = self.key(filename, dtype, frames=frames)
+        array = self.get(key)
+        if array is None:
+            array = self.put(key, decode())
+        return array
+
+    def clear(self):
+        """Discards all the arrays stored."""
+        with self._lock:
+            self._arrays.clear()
+            self.n_bytes = 0
+
+
+def enable(max_bytes=DEFAULT_MAX_BYTES):
+    """Enables the process-wide cache of decoded audio data.
+
+    If the cache is already enabled, its memory budget is updated keeping the
+    data stored, except the least recently used arrays which exceed a reduced
+    budget.
+
+    Parameters
+    ----------
+
+    max_bytes : int, optional
+      Maximum number of bytes of decoded data stored.
+
+    Returns
+    -------
+
+    :py:class:`waves.sound.cache.DecodedCache`
+      Cache enabled.
+    """
+    global _decoded_cache
+
+    if _decoded_cache is None:
+        _decoded_cache = DecodedCache(max_bytes=max_bytes)
+    else:
+        _decoded_cache.max_bytes = max_bytes
+    return _decoded_cache
+
+
+def disable():
+    """Disables the process-wide cache of decoded audio data, discarding the data
+    stored.
+    """
+    global _decoded_cache
+
+    if _decoded_cache is not None:
+        _decoded_cache.clear()
+    _decoded_cache = None
+
+
+def get_cache():
+    """Returns the process-wide cache of decoded audio data if is enabled,
+    otherwise ``None``.
+    """
+    return _decoded_cache
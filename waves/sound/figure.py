@@ -3,7 +3,118 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
-def figure(sound, title="Sound data"):
+def envelope(sound, n_bins, buffersize=None):
+    """Reduces the frames of a sound to the minimum and maximum values of each
+    channel in ``n_bins`` consecutive ranges of frames of the same length.
+
+    The ranges are computed in a single streaming pass over
+    :py:meth:`waves.Sound.iter_chunks`, so the memory used depends on the number
+    of ranges and not on the duration of the sound.
+
+    Parameters
+    ----------
+
+    sound : :py:class:`waves.Sound`
+      Sound reduced, whose number of frames must be known.
+
+    n_bins : int
+      Number of ranges of frames. If the sound has fewer frames, each range
+      contains one frame.
+
+    buffersize : int, optional
+      Number of frames read at each chunk, chosen automatically if not defined.
+
+    Returns
+    -------
+
+    tuple
+      Time of the middle of each range, in seconds, and arrays with the minimum
+      and maximum values of each range, with shape ``(n_bins, n_channels)``.
+
+    Examples
+    --------
+
+    >>> from waves import Sound
+    >>> from waves.sound.figure import envelope
+    >>>
+    >>> sound = Sound.from_file("tests/files/stereo.wav")
+    >>> times, minimums, maximums = envelope(sound, 800)
+    >>> times.shape, minimums.shape, maximums.shape
+    ((800,), (800, 2), (800, 2))
+    >>> bool((minimums.min(axis=0) == sound.dataframes.min(axis=0)).all())
+    True
+    """
+    if sound.n_frames is None:
+        raise ValueError("The duration of the sound must be defined")
+    n_bins = max(min(n_bins, sound.n_frames), 1)
+    edges = np.arange(n_bins + 1) * sound.n_frames // n_bins
+
+    minimums = np.full((n_bins, sound.n_channels), np.inf)
+    maximums = np.full((n_bins, sound.n_channels), -np.inf)
+    start = 0
+    for chunk in sound.iter_chunks(buffersize=buffersize):
+        chunk = chunk.reshape(len(chunk), sound.n_channels)
+        stop = start + len(chunk)
+        first = np.searchsorted(edges, start, side="right") - 1
+        last = np.searchsorted(edges, stop - 1, side="right")
+        indexes = np.maximum(edges[first:last] - start, 0)
+
+        np.minimum(
+            minimums[first:last],
+            np.minimum.reduceat(chunk, indexes, axis=0),
+            out=minimums[first:last],
+        )
+        np.maximum(
+            maximums[first:last],
+            np.maximum.reduceat(chunk, indexes, axis=0),
+            out=maximums[first:last],
+        )
+        start = stop
+
+    # functions could have raised `StopIteration` before the end of the sound
+    n_bins = np.searchsorted(edges[:-1], start)
+    times = (edges[:n_bins] + edges[1 : n_bins + 1] - 1) / 2 / sound.fps
+    return (times, minimums[:n_bins], maximums[:n_bins])
+
+
+def figure(sound, title="Sound data", n_bins=None, full_resolution=False, peaks=False):
+    """Builds a matplotlib figure with the channels of the sound plotted.
+
+    Long sounds are plotted as their envelope, filling the range between the
+    minimum and maximum values of each range of frames represented by a column
+    of pixels of the figure, computed by :py:func:`waves.sound.figure.envelope`,
+    so the cost of plotting doesn't depend on the duration of the sound. Sounds
+    with fewer than two frames for each column are plotted frame by frame. To
+    zoom in, plot a slice of the sound, like ``sound[44100:88200].figure()``.
+
+    Parameters
+    ----------
+
+    title : str, optional
+      Figure title.
+
+    n_bins : int, optional
+      Number of ranges of frames plotted. By default, the width of the figure
+      in pixels.
+
+    full_resolution : bool, optional
+      Plot all the frames of the sound, whatever its duration.
+
+    peaks : bool, optional
+      For sounds read from files, compute the envelope from the peak file of
+      the audio file, see :py:mod:`waves.sound.peaks`, building it if doesn't
+      exist or is outdated, so plotting any slice of the file again doesn't read
+      its audio data.
+
+    Returns
+    -------
+
+    tuple
+      Figure and array of axes, one for each channel.
+    """
+    if sound.n_frames is None:
+        raise ValueError("The duration of the sound must be defined")
+
     fig, axes = plt.subplots(sound.n_channels)
     if not isinstance(axes, np.ndarray):
         # for mono, axes is a `matplotlib.axes._subplots.AxesSubplot` object
@@ -13,19 +124,43 @@ def figure(sound, title="Sound data"):
         _need_label = True
     fig.suptitle(title)
 
-    data = [sound.data] if sound.n_channels == 1 else sound.data
+    if n_bins is None:
+        n_bins = int(fig.get_figwidth() * fig.dpi)
+    if full_resolution or sound.n_frames < n_bins << 1:
+        frames = sound.dataframes.reshape(sound.n_frames, sound.n_channels)
+        times = next(sound.iter_timechunks(buffersize=len(frames)))
+        minimums = maximums = frames
+    else:
+        reduction = None
+        if peaks:
+            from waves.sound.peaks import get_peaks
 
-    for i in range(sound.n_channels):
-        time_sequence = list(sound.time_sequence)
+            start = sound.offset
+            reduction = get_peaks(sound).query(start, start + sound.n_frames, n_bins)
+        if reduction is None:
+            # not using peak files or zoomed in beyond their first level
+            times, minimums, maximums = envelope(sound, n_bins)
+        else:
+            times, minimums, maximums, _ = reduction
 
+    for i in range(sound.n_channels):
         color = "tab:red" if i % 2 else "tab:blue"
         label = ("L" if i % 2 == 0 else "R") + str(round((i + 1.1) / 2))
-        axes[i].plot(
-            time_sequence,
-            data[i],
-            color=color,
-            linewidth=0.3,
-        )
+        if minimums is maximums:
+            axes[i].plot(
+                times,
+                minimums[:, i],
+                color=color,
+                linewidth=0.3,
+            )
+        else:
+            axes[i].fill_between(
+                times,
+                minimums[:, i],
+                maximums[:, i],
+                color=color,
+                linewidth=0.3,
+            )
         if _need_label:
             axes[i].set_ylabel(
                 label,
@@ -35,9 +170,9 @@ def figure(sound, title="Sound data"):
                 color=color,
                 fontweight="bold",
             )
-        axes[i].set_xlim(0, time_sequence[-1])
-        axes[i].set_xticks(
-            np.arange(0, time_sequence[-1], round(sound.duration / 15, 1))
-        )
+        axes[i].set_xlim(0, times[-1])
+        step = round(sound.duration / 15, 1)
+        if step:
+            axes[i].set_xticks(np.arange(0, times[-1], step))
 
     return (fig, axes)
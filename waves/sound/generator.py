@@ -29,7 +29,7 @@ def mono_ttf_gen(fps=44100, frequency=110, volume=0.5, sample_width=2):
     -------
 
     function: Takes a parameter time ``t`` and returns the sound data for that
-        time.
+        time. If ``t`` is a Numpy array of times, returns the data for each one.
 
 
     Examples
@@ -45,6 +45,7 @@ def mono_ttf_gen(fps=44100, frequency=110, volume=0.5, sample_width=2):
     def time_to_frame(t):
         return (np.sin(frequency * 2 * np.pi * t) * amplitude).astype(dtype)
 
+    time_to_frame.vectorized = True
     return time_to_frame
 
 
@@ -75,7 +76,8 @@ def stereo_ttf_gen(fps=44100, frequencies=(440, 110), volume=0.5, sample_width=2
     -------
 
     function: Takes a parameter time ``t`` and returns the sound data for that
-        time for each channel of the sound.
+        time for each channel of the sound. If ``t`` is a Numpy array of times,
+        returns an array with shape ``(len(t), n_channels)``.
 
 
     Examples
@@ -89,8 +91,12 @@ def stereo_ttf_gen(fps=44100, frequencies=(440, 110), volume=0.5, sample_width=2
     amplitude = np.iinfo(dtype).max * volume
 
     def time_to_frame(t):
-        return np.array(
-            [np.sin(freq * 2 * np.pi * t) * amplitude for freq in frequencies]
-        ).astype(dtype)
-
+        # transposed so arrays of times render blocks of ``(n, n_channels)``
+        return (
+            np.array([np.sin(freq * 2 * np.pi * t) * amplitude for freq in frequencies])
+            .astype(dtype)
+            .T
+        )
+
+    time_to_frame.vectorized = True
     return time_to_frame
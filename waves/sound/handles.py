@@ -0,0 +1,264 @@
+"""Pool of opened files shared by all the sounds.
+
+The sounds opened from files don't keep their files opened. Instead, they take
+an opened :py:class:`pysndfile.PySndfile` instance from a process-wide pool
+each time that they read data, and return it after reading. The pool keeps
+opened only the most recently used files, so the number of file descriptors
+used doesn't depend on the number of sounds alive. The files closed are
+reopened transparently when read again:
+
+>>> from waves import Sound
+>>> from waves.sound.handles import get_pool
+>>>
+>>> sounds = [Sound.from_file("tests/files/mono.wav") for _ in range(1000)]
+>>> len(get_pool()) <= get_pool().max_handles
+True
+
+As each opened file is used by one reader at a time, multiple threads can
+read the same sound, or even the same file, concurrently:
+
+>>> import numpy as np
+>>> from concurrent.futures import ThreadPoolExecutor
+>>>
+>>> sound = sounds[0]
+>>> def read(start):
+...     return sound[start : start + 1000].data
+>>>
+>>> with ThreadPoolExecutor(max_workers=4) as executor:
+...     chunks = list(executor.map(read, range(0, 8000, 1000)))
+>>> bool((np.concatenate(chunks) == sound.data[:8000]).all())
+True
+"""
+import collections
+import contextlib
+import os
+import threading
+
+import pysndfile as snd
+
+
+#: Default maximum number of files kept opened by the pool.
+DEFAULT_MAX_HANDLES = 0b10000000  # 128
+
+# number of files closed by the pool remembered to count reopens, for each
+# file kept opened, so the memory used is bounded too
+_CLOSED_HISTORY_FACTOR = 4
+
+_handle_pool = None
+_handle_pool_lock = threading.Lock()
+
+
+def _source_stat(filename):
+    stat = os.stat(filename)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class HandlePool:
+    """Least recently used pool of files opened for reading.
+
+    Each opened file is used by only one reader at a time, which takes it from
+    the pool using :py:meth:`waves.sound.handles.HandlePool.handle` and
+    returns it when finishes reading. If the file is being read by other
+    thread, another file descriptor is opened, so concurrent readers never
+    share their positions and don't need to lock each other.
+
+    The opened files are identified by their paths, modification times and
+    sizes, so when a file is overwritten its idle descriptors are closed and
+    the new content is opened again.
+
+    Parameters
+    ----------
+
+    max_handles : int, optional
+      Maximum number of idle files kept opened. When exceeded, the least
+      recently used files are closed. The files being read are never closed.
+    """
+
+    def __init__(self, max_handles=DEFAULT_MAX_HANDLES):
+        self._max_handles = max_handles
+
+        #: Number of times that an opened file has been reused.
+        self.hits = 0
+
+        #: Number of times that a file has been opened.
+        self.opens = 0
+
+        #: Number of times that a file has been opened again after being closed
+        #: by the pool, counted only for the files closed recently.
+        self.reopens = 0
+
+        #: Number of files closed to keep the pool under its maximum size.
+        self.evictions = 0
+
+        #: Number of files currently being read.
+        self.in_use = 0
+
+        self._idle = collections.OrderedDict()  # filename: [handles]
+        self._sources = {}  # filename: (mtime_ns, size) of its idle handles
+        self._acquired = {}  # id(handle): (mtime_ns, size) when was opened
+        self._n_idle = 0
+        self._closed = collections.OrderedDict()  # filename: None, bounded
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._n_idle + self.in_use
+
+    @property
+    def max_handles(self):
+        """Maximum number of idle files kept opened. Reducing it closes the
+        least recently used files exceeding the new size.
+        """
+        return self._max_handles
+
+    @max_handles.setter
+    def max_handles(self, max_handles):
+        with self._lock:
+            self._max_handles = max_handles
+            self._evict()
+
+    @property
+    def hit_rate(self):
+        """Returns the fraction of reads which reused an opened file."""
+        total = self.hits + self.opens
+        return self.hits / total if total else 0.0
+
+    @property
+    def stats(self):
+        """Returns a dictionary with the statistics of usage of the pool."""
+        return {
+            "size": len(self),
+            "in_use": self.in_use,
+            "max_handles": self.max_handles,
+            "hits": self.hits,
+            "opens": self.opens,
+            "reopens": self.reopens,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _evict(self):
+        while self._n_idle > self._max_handles:
+            filename, handles = next(iter(self._idle.items()))
+            handles.pop(0).close()
+            if not handles:
+                del self._idle[filename]
+                del self._sources[filename]
+                self._closed[filename] = None
+                self._closed.move_to_end(filename)
+                if len(self._closed) > self._max_handles * _CLOSED_HISTORY_FACTOR:
+                    self._closed.popitem(last=False)
+            self._n_idle -= 1
+            self.evictions += 1
+
+    def acquire(self, filename):
+        """Takes a file opened for reading from the pool, opening it if all its
+        opened descriptors are being read. Must be returned to the pool using
+        :py:meth:`waves.sound.handles.HandlePool.release`.
+        """
+        source = _source_stat(filename)
+        with self._lock:
+            if self._sources.get(filename, source) != source:
+                self.close(filename)  # the file has been modified
+            handles = self._idle.get(filename)
+            if handles:
+                handle = handles.pop()
+                if handles:
+                    self._idle.move_to_end(filename)
+                else:
+                    del self._idle[filename]
+                    del self._sources[filename]
+                self._n_idle -= 1
+                self.in_use += 1
+                self.hits += 1
+                self._acquired[id(handle)] = source
+                return handle
+
+            if self._closed.pop(filename, 0) is None:
+                self.reopens += 1
+            self.opens += 1
+            self.in_use += 1
+        try:
+            handle = snd.PySndfile(filename, "r")
+        except Exception:
+            with self._lock:
+                self.in_use -= 1
+            raise
+        with self._lock:
+            self._acquired[id(handle)] = source
+        return handle
+
+    def release(self, filename, handle):
+        """Returns a file taken from the pool, keeping it opened for the next
+        readers. If the file has been modified since it was opened by other
+        reader, the descriptor is closed.
+        """
+        with self._lock:
+            self.in_use -= 1
+            source = self._acquired.pop(id(handle))
+            if self._sources.setdefault(filename, source) != source:
+                handle.close()
+                return
+            self._idle.setdefault(filename, []).append(handle)
+            self._idle.move_to_end(filename)
+            self._n_idle += 1
+            self._evict()
+
+    @contextlib.contextmanager
+    def handle(self, filename):
+        """Context manager which takes a file opened for reading from the pool,
+        returning it when exits.
+
+        The position of the file is undefined, so must be placed using
+        :py:meth:`pysndfile.PySndfile.seek` before reading.
+        """
+        handle = self.acquire(filename)
+        try:
+            yield handle
+        finally:
+            self.release(filename, handle)
+
+    def add(self, filename, handle):
+        """Adds an idle file just opened for reading to the pool. If the file
+        has other idle descriptors in the pool, the new one is closed, unless
+        they were opened before the file was modified, in which case they are
+        closed instead.
+        """
+        source = _source_stat(filename)
+        with self._lock:
+            if self._sources.get(filename) == source:
+                handle.close()
+                return
+            self.close(filename)
+            self.opens += 1
+            self.in_use += 1
+            self._acquired[id(handle)] = source
+            self.release(filename, handle)
+
+    def close(self, filename):
+        """Closes the idle descriptors of a file opened by the pool."""
+        with self._lock:
+            self._sources.pop(filename, None)
+            for handle in self._idle.pop(filename, ()):
+                handle.close()
+                self._n_idle -= 1
+
+    def clear(self):
+        """Closes all the idle files opened by the pool."""
+        with self._lock:
+            while self._idle:
+                for handle in self._idle.popitem()[1]:
+                    handle.close()
+            self._sources.clear()
+            self._n_idle = 0
+            self._closed.clear()
+
+
+def get_pool():
+    """Returns the process-wide pool of opened files."""
+    global _handle_pool
+
+    if _handle_pool is None:
+        with _handle_pool_lock:
+            if _handle_pool is None:
+                _handle_pool = HandlePool()
+    return _handle_pool
@@ -1,34 +1,209 @@
 """Interface that add reading capabilities to Sound types."""
+import collections
+import concurrent.futures
+import contextlib
 import numbers
 import os
 
 import numpy as np
 import pysndfile as snd
 
+from waves.sound.buffersize import get_sizer
+from waves.sound.cache import get_cache
+from waves.sound.handles import get_pool
+from waves.sound.pcm import (
+    _DECODED_DTYPES,
+    convert_samples,
+    decode_frames,
+    memmap_frames,
+)
+
+
+#: Number of frames rendered at once by sounds created using functions.
+_RENDER_BUFFERSIZE = 0b10000000000000000  # 65536 frames
+
+#: Maximum size of the data of a WAV file, leaving room for the metadata chunks.
+_WAV_MAX_DATA_SIZE = 0xFFFFFFFF - 0b100000000000000000000  # 4 GiB - 1 MiB
+
+# containers inferred from the extension of the files saved
+_CONTAINERS_BY_EXTENSION = {
+    ".aif": "aiff",
+    ".aifc": "aiff",
+    ".aiff": "aiff",
+    ".au": "au",
+    ".caf": "caf",
+    ".flac": "flac",
+    ".rf64": "rf64",
+    ".w64": "w64",
+    ".wav": "wav",
+}
+
+# Numpy type of the samples written for each subtype, converted by libsndfile,
+# and number of bytes of each sample in the file
+_SUBTYPES = {
+    "pcms8": (np.int16, 1),
+    "pcmu8": (np.int16, 1),
+    "pcm16": (np.int16, 2),
+    "pcm24": (np.int32, 3),
+    "pcm32": (np.int32, 4),
+    "float32": (np.float32, 4),
+    "float64": (np.float64, 8),
+}
+
+
+def _default_subtype(dtype, n_bytes, container):
+    """Returns the subtype of the file which preserves the samples of a sound."""
+    if np.issubdtype(dtype, np.floating):
+        subtype = "float64" if np.dtype(dtype).itemsize == 8 else "float32"
+    elif n_bytes == 1:
+        subtype = "pcmu8" if container == "wav" else "pcms8"
+    else:
+        subtype = {2: "pcm16", 3: "pcm24"}.get(n_bytes, "pcm32")
+
+    if container == "flac" and subtype in ("pcm32", "float32", "float64"):
+        subtype = "pcm24"  # widest subtype supported by FLAC
+    return subtype
+
+
+def _is_vectorized(time_to_frame, n_channels, fps):
+    """Checks if a ``time_to_frame`` function is able to render blocks of frames
+    passing a Numpy array of times.
+    """
+    # number of frames of the probe must not match the number of channels, so
+    # channel-first blocks are not taken as frame-first ones
+    n = n_channels + 2
+    try:
+        block = np.asarray(time_to_frame(np.arange(n) / fps))
+    except Exception:
+        return False
+    return block.shape == ((n,) if n_channels == 1 else (n, n_channels))
+
 
 class SoundIO:
     """Adds class methods for sound instance creations from files or data
     and properties for data retrieval.
     """
 
+    __slots__ = ()
+
     # ------------------ INTERNAL --------------------
 
-    def _init_f(self):
-        if not self.f:
-            self.f = snd.PySndfile(self.filename, "r")
+    @property
+    def f(self):
+        """Opened file descriptor of the file located in disk which stores the raw
+        sound data.
+
+        Sounds opened from files don't keep their files opened, they read them
+        using the pool of files shared by all the sounds, see
+        :py:mod:`waves.sound.handles`. For them, each access opens a new
+        descriptor owned by the caller, who should close it, so it's not read
+        nor closed by other readers.
+        """
+        if self._f is None and self.filename:
+            return snd.PySndfile(self.filename, "r")
+        return self._f
+
+    @f.setter
+    def f(self, f):
+        self._f = f
+
+    @property
+    def metadata(self):
+        """Dictionary with metadata about the sound.
+
+        For sounds opened from files, is read from the file when accessed for
+        the first time. Sounds created by operations have the metadata of their
+        first input.
+        """
+        if self._metadata is None:
+            metadata = {}
+            if self.operation is not None:
+                metadata = self.operation.source.metadata
+            elif self.filename and self.time_to_frame is None:
+                try:
+                    with self._handle() as f:
+                        metadata = f.get_strings()
+                except (OSError, RuntimeError):
+                    pass  # the file has been removed or can't be read
+            self._metadata = metadata
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        self._metadata = metadata
+
+    @contextlib.contextmanager
+    def _handle(self):
+        """Provides the file of the sound opened for reading, used only by the
+        current reader until exits.
+        """
+        if self._f is not None:
+            yield self._f
         else:
-            self.f.seek(0, mode="r")
+            with get_pool().handle(self.filename) as f:
+                yield f
+
+    def _read_file(self, start, n_frames):
+        with self._handle() as f:
+            f.seek(start, mode="r")
+            return f.read_frames(n_frames, dtype=self.dtype)
 
     def _read_frames(self):
-        self._init_f()
-        data = self.f.read_frames(nframes=self.n_frames, dtype=self.dtype)
-        self.f.seek(0, mode="r")
-        return data
+        decoded_cache = get_cache()
+        if decoded_cache is not None and self.filename:
+            return decoded_cache.get_or_decode(
+                self.filename,
+                self.dtype,
+                self._decode_frames,
+                frames=(self.offset, self.n_frames),
+            )
+        return self._decode_frames()
+
+    def _decode_frames(self):
+        return self._read_file(self.offset, self.n_frames)
+
+    # ------------------ SERIALIZATION --------------------
+
+    def __getstate__(self):
+        """Returns the state of the sound without the opened file and, if the
+        buffer is a memory map of a file, without the mapped data, so sounds
+        opened from files are pickled as a small descriptor which reopens the
+        file lazily when the data is read in the receiving process.
+
+        Examples
+        --------
+
+        >>> import pickle
+        >>> from waves import Sound
+        >>>
+        >>> sound = Sound.from_file("tests/files/stereo.wav", mmap=True)[1000:2000]
+        >>> len(pickle.dumps(sound)) < 1024
+        True
+        >>> pickle.loads(pickle.dumps(sound)).dataframes.shape
+        (1000, 2)
+        """
+        state = getattr(self, "__dict__", {}).copy()
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state["_f"] = None
+        if isinstance(self.buffer, np.memmap) and self.buffer.filename:
+            state["buffer"] = None
+            state["_mmap_filename"] = self.buffer.filename
+        return state
+
+    def __setstate__(self, state):
+        mmap_filename = state.pop("_mmap_filename", None)
+        for name, value in state.items():
+            setattr(self, name, value)
+        if mmap_filename is not None:
+            self.buffer = memmap_frames(mmap_filename)
 
     # ------------------ OPENERS --------------------
 
     @classmethod
-    def from_file(cls, filename):
+    def from_file(cls, filename, mmap=False):
         """Open a sound from a file.
 
         Parameters
@@ -37,6 +212,15 @@ class SoundIO:
         filename : str
           File path in the disk to open.
 
+        mmap : bool, optional
+          If the file is an uncompressed PCM WAV, RF64 or AIFF file with 16 or 32
+          bits integer or floating point samples stored in the byte order of
+          the machine, maps its audio data in memory instead of decoding it at
+          each read, so :py:attr:`waves.Sound.data` and
+          :py:attr:`waves.Sound.dataframes` return views of the file without
+          copying it. Other files, like big endian AIFF files in little endian
+          machines, are opened as usual.
+
         Returns
         -------
 
@@ -61,15 +245,126 @@ class SoundIO:
         >>>
         >>> Sound.from_file("tests/files/mono.wav")
         <waves.sound.main.Sound object at ...>
+        >>>
+        >>> type(Sound.from_file("tests/files/stereo.wav", mmap=True).buffer)
+        <class 'numpy.memmap'>
         """
         try:
-            return cls.from_sndbuffer(snd.PySndfile(filename, "r"))
+            f = snd.PySndfile(filename, "r")
         except OSError as err:
             if "No such file or directory" in str(err):
                 if os.path.isdir(filename):
                     raise IsADirectoryError(f"'{filename}' is a directory") from None
                 raise FileNotFoundError(f"'{filename}' file not found") from None
             raise err
+        sound = cls.from_sndbuffer(f)
+
+        # the file is kept opened only while is in the pool of opened files
+        get_pool().add(sound.filename, f)
+        sound.f = None
+
+        if mmap:
+            buffer = memmap_frames(filename)
+            if (
+                buffer is not None
+                and buffer.dtype == np.dtype(sound.dtype)
+                and buffer.shape == sound._frames_shape(sound.n_frames)
+            ):
+                sound.buffer = buffer
+        return sound
+
+    @classmethod
+    def _open_file(cls, filename, decode=False, mmap=False):
+        sound = cls.from_file(filename, mmap=mmap)
+        if decode and sound.buffer is None:
+            sound.buffer = sound._read_frames()
+        return sound
+
+    @classmethod
+    def from_files(
+        cls, filenames, decode=False, mmap=False, max_workers=None, ordered=True
+    ):
+        """Open sounds from multiple files concurrently, using a pool of threads.
+
+        libsndfile releases the GIL while reading the files, so the headers of
+        the files are parsed and their data decoded in parallel. Only a bounded
+        number of files are opened ahead of the results consumed, so
+        ``filenames`` can be a lazy iterable of any length.
+
+        Parameters
+        ----------
+
+        filenames : iterable
+          File paths in the disk to open.
+
+        decode : bool, optional
+          Decode the data of the files in the threads, storing it in
+          :py:attr:`waves.Sound.buffer`. By default, only the headers are parsed
+          and the data is decoded when accessed.
+
+        mmap : bool, optional
+          Map the audio data of the files in memory when possible, as in
+          :py:meth:`waves.Sound.from_file`. Mapped files are not decoded.
+
+        max_workers : int, optional
+          Maximum number of threads used. By default, the number of processors
+          plus 4, up to 32.
+
+        ordered : bool, optional
+          Generate the results in the order of ``filenames``. If disabled, they
+          are generated as soon as each file is opened.
+
+        Returns
+        -------
+
+        generator
+          Generates a tuple for each file, with its path as first value and the
+          :py:class:`waves.Sound` instance opened as second. If a file can't be
+          opened, the exception raised is generated instead of the sound, so the
+          errors don't stop the opening of other files.
+
+        Examples
+        --------
+
+        >>> from waves import Sound
+        >>>
+        >>> filenames = ["tests/files/mono.wav", "missing.wav"]
+        >>> for filename, sound in Sound.from_files(filenames, decode=True):
+        ...     print(filename, getattr(sound, "n_channels", sound))
+        tests/files/mono.wav 1
+        missing.wav 'missing.wav' file not found
+        """
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        max_pending = max_workers << 1
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            filenames = iter(filenames)
+            pending = collections.OrderedDict()
+
+            def submit():
+                for filename in filenames:
+                    future = pool.submit(
+                        cls._open_file, filename, decode=decode, mmap=mmap
+                    )
+                    pending[future] = filename
+                    if len(pending) >= max_pending:
+                        break
+
+            submit()
+            while pending:
+                if ordered:
+                    done = [next(iter(pending))]
+                    concurrent.futures.wait(done)
+                else:
+                    done = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )[0]
+                for future in done:
+                    filename = pending.pop(future)
+                    error = future.exception()
+                    yield (filename, future.result() if error is None else error)
+                submit()
 
     @classmethod
     def from_sndbuffer(cls, f):
@@ -102,10 +397,13 @@ class SoundIO:
         from waves.sound.main import Sound
 
         encoding = f.encoding_str()
-        if encoding.startswith("pcm"):
-            bits = encoding.replace("pcm", "").replace("24", "32").replace("u8", "64")
-            dtype = getattr(np, f"int{bits}")
+        if encoding in ("pcms8", "pcmu8"):
+            # libsndfile reads 8 bits samples scaled to 16 bits, centered at zero
+            dtype, n_bytes = (np.int16, 1)
+        elif encoding.startswith("pcm"):
+            bits = encoding.replace("pcm", "")
             n_bytes = int(int(bits) >> 3)
+            dtype = getattr(np, f"int{bits.replace('24', '32')}")
         elif encoding.startswith("float"):
             dtype = getattr(np, encoding)
             n_bytes = int(int(encoding.replace("float", "")) >> 3)
@@ -114,7 +412,7 @@ class SoundIO:
             n_bytes = 8
 
         n_channels, fps, n_frames = (f.channels(), f.samplerate(), f.frames())
-        filename, metadata = (f.get_name(), f.get_strings())
+        filename = f.get_name()
 
         return Sound(
             n_frames=n_frames,
@@ -124,9 +422,154 @@ class SoundIO:
             dtype=dtype,
             filename=filename,
             f=f,
-            metadata=metadata,
         )
 
+    @classmethod
+    def from_array(cls, array, fps=44100, planar=False, n_bytes=None):
+        """Build a sound object which reads its frames from a Numpy array,
+        without copying it.
+
+        The data of the sound, its chunks and its slices are views of the array,
+        so modifying the array modifies the sound. Unsigned samples, like the
+        8 bits samples of WAV files, are centered at the middle of their range,
+        so they're copied to signed samples of the same width centered at zero.
+
+        Parameters
+        ----------
+
+        array : np.ndarray
+          Samples of the sound, as an array with shape ``(n_frames,)`` for mono
+          sounds or ``(n_frames, n_channels)`` with the samples of each frame
+          interleaved, like :py:attr:`waves.Sound.dataframes`.
+
+        fps : int, optional
+          Number of frames per second of the resulting sound.
+
+        planar : bool, optional
+          The array has shape ``(n_channels, n_frames)``, with the samples of
+          each channel contiguous, like :py:attr:`waves.Sound.data`.
+
+        n_bytes : int, optional
+          Sample width of the sound. By default, the size of the type of the
+          array, which is kept as :py:attr:`waves.Sound.dtype`.
+
+        Returns
+        -------
+
+        :py:class:`waves.Sound`
+          :py:class:`waves.Sound` instance.
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from waves import Sound
+        >>>
+        >>> frames = np.zeros((44100, 2), dtype=np.int16)
+        >>> sound = Sound.from_array(frames)
+        >>> sound.n_channels, sound.duration
+        (2, 1.0)
+        >>> np.shares_memory(sound[1000:2000].dataframes, frames)
+        True
+        >>>
+        >>> Sound.from_array(frames.T, planar=True).dataframes.shape
+        (44100, 2)
+        >>>
+        >>> Sound.from_array(np.array([0, 128, 255], dtype=np.uint8)).dataframes
+        array([-128,    0,  127], dtype=int8)
+        """
+        from waves.sound.main import Sound
+
+        array = np.asarray(array)
+        if array.dtype.kind not in "iuf" or array.ndim not in (1, 2):
+            raise ValueError(
+                "The array must be one or two-dimensional with numeric samples,"
+                f" found {array.ndim} dimensions of type {array.dtype}"
+            )
+        if array.dtype.kind == "u":
+            # flipping the most significant bit subtracts the middle of the range
+            unsigned = np.dtype(f"u{array.dtype.itemsize}")
+            array = np.bitwise_xor(
+                array, 1 << ((unsigned.itemsize << 3) - 1), dtype=unsigned
+            ).view(f"i{unsigned.itemsize}")
+        if planar and array.ndim == 2:
+            array = array.T
+        if array.ndim == 2 and array.shape[1] == 1:
+            array = array[:, 0]
+        n_channels = 1 if array.ndim == 1 else array.shape[1]
+
+        return Sound(
+            n_frames=len(array),
+            n_bytes=array.dtype.itemsize if n_bytes is None else n_bytes,
+            n_channels=n_channels,
+            fps=fps,
+            dtype=array.dtype,
+            buffer=array,
+        )
+
+    @classmethod
+    def from_buffer(
+        cls, buffer, dtype=np.int16, n_channels=1, fps=44100, planar=False, **kwargs
+    ):
+        """Build a sound object which reads its frames from a bytes-like object,
+        like :py:class:`bytes`, :py:class:`bytearray`, :py:class:`memoryview` or
+        :py:class:`mmap.mmap`, without copying it.
+
+        Parameters
+        ----------
+
+        buffer : bytes-like
+          Raw samples of the sound, with the samples of each frame interleaved.
+
+        dtype : type, optional
+          Numpy type of the samples, including their byte order, like
+          ``np.int16`` or ``">i2"`` for big endian samples.
+
+        n_channels : int, optional
+          Number of channels of the sound.
+
+        fps : int, optional
+          Number of frames per second of the resulting sound.
+
+        planar : bool, optional
+          The samples of each channel are stored contiguous, one channel after
+          the other.
+
+        kwargs
+          Arguments passed to :py:meth:`waves.Sound.from_array`.
+
+        Returns
+        -------
+
+        :py:class:`waves.Sound`
+          :py:class:`waves.Sound` instance.
+
+        Examples
+        --------
+
+        >>> from waves import Sound
+        >>>
+        >>> sound = Sound.from_buffer(bytes(4000), dtype="int16", n_channels=2)
+        >>> sound.n_frames, sound.dataframes.shape
+        (1000, (1000, 2))
+        """
+        dtype = np.dtype(dtype)
+        frame_size = dtype.itemsize * n_channels
+        n_bytes = memoryview(buffer).nbytes
+        if n_bytes % frame_size:
+            raise ValueError(
+                f"The size of the buffer, {n_bytes} bytes, is not a multiple of"
+                f" the size of each frame, {frame_size} bytes"
+            )
+
+        array = np.frombuffer(buffer, dtype=dtype)
+        if n_channels > 1:
+            if planar:
+                array = array.reshape(n_channels, -1)
+            else:
+                array = array.reshape(-1, n_channels)
+        return cls.from_array(array, fps=fps, planar=planar, **kwargs)
+
     # ------------------ GENERATORS --------------------
 
     @classmethod
@@ -146,6 +589,10 @@ class SoundIO:
         fps : int, optional
           Number of frames per second of the resulting sound.
 
+        vectorized : bool, optional
+          Whether ``index_to_frame`` accepts a Numpy array of indexes returning
+          the data for all of them. By default is detected calling the function.
+
         Examples
         --------
 
@@ -217,12 +664,17 @@ class SoundIO:
         ... )
         <waves.sound.main.Sound object at ...>
         """
-        return cls.from_datatimes(
-            lambda t: index_to_frame(int(round(t * fps))), fps=fps, **kwargs
-        )
+
+        def time_to_frame(t):
+            if isinstance(t, np.ndarray):
+                return index_to_frame(np.rint(t * fps).astype(np.intp))
+            return index_to_frame(int(round(t * fps)))
+
+        kwargs.setdefault("vectorized", getattr(index_to_frame, "vectorized", None))
+        return cls.from_datatimes(time_to_frame, fps=fps, **kwargs)
 
     @classmethod
-    def from_datatimes(cls, time_to_frame, fps=44100, **kwargs):
+    def from_datatimes(cls, time_to_frame, fps=44100, vectorized=None, **kwargs):
         """Build a sound object reading from frames arrays data, one array data by
         frame given a time.
 
@@ -238,6 +690,15 @@ class SoundIO:
         fps : int, optional
           Number of frames per second of the resulting sound.
 
+        vectorized : bool, optional
+          Whether ``time_to_frame`` accepts a Numpy array of times returning the
+          data for all of them, with shape ``(n,)`` for mono sounds or
+          ``(n, n_channels)`` otherwise. If not defined, the attribute
+          ``vectorized`` of the function is used if exists, otherwise is detected
+          calling the function with an array. Vectorized functions are used to
+          render blocks of frames at once, which is much faster than calling them
+          for each frame.
+
         Examples
         --------
 
@@ -290,17 +751,25 @@ class SoundIO:
             n_bytes = first_frame[0].nbytes
             dtype = type(first_frame[0])
 
+        if vectorized is None:
+            vectorized = getattr(time_to_frame, "vectorized", None)
+            if vectorized is None:
+                vectorized = _is_vectorized(time_to_frame, n_channels, fps)
+
         return Sound(
             n_bytes=n_bytes,
             n_channels=n_channels,
             fps=fps,
             dtype=dtype,
             time_to_frame=time_to_frame,
+            vectorized=vectorized,
             **kwargs,
         )
 
     @classmethod
-    def from_byteframes(cls, index_to_hexframe, fps=44100, **kwargs):
+    def from_byteframes(
+        cls, index_to_hexframe, fps=44100, encoding=None, byteorder="<", **kwargs
+    ):
         """Build a sound object reading from frames bytes, one hex data chunk by frame
         index.
 
@@ -316,6 +785,17 @@ class SoundIO:
         fps : int, optional
           Number of frames per second of the resulting sound.
 
+        encoding : str, optional
+          Encoding of the samples, as in :py:func:`waves.sound.pcm.decode_frames`,
+          like ``"pcmu8"`` for the unsigned 8 bits samples of WAV files or
+          ``"pcm24"`` for packed 24 bits samples. By default, signed integer
+          samples of the size of the bytes of each channel, or floating point
+          samples if ``dtype`` is a floating point type.
+
+        byteorder : str, optional
+          Byte order of the samples, ``"<"`` for little endian or ``">"`` for big
+          endian.
+
         Examples
         --------
 
@@ -366,52 +846,19 @@ class SoundIO:
         <waves.sound.main.Sound object at ...>
         >>> f.close()
         """
-        from waves.sound.main import Sound
-
-        # get first frame so we can retrieve number of bytes and channels
-        hexdata = index_to_hexframe(0)
-        if isinstance(hexdata, bytes):
-            # mono
-            n_channels = 1
-            n_bytes = len(hexdata)
-        else:
-            # stereo
-            n_channels = len(hexdata)
-            n_bytes = len(hexdata[0])
-        dtype = kwargs.get("dtype", getattr(np, f"int{n_bytes << 3}"))
-
-        if n_channels == 1:
-            return Sound(
-                fps=fps,
-                n_bytes=n_bytes,
-                n_channels=n_channels,
-                time_to_frame=lambda t: np.frombuffer(
-                    index_to_hexframe(int(round(t * fps))), dtype=dtype
-                )[0],
-                dtype=dtype,
-                **kwargs,
-            )
-
-        def time_to_frame(t):
-            frame_hexdata = index_to_hexframe(int(round(t * fps)))
-            return np.array(
-                [
-                    np.frombuffer(frame_hexdata[0], dtype=dtype)[0],
-                    np.frombuffer(frame_hexdata[1], dtype=dtype)[0],
-                ]
-            )
-
-        return Sound(
+        return cls._from_hexframes(
+            index_to_hexframe,
+            lambda times: np.round(times * fps).astype(np.int64).tolist(),
             fps=fps,
-            n_bytes=n_bytes,
-            n_channels=n_channels,
-            time_to_frame=time_to_frame,
-            dtype=dtype,
+            encoding=encoding,
+            byteorder=byteorder,
             **kwargs,
         )
 
     @classmethod
-    def from_bytetimes(cls, time_to_hexframe, fps=44100, **kwargs):
+    def from_bytetimes(
+        cls, time_to_hexframe, fps=44100, encoding=None, byteorder="<", **kwargs
+    ):
         """Build a sound object reading from frames bytes, one hex data chunk by frame
         at a time.
 
@@ -427,6 +874,17 @@ class SoundIO:
         fps : int, optional
           Number of frames per second of the resulting sound.
 
+        encoding : str, optional
+          Encoding of the samples, as in :py:func:`waves.sound.pcm.decode_frames`,
+          like ``"pcmu8"`` for the unsigned 8 bits samples of WAV files or
+          ``"pcm24"`` for packed 24 bits samples. By default, signed integer
+          samples of the size of the bytes of each channel, or floating point
+          samples if ``dtype`` is a floating point type.
+
+        byteorder : str, optional
+          Byte order of the samples, ``"<"`` for little endian or ``">"`` for big
+          endian.
+
         Examples
         --------
 
@@ -465,46 +923,63 @@ class SoundIO:
         <waves.sound.main.Sound object at ...>
         >>> f.close()
         """
+        return cls._from_hexframes(
+            time_to_hexframe,
+            lambda times: times.tolist(),
+            fps=fps,
+            encoding=encoding,
+            byteorder=byteorder,
+            **kwargs,
+        )
+
+    @classmethod
+    def _from_hexframes(
+        cls, key_to_hexframe, times_to_keys, fps, encoding, byteorder, **kwargs
+    ):
+        """Build a sound object reading from frames bytes, decoding blocks of
+        frames at once. The function which returns the bytes of each frame is
+        called with the keys returned by ``times_to_keys`` for an array of
+        times.
+        """
         from waves.sound.main import Sound
 
         # get first frame so we can retrieve number of bytes and channels
-        hexdata = time_to_hexframe(0)
-        if isinstance(hexdata, bytes):
-            # mono
-            n_channels = 1
-            n_bytes = len(hexdata)
+        hexdata = key_to_hexframe(0)
+        if isinstance(hexdata, (bytes, bytearray, memoryview)):
+            n_channels, n_bytes = (1, len(hexdata))
         else:
-            # stereo
-            n_channels = len(hexdata)
-            n_bytes = len(hexdata[0])
-        dtype = kwargs.get("dtype", getattr(np, f"int{n_bytes << 3}"))
-
-        if n_channels == 1:
-            return Sound(
-                fps=fps,
-                n_bytes=n_bytes,
-                n_channels=n_channels,
-                time_to_frame=lambda t: np.frombuffer(time_to_hexframe(t), dtype=dtype)[
-                    0
-                ],
-                dtype=dtype,
-                **kwargs,
+            n_channels, n_bytes = (len(hexdata), len(hexdata[0]))
+
+        dtype = kwargs.pop("dtype", None)
+        if encoding is None:
+            if dtype is not None and np.issubdtype(dtype, np.floating):
+                encoding = f"float{n_bytes << 3}"
+            else:
+                encoding = "pcms8" if n_bytes == 1 else f"pcm{n_bytes << 3}"
+        if encoding not in _DECODED_DTYPES or _DECODED_DTYPES[encoding][1] != n_bytes:
+            raise ValueError(
+                f"Invalid encoding '{encoding}' for samples of {n_bytes} bytes"
             )
+        if dtype is None:
+            dtype = np.dtype(_DECODED_DTYPES[encoding][0])
 
         def time_to_frame(t):
-            frame_hexdata = time_to_hexframe(t)
-            return np.array(
-                [
-                    np.frombuffer(frame_hexdata[0], dtype=dtype)[0],
-                    np.frombuffer(frame_hexdata[1], dtype=dtype)[0],
-                ]
+            hexframes = [key_to_hexframe(key) for key in times_to_keys(np.ravel(t))]
+            if n_channels > 1:
+                hexframes = [b"".join(hexframe) for hexframe in hexframes]
+            frames = convert_samples(
+                decode_frames(b"".join(hexframes), n_channels, encoding, byteorder),
+                dtype,
             )
+            return frames if np.ndim(t) else frames[0]
 
+        kwargs.pop("vectorized", None)
         return Sound(
             fps=fps,
             n_bytes=n_bytes,
             n_channels=n_channels,
             time_to_frame=time_to_frame,
+            vectorized=True,
             dtype=dtype,
             **kwargs,
         )
@@ -514,28 +989,10 @@ class SoundIO:
     @property
     def data(self):
         """Returns the Numpy data array of the sound."""
-        if self.time_to_frame:
-            if self.n_frames is None:
-                _data = np.array(list(self._time_to_frame_generator()))
-                if self.n_channels > 1:
-                    _data = _data.T
-                return _data
-            else:
-                if self.n_channels == 1:
-                    shape = self.n_frames
-                else:
-                    shape = (self.n_frames, self.n_channels)
-                _data = np.empty(shape, dtype=self.dtype)
-                for i, frame_data in enumerate(self._time_to_frame_generator()):
-                    _data[i] = frame_data
-                if self.n_channels > 1:
-                    _data = _data.T
-                return _data
-        else:
-            _data = self._read_frames()
-            if self.n_channels > 1:
-                _data = _data.T
-            return _data
+        _data = self.dataframes
+        if self.n_channels > 1:
+            _data = _data.T
+        return _data
 
     @property
     def dataframes(self):
@@ -543,61 +1000,193 @@ class SoundIO:
         ``(n_frames, n_channels)`` if the sound is stereo, but if is mono returns a
         simple Numpy array with the values of the channel, one value for each frame.
         """
-        if self.time_to_frame:
+        if self.buffer is not None:
+            return self.buffer[self.offset : self.offset + self.n_frames]
+        elif self.time_to_frame or self.operation is not None:
             if self.n_frames is None:
-                return np.array(list(self._time_to_frame_generator()))
+                chunks = list(self.iter_chunks(_RENDER_BUFFERSIZE))
+                if not chunks:
+                    return np.empty(self._frames_shape(0), dtype=self.dtype)
+                return np.concatenate(chunks)
             else:
-                if self.n_channels == 1:
-                    shape = self.n_frames
-                else:
-                    shape = (self.n_frames, self.n_channels)
-                _data = np.empty(shape, dtype=self.dtype)
-                for i, frame_data in enumerate(self._time_to_frame_generator()):
-                    try:
-                        _data[i] = frame_data
-                    except IndexError:
-                        break
-                return _data
+                _data = np.empty(self._frames_shape(self.n_frames), dtype=self.dtype)
+                start = 0
+                for chunk in self.iter_chunks(_RENDER_BUFFERSIZE):
+                    _data[start : start + len(chunk)] = chunk
+                    start += len(chunk)
+                return _data if start == self.n_frames else _data[:start]
         else:
             return self._read_frames()
 
-    def _time_to_frame_generator(self):
-        try:
-            for t in self.time_sequence:
-                yield self.time_to_frame(t)
-        except StopIteration:
-            self.n_frames = int(round(t * self.fps))  # assume end of sound
+    def _frames_shape(self, n_frames):
+        return (n_frames,) if self.n_channels == 1 else (n_frames, self.n_channels)
 
-    def iter_chunks(self, buffersize=0b10000000000):  # 1024 frames
+    def _render_times(self, times):
+        """Renders the frames of a sound created using a function for an array of
+        times.
+
+        The returned block will be shorter than ``times`` if the function raises
+        ``StopIteration`` before reaching the last time.
+        """
+        if self.vectorized:
+            try:
+                return np.asarray(self.time_to_frame(times), dtype=self.dtype)
+            except StopIteration:
+                pass  # the end of the sound is inside this block, find it
+
+        block = np.empty(self._frames_shape(len(times)), dtype=self.dtype)
+        for i, t in enumerate(times.tolist()):
+            try:
+                block[i] = self.time_to_frame(t)
+            except StopIteration:
+                return block[:i]
+        return block
+
+    def _read_block(self, start, stop):
+        """Returns the frames of the sound between the indexes ``start`` and
+        ``stop``, reading or rendering only them.
+
+        The returned block will be shorter than ``stop - start`` frames if the
+        sound ends before ``stop``.
+        """
+        if self.n_frames is not None:
+            stop = min(stop, self.n_frames)
+        if start >= stop:
+            return np.empty(self._frames_shape(0), dtype=self.dtype)
+        start, stop = (start + self.offset, stop + self.offset)
+
+        if self.buffer is not None:
+            return self.buffer[start:stop]
+        elif self.time_to_frame:
+            return self._render_times(
+                next(self.iter_timechunks(stop - start, start=start, stop=stop))
+            )
+        elif self.operation is not None:
+            return self.operation.render(start, stop)
+
+        # each read seeks its own opened file, so concurrent readers don't interfere
+        return self._read_file(start, stop - start)
+
+    def _iter_file_chunks(self, buffersize, out):
+        """Generates the chunks of a sound read from a file, whose number of
+        frames is known before reading them.
+        """
+        stop = self.offset + self.n_frames
+        if out is not None and self._f is None:
+            # copy uncompressed PCM samples directly from the file pages
+            frames = memmap_frames(self.filename)
+            if (
+                frames is not None
+                and frames.dtype == np.dtype(self.dtype)
+                and frames.shape[1:] == out.shape[1:]
+                and len(frames) >= stop
+            ):
+                for start in range(self.offset, stop, buffersize):
+                    n_frames = min(buffersize, stop - start)
+                    np.copyto(out[:n_frames], frames[start : start + n_frames])
+                    yield out[:n_frames]
+                return
+
+        for start in range(self.offset, stop, buffersize):
+            n_frames = min(buffersize, stop - start)
+            chunk = self._read_file(start, n_frames)
+            if out is not None:
+                np.copyto(out[:n_frames], chunk)
+                chunk = out[:n_frames]
+            yield chunk
+
+    def _source(self):
+        """Returns the kind of source from which the frames of the sound are
+        read, whose throughput is measured separately to choose block sizes.
+        """
+        if self.buffer is not None:
+            return "buffer"
+        elif self.time_to_frame:
+            return "function"
+        elif self.operation is not None:
+            return "operation"
+        return "file"
+
+    def iter_chunks(self, buffersize=None, out=None):
         """Generates each chunk of the sound data, being read at the moment
         of yielding.
 
+        The number of frames of each chunk is computed before reading it, so
+        the last chunk, which could be shorter, is read exactly, without trying
+        to read beyond the end of the sound.
+
+        Chunks of sounds created using functions or operations are rendered on
+        demand. If the duration of the sound hasn't been set, the generation stops
+        when the function raises ``StopIteration``, or never if it doesn't.
+
         Parameters
         ----------
 
         buffersize : int, optional
-          Number of frames generated at each chunk.
-        """
-        n_frames, frames_read = (self.n_frames, 0b0)
+          Number of frames generated at each chunk. All the chunks have this
+          number of frames, except the last one, which could be shorter. If not
+          defined, is chosen by :py:func:`waves.sound.buffersize.get_sizer`
+          from the size of the sound, the throughput of previous reads and a
+          memory budget, or is the number of frames of ``out`` if defined.
+
+        out : np.ndarray, optional
+          Array in which the frames of each chunk are stored, with at least
+          ``buffersize`` frames and the shape of the frames of the sound. If
+          defined, the chunks generated are views of this array, overwritten
+          by the next chunk, so no arrays are allocated for each chunk reading
+          buffers or memory maps, or uncompressed PCM files in the same type
+          of the sound.
 
-        # this implementation is slightly faster than create a counter `i` and compute
-        # the frames read in the `RuntimeError` multipliying by `buffersize`
-        try:
-            while 1:
-                _buffersize = buffersize
-                yield self.f.read_frames(_buffersize, dtype=self.dtype)
-
-                # bitwise sum (buffersize += buffersize)
-                while _buffersize:
-                    carry = frames_read & _buffersize
-                    frames_read = frames_read ^ _buffersize
-                    _buffersize = carry << 1
-        except RuntimeError as err:
-            if str(err).startswith("Ask"):
-                self.f.seek(frames_read, mode="r")
-                yield self.f.read_frames(n_frames - frames_read, dtype=self.dtype)
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from waves import Sound, stereo_ttf_gen
+        >>>
+        >>> sound = Sound.from_datatimes(stereo_ttf_gen()).with_duration(0.05)
+        >>> [chunk.shape for chunk in sound.iter_chunks(buffersize=1000)]
+        [(1000, 2), (1000, 2), (205, 2)]
+        >>>
+        >>> sound = Sound.from_file("tests/files/stereo.wav")
+        >>> out = np.empty((4096, 2), dtype=sound.dtype)
+        >>> all(chunk.base is out for chunk in sound.iter_chunks(4096, out=out))
+        True
+        """
+        if buffersize is None:
+            if out is not None:
+                buffersize = len(out)
             else:
-                raise err
+                sizer, source = (get_sizer(), self._source())
+                buffersize = sizer.choose(self, source=source)
+                yield from sizer.observed(
+                    self.iter_chunks(buffersize=buffersize), source=source
+                )
+                return
+
+        if out is not None and (
+            len(out) < buffersize or out.shape[1:] != self._frames_shape(0)[1:]
+        ):
+            raise ValueError(
+                f"The output array must have shape {self._frames_shape(buffersize)}"
+            )
+
+        if self._source() == "file" and self.n_frames is not None:
+            yield from self._iter_file_chunks(buffersize, out)
+            return
+
+        start = 0
+        while self.n_frames is None or start < self.n_frames:
+            chunk = self._read_block(start, start + buffersize)
+            n_frames = len(chunk)
+            if n_frames:
+                if out is not None:
+                    np.copyto(out[:n_frames], chunk)
+                    chunk = out[:n_frames]
+                yield chunk
+            start += n_frames
+            if n_frames < buffersize:
+                self.n_frames = start  # assume end of sound
+                break
 
     @property
     def iter_dataframes(self):
@@ -606,13 +1195,8 @@ class SoundIO:
         If the sound has beeen built using a generator function and its duration
         hasn't been set, this will produce an infinite loop.
         """
-        if self.time_to_frame:
-            yield from self._time_to_frame_generator()
-        else:
-            self._init_f()
-            for chunk in self.iter_chunks():
-                yield from chunk
-            self.f.seek(0, mode="r")
+        for chunk in self.iter_chunks():
+            yield from chunk
 
     @property
     def iter_datatimes(self):
@@ -622,49 +1206,126 @@ class SoundIO:
         If the sound has beeen built using a generator function and its duration
         hasn't been set, this will produce an infinite loop.
         """
-        if self.time_to_frame:
-            try:
-                for t in self.time_sequence:
-                    yield (t, self.time_to_frame(t))
-            except StopIteration:
-                self.n_frames = int(round(t * self.fps))  # assume end of sound
-        else:
-            self._init_f()
-            t, t_fps = (0, 1 / self.fps)
-            for chunk in self.iter_chunks():
-                for frame in chunk:
-                    yield (t, frame)
-                    t += t_fps
-            self.f.seek(0, mode="r")
+        buffersize = get_sizer().choose(self, source=self._source())
+        for times, chunk in zip(
+            self.iter_timechunks(buffersize=buffersize),
+            self.iter_chunks(buffersize=buffersize),
+        ):
+            yield from zip(times.tolist(), chunk)
 
     # ------------------ WRITERS -------------------
 
-    def save(self, filename, buffersize=0b10000000000):
+    def save(
+        self,
+        filename,
+        buffersize=None,
+        container=None,
+        subtype=None,
+        format=None,
+    ):
         """Saves an audio instance to a file.
 
+        The sound is read or rendered and written in chunks, so the memory used
+        is proportional to ``buffersize`` and doesn't depend on the duration of
+        the sound. If the samples of the sound must be converted to the subtype
+        of the file, the conversion is done in the same pass for each chunk.
+
         Parameters
         ----------
 
         filename : str
           System disk path in which the file will be saved.
 
-        buffsize : int, optional
-          Number of bytes stored in memory buffer while reading and writing.
-          Only used if the filename to write has been created opening from a
-          file in disk.
+        buffersize : int, optional
+          Number of frames stored in memory buffer while reading and writing. If
+          not defined, is chosen automatically as in
+          :py:meth:`waves.Sound.iter_chunks`.
+
+        container : str, optional
+          Major format of the file, as a name of
+          :py:data:`pysndfile.fileformat_name_to_id` like ``"wav"``, ``"aiff"``,
+          ``"w64"``, ``"rf64"`` or ``"flac"``. By default is inferred from the
+          extension of ``filename``, being ``"wav"`` for unknown extensions. WAV
+          files whose data would exceed 4 GB are saved as RF64 files.
+
+        subtype : str, optional
+          Encoding of the samples of the file, as a name of
+          :py:data:`pysndfile.encoding_name_to_id` like ``"pcm16"``,
+          ``"pcm24"``, ``"pcm32"`` or ``"float32"``. By default is chosen from
+          :py:attr:`waves.Sound.dtype` and :py:attr:`waves.Sound.n_bytes`, so the
+          samples are not narrowed.
+
+        format : int, optional
+          Format of the file as a libsndfile integer, combination of a major
+          format and an encoding. If defined, ``container`` and ``subtype`` are
+          ignored.
+
+        Returns
+        -------
+
+        int
+          Number of frames written. If the sound has been created using a function
+          which raises ``StopIteration`` before reaching the duration of the sound,
+          will be lower than :py:attr:`waves.Sound.n_frames`.
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> from waves import Sound
+        >>>
+        >>> def index_to_frame(i):
+        ...     if i == 1000:
+        ...         raise StopIteration
+        ...     return np.int16(i)
+        >>>
+        >>> sound = Sound.from_dataframes(index_to_frame).with_duration(1)
+        >>> sound.save("/tmp/waves-save-example.wav")
+        1000
+        >>> sound.save("/tmp/waves-save-example.aiff", subtype="float32")
+        1000
         """
+        rf64_auto_downgrade = False
+        if format is None:
+            if container is None:
+                extension = os.path.splitext(os.fsdecode(filename))[1].lower()
+                container = _CONTAINERS_BY_EXTENSION.get(extension, "wav")
+            if subtype is None:
+                subtype = _default_subtype(self.dtype, self.n_bytes, container)
+            dtype, sample_width = _SUBTYPES.get(subtype, (np.float32, 4))
+
+            if container == "wav":
+                if self.n_frames is None:
+                    # unknown size, only kept as RF64 if exceeds the WAV limits
+                    container, rf64_auto_downgrade = ("rf64", True)
+                elif (
+                    self.n_frames * self.n_channels * sample_width > _WAV_MAX_DATA_SIZE
+                ):
+                    container = "rf64"
+            format = snd.construct_format(container, subtype)
+        else:
+            subtype = snd.encoding_id_to_name.get(format & 0xFFFF)
+            dtype = _SUBTYPES.get(subtype, (np.float32, 4))[0]
+
+        n_frames = 0
         with snd.PySndfile(
             filename,
             "w",
-            format=65536 | 2,
+            format=format,
             channels=self.n_channels,
             samplerate=self.fps,
         ) as target_file:
-            target_file.set_strings(self.metadata or {})
+            if rf64_auto_downgrade:
+                target_file.command("SFC_RF64_AUTO_DOWNGRADE", 1)
+            try:
+                target_file.set_strings(self.metadata or {})
+            except RuntimeError:
+                pass  # the container doesn't support metadata strings
 
-            if self.filename:
-                for frames in self.iter_chunks(buffersize=buffersize):
-                    target_file.write_frames(frames)
-            else:
-                target_file.write_frames(self.dataframes)
-                self.filename = filename
+            for frames in self.iter_chunks(buffersize=buffersize):
+                target_file.write_frames(convert_samples(frames, dtype))
+                n_frames += len(frames)
+
+        if not self.filename:
+            self.filename = filename
+        return n_frames
@@ -1,5 +1,7 @@
 """Mono sound."""
+import importlib
 import math
+import numbers
 from functools import partial
 
 import numpy as np
@@ -7,6 +9,20 @@ import numpy as np
 from waves.sound.io import SoundIO
 
 
+# methods implemented in other modules, imported only when accessed
+_LAZY_METHODS = {
+    "plot": "waves.sound.plot",
+    "play": "waves.sound.play",
+    "figure": "waves.sound.figure",
+    "gain": "waves.sound.ops",
+    "fade": "waves.sound.ops",
+    "mix": "waves.sound.ops",
+    "concat": "waves.sound.ops",
+    "select_channels": "waves.sound.ops",
+    "resample": "waves.sound.resample",
+}
+
+
 class Sound(SoundIO):
     """Base class for a sound.
 
@@ -40,15 +56,51 @@ class Sound(SoundIO):
       Opened file descriptor of the file located in disk which stores the raw sound
       data.
 
+    buffer : np.ndarray, optional
+      Array with the frames of the sound, with shape ``(n_frames, n_channels)``
+      or ``(n_frames,)`` for mono sounds, from which the data is read without
+      copying it. Can be a memory map of the file located in disk.
+
     time_to_frame : function, optional
       Function which takes a time ``t`` for each frame of the sound and renders the
       Numpy array data of the sound for each frame. Only defined if the sound has been
       created an interpolator function.
 
+    vectorized : bool, optional
+      Whether ``time_to_frame`` accepts a Numpy array of times and returns the
+      data of all the frames at once, with shape ``(n,)`` for mono sounds or
+      ``(n, n_channels)`` otherwise.
+
     metadata : dict, optional
-      Dictionary with metadata about the sound.
+      Dictionary with metadata about the sound. If not defined, is read from
+      the file located in disk when accessed.
+
+    offset : int, optional
+      Index of the frame of the file, buffer or function from which the sound
+      starts. Used by the views created slicing sounds.
+
+    operation : waves.sound.ops.Operation, optional
+      Lazy operation which renders the frames of the sound from other sounds.
+      Only defined if the sound has been created by an operation like
+      :py:meth:`waves.Sound.gain` or :py:meth:`waves.Sound.mix`.
     """
 
+    __slots__ = (
+        "n_frames",
+        "n_bytes",
+        "n_channels",
+        "fps",
+        "dtype",
+        "filename",
+        "_f",
+        "buffer",
+        "time_to_frame",
+        "vectorized",
+        "_metadata",
+        "offset",
+        "operation",
+    )
+
     def __init__(
         self,
         n_frames=None,
@@ -58,8 +110,12 @@ class Sound(SoundIO):
         dtype=np.int16,
         filename=None,
         f=None,
+        buffer=None,
         time_to_frame=None,
-        metadata={},
+        vectorized=False,
+        metadata=None,
+        offset=0,
+        operation=None,
     ):
         #: Number of frames of the audio data.
         self.n_frames = n_frames
@@ -80,14 +136,28 @@ class Sound(SoundIO):
         self.filename = filename
         self.f = f
 
+        #: Array with the frames of the sound from which the data is read without
+        #: copying it. Can be a memory map of the file located in disk.
+        self.buffer = buffer
+
         #: Function which takes a time ``t`` for each frame of the sound and renders the
         #: Numpy array data of the sound for each frame. Only defined if the sound has
         #: been created an interpolator function.
         self.time_to_frame = time_to_frame
 
-        #: Dictionary with metadata about the sound.
+        #: Whether ``time_to_frame`` can render blocks of frames from arrays of
+        #: times.
+        self.vectorized = vectorized
+
         self.metadata = metadata
 
+        #: Index of the frame of the file, buffer or function from which the sound
+        #: starts.
+        self.offset = offset
+
+        #: Lazy operation which renders the frames of the sound from other sounds.
+        self.operation = operation
+
     @property
     def n_bits(self):
         """Returns the number of bits for the width of the sound."""
@@ -121,22 +191,117 @@ class Sound(SoundIO):
         so you must break the generation at some point or this will result in a
         infinite loop.
         """
-        duration, n, step = (self.duration, 0, 1 / self.fps)
-        while n < duration:
-            yield n
-            n += step
+        for times in self.iter_timechunks():
+            yield from times.tolist()
 
-    def __getattr__(self, name):
-        if name == "plot":
-            from waves.sound.plot import plot
+    def iter_timechunks(self, buffersize=0b10000000000, start=0, stop=None):
+        """Generates the time sequence of the sound in chunks of Numpy arrays.
+
+        Each time is computed from the index of its frame as ``i / fps``, so the
+        values don't accumulate floating point errors in long sounds. Only one
+        chunk is allocated at a time, so the memory used doesn't depend on the
+        duration of the sound.
+
+        The generation will be infinite for sounds created using functions (only
+        if you haven't extracted the data before by calling
+        :py:property:`Sound.data`) unless ``stop`` is defined.
+
+        Parameters
+        ----------
+
+        buffersize : int, optional
+          Number of times generated at each chunk.
 
-            return partial(plot, self)
-        elif name == "play":
-            from waves.sound.play import play
+        start : int, optional
+          Index of the first frame whose time will be generated.
 
-            return partial(play, self)
-        elif name == "figure":
-            from waves.sound.figure import figure
+        stop : int, optional
+          Index of the frame at which the generation stops, not included. By
+          default, the number of frames of the sound.
 
-            return partial(figure, self)
+        Examples
+        --------
+
+        >>> from waves import Sound, mono_ttf_gen
+        >>>
+        >>> sound = Sound.from_datatimes(mono_ttf_gen(), fps=4).with_duration(1.5)
+        >>> for times in sound.iter_timechunks(buffersize=4):
+        ...     print(times)
+        [0.   0.25 0.5  0.75]
+        [1.   1.25]
+        """
+        if stop is None:
+            stop = self.n_frames
+        while stop is None or start < stop:
+            end = start + buffersize
+            if stop is not None and end > stop:
+                end = stop
+            yield np.arange(start, end) / self.fps
+            start = end
+
+    def _frame_index(self, index, default):
+        if index is None:
+            return default
+        if not isinstance(index, numbers.Integral):
+            index = round(index * self.fps)  # seconds
+        index = int(index)
+        if index < 0:
+            if self.n_frames is None:
+                raise ValueError(
+                    "Negative indexes can't be used slicing sounds without duration"
+                )
+            index += self.n_frames
+        index = max(index, 0)
+        return index if self.n_frames is None else min(index, self.n_frames)
+
+    def __getitem__(self, key):
+        """Returns a view of a range of the sound, without reading or rendering its
+        data. The frames of the range will be read only from the underlying file,
+        buffer or function when its data is retrieved.
+
+        The bounds of the range are frame indexes if they're integers or seconds
+        if they're floats. Slicing a view returns another view of the original
+        sound.
+
+        Examples
+        --------
+
+        >>> from waves import Sound
+        >>>
+        >>> sound = Sound.from_file("tests/files/stereo.wav")
+        >>> sound[1000:2000].n_frames
+        1000
+        >>> sound[0.5:].duration
+        0.752...
+        >>> sound[1000:2000][-10:].offset
+        1990
+        """
+        if not isinstance(key, slice):
+            raise TypeError("Sounds can only be sliced, like 'sound[start:stop]'")
+        if key.step not in (None, 1):
+            raise ValueError("Sounds can't be sliced using steps")
+
+        start = self._frame_index(key.start, 0)
+        stop = self._frame_index(key.stop, self.n_frames)
+
+        return Sound(
+            n_frames=None if stop is None else max(stop - start, 0),
+            n_bytes=self.n_bytes,
+            n_channels=self.n_channels,
+            fps=self.fps,
+            dtype=self.dtype,
+            filename=self.filename,
+            f=self._f,
+            buffer=self.buffer,
+            time_to_frame=self.time_to_frame,
+            vectorized=self.vectorized,
+            metadata=self._metadata,
+            offset=self.offset + start,
+            operation=self.operation,
+        )
+
+    def __getattr__(self, name):
+        if name in _LAZY_METHODS:
+            method = getattr(importlib.import_module(_LAZY_METHODS[name]), name)
+            return partial(method, self)
         return super().__getattr__(name)
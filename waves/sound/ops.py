@@ -0,0 +1,472 @@
+"""Lazy operations over sounds.
+
+The operations don't read nor render any data when called. Instead, they return
+new :py:class:`waves.Sound` instances whose frames are computed from the
+frames of other sounds only when retrieved, chunk by chunk, so a chain of
+operations over sounds stored in files larger than the memory can be saved
+in a single streaming pass:
+
+>>> from waves import Sound
+>>>
+>>> sound = Sound.from_file("tests/files/stereo.wav")
+>>> processed = sound.gain(-6).fade(fade_in=0.1, fade_out=0.1)
+>>> processed.n_frames, processed.n_channels
+(55216, 2)
+>>> processed.save("/tmp/waves-ops-example.wav", buffersize=4096)
+55216
+
+Consecutive elementwise operations, like gains and fades, are fused into a
+single operation, so their samples are converted and computed only once:
+
+>>> processed.operation.sound is sound
+True
+"""
+import numpy as np
+
+from waves.sound.pcm import convert_samples
+
+
+# Numpy type in which the samples are processed
+_PROCESSING_DTYPE = np.float64
+
+
+def _new_sound(sound, operation, **kwargs):
+    from waves.sound.main import Sound
+
+    kwargs.setdefault("fps", sound.fps)
+    kwargs.setdefault("n_frames", sound.n_frames)
+    kwargs.setdefault("n_channels", sound.n_channels)
+    dtype = kwargs.setdefault("dtype", sound.dtype)
+    if np.dtype(dtype) != np.dtype(sound.dtype):
+        kwargs.setdefault("n_bytes", np.dtype(dtype).itemsize)
+    kwargs.setdefault("n_bytes", sound.n_bytes)
+    # the metadata not read yet is read from the first input when accessed
+    return Sound(metadata=sound._metadata, operation=operation, **kwargs)
+
+
+def _check_compatible(sounds):
+    fps, n_channels = (sounds[0].fps, sounds[0].n_channels)
+    for sound in sounds[1:]:
+        if sound.fps != fps:
+            raise ValueError(
+                f"Sounds with different framerates can't be combined ({fps} and"
+                f" {sound.fps})"
+            )
+        if sound.n_channels != n_channels:
+            raise ValueError(
+                "Sounds with different number of channels can't be combined"
+                f" ({n_channels} and {sound.n_channels})"
+            )
+
+
+class Operation:
+    """Base class for lazy operations which render the frames of a sound from the
+    frames of other sounds.
+
+    The frames are indexed from the start of the operation, so the sounds created
+    slicing the result of an operation render only the range of frames needed.
+    """
+
+    @property
+    def source(self):
+        """Returns the first input sound, whose metadata the result keeps."""
+        return self.sound
+
+    def render(self, start, stop):
+        """Renders the frames of the operation between the indexes ``start`` and
+        ``stop``.
+
+        The returned block will be shorter than ``stop - start`` frames if the
+        inputs of the operation end before ``stop``.
+        """
+        raise NotImplementedError
+
+
+class Elementwise(Operation):
+    """Operation which applies a chain of functions to the samples of a sound.
+
+    The samples of each block are converted to floating point numbers once, all
+    the functions are applied to them in place and the result is converted back
+    to the type of the sound.
+
+    Parameters
+    ----------
+
+    sound : :py:class:`waves.Sound`
+      Input sound.
+
+    functions : list
+      Functions which take an array of samples in floating point, with values
+      between ``-1`` and ``1``, and the index of its first frame, modifying the
+      samples in place.
+
+    dtype : type
+      Numpy type of the rendered samples.
+    """
+
+    def __init__(self, sound, functions, dtype):
+        self.sound = sound
+        self.functions = functions
+        self.dtype = dtype
+
+    def render(self, start, stop):
+        block = self.sound._read_block(start, stop)
+        samples = convert_samples(block, _PROCESSING_DTYPE)
+        if samples is block:
+            samples = samples.copy()
+        for function in self.functions:
+            function(samples, start)
+        return convert_samples(samples, self.dtype)
+
+
+class Gain:
+    """Multiplies the samples by a constant factor."""
+
+    def __init__(self, factor):
+        self.factor = factor
+
+    def __call__(self, samples, start):
+        samples *= self.factor
+
+
+class Fade:
+    """Applies linear fades to the start and the end of a range of frames.
+
+    Parameters
+    ----------
+
+    first : int
+      Index of the first frame of the range.
+
+    fade_in : int
+      Number of frames of the fade in.
+
+    fade_out : int
+      Number of frames of the fade out.
+
+    stop : int, optional
+      Index of the frame at which the range ends, not included. Only needed
+      if ``fade_out`` is not zero.
+    """
+
+    def __init__(self, first, fade_in, fade_out, stop=None):
+        self.first = first
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+        self.stop = stop
+
+    def __call__(self, samples, start):
+        indexes = np.arange(start, start + len(samples))
+        factors = np.ones(len(samples))
+        if self.fade_in:
+            np.minimum(factors, (indexes - self.first) / self.fade_in, out=factors)
+        if self.fade_out:
+            np.minimum(factors, (self.stop - indexes) / self.fade_out, out=factors)
+        np.clip(factors, 0, 1, out=factors)
+        samples *= factors if samples.ndim == 1 else factors[:, np.newaxis]
+
+
+class SelectChannels(Operation):
+    """Operation which selects or reorders the channels of a sound.
+
+    Parameters
+    ----------
+
+    sound : :py:class:`waves.Sound`
+      Input sound.
+
+    indexes : list
+      Index of the channel of the input sound for each channel of the result.
+    """
+
+    def __init__(self, sound, indexes):
+        self.sound = sound
+        self.indexes = indexes
+
+    def render(self, start, stop):
+        block = self.sound._read_block(start, stop)
+        block = block.reshape(len(block), -1)[:, self.indexes]
+        return block[:, 0] if len(self.indexes) == 1 else block
+
+
+class Mix(Operation):
+    """Operation which adds the samples of sounds, multiplied by weights.
+
+    The result lasts as the longest sound, the shortest ones are considered
+    silent after their end.
+
+    Parameters
+    ----------
+
+    sounds : list
+      Input sounds, all with the same framerate and number of channels.
+
+    weights : list
+      Factor by which the samples of each sound are multiplied.
+
+    dtype : type
+      Numpy type of the rendered samples.
+    """
+
+    def __init__(self, sounds, weights, dtype):
+        self.sounds = sounds
+        self.weights = weights
+        self.dtype = dtype
+
+    @property
+    def source(self):
+        return self.sounds[0]
+
+    def render(self, start, stop):
+        blocks = [sound._read_block(start, stop) for sound in self.sounds]
+        n_frames = max(len(block) for block in blocks)
+        samples = np.zeros((n_frames,) + blocks[0].shape[1:], _PROCESSING_DTYPE)
+        for block, weight in zip(blocks, self.weights):
+            samples[: len(block)] += weight * convert_samples(block, _PROCESSING_DTYPE)
+        return convert_samples(samples, self.dtype)
+
+
+class Concat(Operation):
+    """Operation which joins sounds one after another.
+
+    Parameters
+    ----------
+
+    sounds : list
+      Input sounds, all with the same framerate and number of channels. All
+      must have a known number of frames, except the last one.
+
+    dtype : type
+      Numpy type of the rendered samples.
+    """
+
+    def __init__(self, sounds, dtype):
+        self.sounds = sounds
+        self.dtype = dtype
+        self.starts = np.cumsum([0] + [s.n_frames for s in sounds[:-1]]).tolist()
+
+    @property
+    def source(self):
+        return self.sounds[0]
+
+    def render(self, start, stop):
+        blocks, last = ([], len(self.sounds) - 1)
+        for i, (sound, sound_start) in enumerate(zip(self.sounds, self.starts)):
+            local_start, local_stop = (max(start - sound_start, 0), stop - sound_start)
+            if sound.n_frames is not None:
+                local_stop = min(local_stop, sound.n_frames)
+            if local_start >= local_stop:
+                continue
+            block = convert_samples(
+                sound._read_block(local_start, local_stop), self.dtype
+            )
+            if i < last and len(block) < local_stop - local_start:
+                # the sound ended before its expected duration, fill with silence
+                padding = np.zeros(
+                    (local_stop - local_start - len(block),) + block.shape[1:],
+                    dtype=self.dtype,
+                )
+                block = np.concatenate((block, padding))
+            blocks.append(block)
+        if not blocks:
+            return np.empty((0,) + self._channels_shape(), dtype=self.dtype)
+        return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+    def _channels_shape(self):
+        n_channels = self.sounds[0].n_channels
+        return () if n_channels == 1 else (n_channels,)
+
+
+def _elementwise(sound, function):
+    operation = sound.operation
+    if isinstance(operation, Elementwise):
+        # fuse with the previous elementwise operation
+        return _new_sound(
+            sound,
+            Elementwise(
+                operation.sound, operation.functions + [function], operation.dtype
+            ),
+            offset=sound.offset,
+        )
+    return _new_sound(sound, Elementwise(sound, [function], sound.dtype))
+
+
+def gain(sound, db):
+    """Changes the volume of a sound.
+
+    Samples of integer sounds exceeding the full scale are clipped.
+
+    Parameters
+    ----------
+
+    db : float
+      Gain in decibels. Negative values reduce the volume.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Sound with the gain applied lazily.
+
+    Examples
+    --------
+
+    >>> from waves import Sound
+    >>>
+    >>> sound = Sound.from_file("tests/files/mono.wav")
+    >>> sound.data[:4]
+    array([-29,  76, 254, 281], dtype=int16)
+    >>> sound.gain(-6.0206).data[:4]
+    array([-14,  38, 127, 140], dtype=int16)
+    """
+    return _elementwise(sound, Gain(10 ** (db / 20)))
+
+
+def fade(sound, fade_in=0, fade_out=0):
+    """Applies linear fades to the start and the end of a sound.
+
+    Parameters
+    ----------
+
+    fade_in : float, optional
+      Duration of the fade in, in seconds.
+
+    fade_out : float, optional
+      Duration of the fade out, in seconds. Sounds without a known duration
+      can't be faded out.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Sound with the fades applied lazily.
+    """
+    fade_out = int(round(fade_out * sound.fps))
+    if fade_out and sound.n_frames is None:
+        raise ValueError("Sounds without duration can't be faded out")
+
+    first = sound.offset if isinstance(sound.operation, Elementwise) else 0
+    return _elementwise(
+        sound,
+        Fade(
+            first,
+            int(round(fade_in * sound.fps)),
+            fade_out,
+            stop=None if sound.n_frames is None else first + sound.n_frames,
+        ),
+    )
+
+
+def mix(sound, *sounds, weights=None):
+    """Mixes a sound with other sounds, adding their samples.
+
+    Parameters
+    ----------
+
+    sounds : :py:class:`waves.Sound`
+      Sounds to mix, all with the same framerate and number of channels. The
+      mix lasts as the longest one.
+
+    weights : list, optional
+      Factor by which the samples of each sound, including the first, are
+      multiplied. By default all are ``1``. Samples of integer sounds exceeding
+      the full scale are clipped.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Mix of the sounds, rendered lazily.
+    """
+    sounds = (sound,) + sounds
+    _check_compatible(sounds)
+    if weights is None:
+        weights = [1] * len(sounds)
+    elif len(weights) != len(sounds):
+        raise ValueError("A weight must be defined for each sound mixed")
+
+    n_frames = [s.n_frames for s in sounds]
+    return _new_sound(
+        sound,
+        Mix(list(sounds), list(weights), sound.dtype),
+        n_frames=None if None in n_frames else max(n_frames),
+    )
+
+
+def concat(sound, *sounds):
+    """Joins a sound with other sounds, one after another.
+
+    Parameters
+    ----------
+
+    sounds : :py:class:`waves.Sound`
+      Sounds to join, all with the same framerate and number of channels. All
+      must have a known duration, except the last one.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Sounds joined, rendered lazily.
+
+    Examples
+    --------
+
+    >>> from waves import Sound
+    >>>
+    >>> sound = Sound.from_file("tests/files/stereo.wav")
+    >>> sound.concat(sound[:1000]).duration
+    1.274...
+    """
+    sounds = (sound,) + sounds
+    _check_compatible(sounds)
+    if any(s.n_frames is None for s in sounds[:-1]):
+        raise ValueError("Only the last sound concatenated can be without duration")
+
+    n_frames = [s.n_frames for s in sounds]
+    return _new_sound(
+        sound,
+        Concat(list(sounds), sound.dtype),
+        n_frames=None if None in n_frames else sum(n_frames),
+    )
+
+
+def select_channels(sound, *channels):
+    """Builds a sound with some channels of a sound.
+
+    Parameters
+    ----------
+
+    channels : int
+      Index of the channel of the sound for each channel of the result. Can
+      be repeated, so mono sounds can be converted to stereo passing ``0``
+      twice.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Sound with the channels selected, rendered lazily.
+
+    Examples
+    --------
+
+    >>> from waves import Sound
+    >>>
+    >>> sound = Sound.from_file("tests/files/stereo.wav")
+    >>> sound.select_channels(1).n_channels
+    1
+    >>> sound.select_channels(1, 0).data.shape
+    (2, 55216)
+    """
+    if not channels:
+        raise ValueError("At least one channel must be selected")
+    for channel in channels:
+        if not 0 <= channel < sound.n_channels:
+            raise IndexError(
+                f"The sound has {sound.n_channels} channels, can't select the"
+                f" channel {channel}"
+            )
+    return _new_sound(
+        sound, SelectChannels(sound, list(channels)), n_channels=len(channels)
+    )
@@ -0,0 +1,381 @@
+"""Uncompressed PCM files utilities."""
+import collections
+import os
+import struct
+
+
+#: Layout of the audio data stored in an uncompressed PCM file.
+PCMHeader = collections.namedtuple(
+    "PCMHeader",
+    (
+        "container",
+        "encoding",
+        "byteorder",
+        "n_channels",
+        "fps",
+        "n_frames",
+        "data_offset",
+    ),
+)
+
+# numpy is imported only by the functions which use it, so the headers can be
+# parsed without loading it
+
+# Numpy types of the encodings whose samples can be mapped without conversion
+_MEMMAP_DTYPES = {"pcm16": "i2", "pcm32": "i4", "float32": "f4", "float64": "f8"}
+
+# Numpy types of the samples decoded for each encoding and number of bytes of each
+# sample encoded. 24 bits samples are decoded to the most significant bytes
+_DECODED_DTYPES = {
+    "pcmu8": ("i1", 1),
+    "pcms8": ("i1", 1),
+    "pcm16": ("i2", 2),
+    "pcm24": ("i4", 3),
+    "pcm32": ("i4", 4),
+    "float32": ("f4", 4),
+    "float64": ("f8", 8),
+}
+
+_WAVE_FORMAT_PCM, _WAVE_FORMAT_IEEE_FLOAT, _WAVE_FORMAT_EXTENSIBLE = (1, 3, 0xFFFE)
+
+_AIFC_COMPRESSIONS = {
+    b"NONE": (">", "pcm"),
+    b"twos": (">", "pcm"),
+    b"sowt": ("<", "pcm"),
+    b"fl32": (">", "float"),
+    b"FL32": (">", "float"),
+    b"fl64": (">", "float"),
+    b"FL64": (">", "float"),
+}
+
+
+def _iter_chunks(f, byteorder):
+    """Generates the identifier, size and offset of the data of each chunk of
+    a RIFF or IFF file, whose cursor must be placed after the file header.
+    """
+    while 1:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            return
+        chunk_id, size = struct.unpack(f"{byteorder}4sI", chunk_header)
+        offset = f.tell()
+        yield (chunk_id, size, offset)
+        f.seek(offset + size + (size & 1))  # chunks are aligned to 2 bytes
+
+
+def _pcm_encoding(kind, n_bits, signed_8bits):
+    if kind == "float":
+        return f"float{n_bits}" if n_bits in (32, 64) else None
+    if n_bits == 8:
+        return "pcms8" if signed_8bits else "pcmu8"
+    return f"pcm{n_bits}" if n_bits in (16, 24, 32) else None
+
+
+def _read_wav_header(f, container):
+    fmt, data_size, data_offset, ds64_data_size = (None, None, None, None)
+    for chunk_id, size, offset in _iter_chunks(f, "<"):
+        if chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<QQ", f.read(16))[1]
+        elif chunk_id == b"fmt ":
+            fmt = f.read(min(size, 26))
+        elif chunk_id == b"data":
+            data_size, data_offset = (size, offset)
+            break
+    if fmt is None or data_offset is None or len(fmt) < 16:
+        return None
+
+    tag, n_channels, fps, _, block_align, n_bits = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) == 26:
+        tag = struct.unpack("<H", fmt[24:26])[0]  # first bytes of subformat GUID
+    if tag == _WAVE_FORMAT_PCM:
+        encoding = _pcm_encoding("pcm", n_bits, False)
+    elif tag == _WAVE_FORMAT_IEEE_FLOAT:
+        encoding = _pcm_encoding("float", n_bits, False)
+    else:
+        return None
+    if encoding is None or not block_align or not n_channels or not fps:
+        return None
+
+    if data_size == 0xFFFFFFFF and ds64_data_size is not None:
+        data_size = ds64_data_size
+    # streamed files may have not updated the size of the data
+    data_size = min(data_size, os.fstat(f.fileno()).st_size - data_offset)
+
+    return PCMHeader(
+        container=container,
+        encoding=encoding,
+        byteorder="<",
+        n_channels=n_channels,
+        fps=fps,
+        n_frames=data_size // block_align,
+        data_offset=data_offset,
+    )
+
+
+def _read_aiff_header(f, is_aifc):
+    comm, data_offset, data_size = (None, None, None)
+    for chunk_id, size, offset in _iter_chunks(f, ">"):
+        if chunk_id == b"COMM":
+            comm = f.read(min(size, 22))
+        elif chunk_id == b"SSND":
+            ssnd_offset = struct.unpack(">I", f.read(4))[0]
+            data_offset = offset + 8 + ssnd_offset
+            data_size = size - 8 - ssnd_offset
+            break
+    if comm is None or data_offset is None or len(comm) < 18:
+        return None
+
+    n_channels, n_frames, n_bits = struct.unpack(">hIh", comm[:8])
+    exponent, mantissa = struct.unpack(">HQ", comm[8:18])
+    fps = int(mantissa * 2.0 ** ((exponent & 0x7FFF) - 16383 - 63))
+
+    byteorder, kind = (">", "pcm")
+    if is_aifc:
+        if len(comm) < 22 or comm[18:22] not in _AIFC_COMPRESSIONS:
+            return None
+        byteorder, kind = _AIFC_COMPRESSIONS[comm[18:22]]
+    encoding = _pcm_encoding(kind, n_bits, True)
+    if encoding is None or n_channels <= 0 or fps <= 0:
+        return None
+
+    block_align = n_channels * ((n_bits + 7) >> 3)
+    data_size = min(data_size, os.fstat(f.fileno()).st_size - data_offset)
+
+    return PCMHeader(
+        container="aiff",
+        encoding=encoding,
+        byteorder=byteorder,
+        n_channels=n_channels,
+        fps=fps,
+        n_frames=min(n_frames, data_size // block_align),
+        data_offset=data_offset,
+    )
+
+
+def read_header(filename):
+    """Reads the layout of the audio data of an uncompressed PCM file parsing its
+    header, without decoding it.
+
+    Supports WAV, RF64 and AIFF files with integer or floating point samples.
+
+    Parameters
+    ----------
+
+    filename : str
+      Path to the file in the disk.
+
+    Returns
+    -------
+
+    :py:class:`waves.sound.pcm.PCMHeader`
+      Layout of the audio data, or ``None`` if the file is not an uncompressed
+      PCM file supported.
+
+    Examples
+    --------
+
+    >>> from waves.sound.pcm import read_header
+    >>>
+    >>> read_header("tests/files/stereo.wav")
+    PCMHeader(container='wav', encoding='pcm16', byteorder='<', n_channels=2, \
+fps=44100, n_frames=55216, data_offset=...)
+    """
+    with open(filename, "rb") as f:
+        file_header = f.read(12)
+        if len(file_header) < 12:
+            return None
+        magic, form = (file_header[:4], file_header[8:])
+        if form == b"WAVE" and magic in (b"RIFF", b"RF64", b"BW64"):
+            return _read_wav_header(f, "wav" if magic == b"RIFF" else "rf64")
+        elif magic == b"FORM" and form in (b"AIFF", b"AIFC"):
+            return _read_aiff_header(f, form == b"AIFC")
+    return None
+
+
+def memmap_frames(filename, header=None):
+    """Maps the audio data of an uncompressed PCM file in memory without reading
+    it, so the frames are loaded by the operating system only when accessed and
+    the pages can be shared between processes.
+
+    Parameters
+    ----------
+
+    filename : str
+      Path to the file in the disk.
+
+    header : :py:class:`waves.sound.pcm.PCMHeader`, optional
+      Layout of the audio data of the file. If not defined, is read from the file
+      using :py:func:`waves.sound.pcm.read_header`.
+
+    Returns
+    -------
+
+    numpy.memmap
+      Read only array of frames with shape ``(n_frames, n_channels)``, or
+      ``(n_frames,)`` for mono files. If the samples of the file can't be mapped
+      without conversion (like 24 bits or unsigned 8 bits samples) or the file is
+      not an uncompressed PCM file, returns ``None``.
+    """
+    import numpy as np
+
+    if header is None:
+        header = read_header(filename)
+    if header is None or header.encoding not in _MEMMAP_DTYPES or not header.n_frames:
+        return None
+
+    return np.memmap(
+        filename,
+        dtype=np.dtype(header.byteorder + _MEMMAP_DTYPES[header.encoding]),
+        mode="r",
+        offset=header.data_offset,
+        shape=(
+            header.n_frames
+            if header.n_channels == 1
+            else (header.n_frames, header.n_channels)
+        ),
+    )
+
+
+def convert_samples(samples, dtype):
+    """Converts samples to other Numpy type, scaling them in a single vectorized
+    pass so they keep the same relative amplitude.
+
+    Integer samples are scaled by the width of their types, so full scale integer
+    samples are mapped to floating point samples between ``-1`` and ``1``.
+    Floating point samples out of that range are clipped when converted to
+    integers.
+
+    Parameters
+    ----------
+
+    samples : np.ndarray
+      Array of samples to convert.
+
+    dtype : type
+      Numpy type of the converted samples.
+
+    Returns
+    -------
+
+    np.ndarray
+      Converted samples. If they already are of the type ``dtype``, the same
+      array is returned.
+
+    Examples
+    --------
+
+    >>> import numpy as np
+    >>> from waves.sound.pcm import convert_samples
+    >>>
+    >>> convert_samples(np.array([-32768, 16384], dtype=np.int16), np.float32)
+    array([-1. ,  0.5], dtype=float32)
+    >>> convert_samples(np.array([-1.5, 0.5]), np.int16)
+    array([-32768,  16384], dtype=int16)
+    >>> convert_samples(np.array([-1, 1], dtype=np.float32), np.int32)
+    array([-2147483648,  2147483647], dtype=int32)
+    >>> convert_samples(np.array([-32768, 1], dtype=np.int16), np.int32)
+    array([-2147483648,       65536], dtype=int32)
+    """
+    import numpy as np
+
+    dtype = np.dtype(dtype)
+    if samples.dtype == dtype:
+        return samples
+
+    from_integer = np.issubdtype(samples.dtype, np.integer)
+    if np.issubdtype(dtype, np.integer):
+        if from_integer:
+            shift = (dtype.itemsize - samples.dtype.itemsize) << 3
+            if shift > 0:
+                return np.left_shift(samples, shift, dtype=dtype)
+            return np.right_shift(samples, -shift).astype(dtype)
+
+        info = np.iinfo(dtype)
+        # scaled in double precision, where the maximum of 32 bits integers is
+        # exact, so the clip prevents full scale samples from overflowing
+        converted = np.multiply(samples, -float(info.min), dtype=np.float64)
+        np.clip(converted, info.min, info.max, out=converted)
+        np.rint(converted, out=converted)
+        return converted.astype(dtype)
+    elif from_integer:
+        scale = 1 / -float(np.iinfo(samples.dtype).min)
+        return np.multiply(samples, scale, dtype=dtype)
+    return samples.astype(dtype)
+
+
+def decode_frames(data, n_channels=1, encoding="pcm16", byteorder="<"):
+    """Decodes interleaved PCM frames in a single vectorized pass.
+
+    Parameters
+    ----------
+
+    data : bytes-like
+      Encoded frames, with the samples of each frame interleaved.
+
+    n_channels : int, optional
+      Number of channels of the frames.
+
+    encoding : str, optional
+      Encoding of the samples, one of ``"pcmu8"``, ``"pcms8"``, ``"pcm16"``,
+      ``"pcm24"``, ``"pcm32"``, ``"float32"`` or ``"float64"``, as in
+      :py:attr:`waves.sound.pcm.PCMHeader.encoding`.
+
+    byteorder : str, optional
+      Byte order of the samples, ``"<"`` for little endian or ``">"`` for big
+      endian.
+
+    Returns
+    -------
+
+    np.ndarray
+      Frames with shape ``(n_frames, n_channels)``, or ``(n_frames,)`` for mono
+      frames, of the native type of the encoding: 8 bits samples are decoded as
+      ``int8``, subtracting the offset of unsigned samples, and 24 bits samples
+      as ``int32`` of the same scale. If no conversion is needed, the array is a
+      read only view of ``data``.
+
+    Examples
+    --------
+
+    >>> from waves.sound.pcm import decode_frames
+    >>>
+    >>> decode_frames(b"\\x00\\x01\\xff\\xff", n_channels=2)
+    array([[256,  -1]], dtype=int16)
+    >>> decode_frames(b"\\x00\\x80\\xff", encoding="pcmu8")
+    array([-128,    0,  127], dtype=int8)
+    >>> decode_frames(b"\\x80\\x00\\x01", encoding="pcm24", byteorder=">")
+    array([-2147483392], dtype=int32)
+    """
+    import numpy as np
+
+    if encoding not in _DECODED_DTYPES:
+        raise ValueError(
+            f"Invalid encoding '{encoding}', must be one of"
+            f" {', '.join(_DECODED_DTYPES)}"
+        )
+    if byteorder not in ("<", ">"):
+        raise ValueError(f"Invalid byte order '{byteorder}', must be '<' or '>'")
+    code, n_bytes = _DECODED_DTYPES[encoding]
+    if memoryview(data).nbytes % (n_bytes * n_channels):
+        raise ValueError(
+            f"The size of the data is not a multiple of the size of each frame,"
+            f" {n_bytes * n_channels} bytes"
+        )
+
+    if encoding == "pcm24":
+        # unpack to the most significant bytes of 32 bits samples
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(packed), 4), dtype=np.uint8)
+        if byteorder == "<":
+            padded[:, 1:] = packed
+        else:
+            padded[:, :3] = packed
+        samples = padded.view(byteorder + code)[:, 0]
+    elif encoding == "pcmu8":
+        samples = (np.frombuffer(data, dtype=np.uint8) ^ 0x80).view(np.int8)
+    else:
+        samples = np.frombuffer(data, dtype=byteorder + code)
+
+    if not samples.dtype.isnative:
+        samples = samples.astype(samples.dtype.newbyteorder("="))
+    return samples if n_channels == 1 else samples.reshape(-1, n_channels)
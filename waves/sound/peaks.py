@@ -0,0 +1,362 @@
+"""Multi-resolution peak files for fast waveform rendering.
+
+A peak pyramid stores the minimum, maximum and RMS values of each channel of a
+sound for ranges of frames of increasing lengths, or levels. Each range of the
+first level covers ``base`` frames, and each range of the next levels covers
+``factor`` ranges of the previous one. The pyramid is built in a single
+streaming pass over the sound and can be saved to a sidecar file next to the
+audio file, so any range of the sound can be summarized at any resolution
+reading only the closest level, without reading the audio data again:
+
+>>> from waves import Sound
+>>> from waves.sound.peaks import get_peaks
+>>>
+>>> sound = Sound.from_file("tests/files/stereo.wav")
+>>> pyramid = get_peaks(sound, sidecar="/tmp/waves-peaks-example.peaks")
+>>> [len(minimums) for minimums, maximums, rms in pyramid.levels]
+[216, 54, 14, 4, 1]
+>>> times, minimums, maximums, rms = pyramid.query(0, 44100, n_bins=100)
+>>> minimums.shape
+(100, 2)
+
+The sidecar files store the modification time and size of their audio files,
+so they're rebuilt when the audio files change.
+"""
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from waves.sound.buffersize import get_sizer
+
+
+#: Extension appended to the path of the audio files to build the path of their
+#: sidecar peak files.
+SIDECAR_EXTENSION = ".peaks"
+
+#: Default number of frames of each range of the first level.
+DEFAULT_BASE = 0b100000000  # 256 frames
+
+#: Default number of ranges of each level summarized by a range of the next one.
+DEFAULT_FACTOR = 4
+
+# Version of the format of the sidecar files, which are rebuilt if differs
+_FORMAT_VERSION = 1
+
+
+def sidecar_filename(filename):
+    """Returns the path of the sidecar peak file of an audio file."""
+    return os.fsdecode(filename) + SIDECAR_EXTENSION
+
+
+def _source_stat(filename):
+    stat = os.stat(filename)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PeakPyramid:
+    """Minimum, maximum and RMS values of the channels of a sound for ranges of
+    frames at multiple resolutions.
+
+    Use :py:meth:`waves.sound.peaks.PeakPyramid.build` to build it from a sound,
+    or :py:func:`waves.sound.peaks.get_peaks` to reuse the sidecar file of the
+    sound.
+
+    Parameters
+    ----------
+
+    levels : list
+      Tuples with the minimum, maximum and RMS values of each range of frames of
+      each level, as arrays with shape ``(n_ranges, n_channels)``.
+
+    n_frames : int
+      Number of frames of the sound.
+
+    fps : int
+      Number of frames per second of the sound.
+
+    base : int
+      Number of frames of each range of the first level.
+
+    factor : int
+      Number of ranges of each level summarized by a range of the next one.
+
+    source : tuple, optional
+      Modification time in nanoseconds and size of the audio file summarized.
+    """
+
+    def __init__(self, levels, n_frames, fps, base, factor, source=None):
+        #: Tuples with the minimum, maximum and RMS values of each level.
+        self.levels = levels
+
+        #: Number of frames of the sound.
+        self.n_frames = n_frames
+
+        #: Number of frames per second of the sound.
+        self.fps = fps
+
+        #: Number of frames of each range of the first level.
+        self.base = base
+
+        #: Number of ranges of each level summarized by a range of the next one.
+        self.factor = factor
+
+        #: Modification time in nanoseconds and size of the audio file.
+        self.source = source
+
+    @property
+    def dtype(self):
+        """Returns the type of the minimum and maximum values."""
+        return self.levels[0][0].dtype
+
+    @classmethod
+    def build(cls, sound, base=DEFAULT_BASE, factor=DEFAULT_FACTOR, buffersize=None):
+        """Builds the peak pyramid of a sound in a single pass.
+
+        Parameters
+        ----------
+
+        sound : :py:class:`waves.Sound`
+          Sound summarized, whose duration must be defined.
+
+        base : int, optional
+          Number of frames of each range of the first level.
+
+        factor : int, optional
+          Number of ranges of each level summarized by a range of the next one.
+
+        buffersize : int, optional
+          Number of frames read at each chunk, rounded to a multiple of
+          ``base``. Chosen automatically if not defined.
+
+        Returns
+        -------
+
+        :py:class:`waves.sound.peaks.PeakPyramid`
+          Peak pyramid of the sound.
+        """
+        if sound.n_frames is None:
+            raise ValueError("The duration of the sound must be defined")
+        source = None
+        if sound.filename and sound.time_to_frame is None and not sound.operation:
+            source = _source_stat(sound.filename)
+
+        if buffersize is None:
+            buffersize = get_sizer().choose(sound)
+        buffersize = -(-buffersize // base) * base
+
+        minimums, maximums, squares, n_frames = ([], [], [], 0)
+        for chunk in sound.iter_chunks(buffersize=buffersize):
+            # only the last chunk can have a range shorter than ``base`` frames
+            chunk = chunk.reshape(len(chunk), sound.n_channels)
+            indexes = np.arange(0, len(chunk), base)
+            minimums.append(np.minimum.reduceat(chunk, indexes, axis=0))
+            maximums.append(np.maximum.reduceat(chunk, indexes, axis=0))
+            samples = chunk.astype(np.float64)
+            squares.append(np.add.reduceat(samples * samples, indexes, axis=0))
+            n_frames += len(chunk)
+
+        if not n_frames:
+            raise ValueError("The sound has no frames")
+        minimums, maximums, squares = (
+            np.concatenate(minimums),
+            np.concatenate(maximums),
+            np.concatenate(squares),
+        )
+        counts = np.full(len(minimums), base)
+        counts[-1] = n_frames - base * (len(minimums) - 1)
+
+        levels = []
+        while True:
+            rms = np.sqrt(squares / counts[:, np.newaxis]).astype(np.float32)
+            levels.append((minimums, maximums, rms))
+            if len(minimums) == 1:
+                break
+            indexes = np.arange(0, len(minimums), factor)
+            minimums = np.minimum.reduceat(minimums, indexes, axis=0)
+            maximums = np.maximum.reduceat(maximums, indexes, axis=0)
+            squares = np.add.reduceat(squares, indexes, axis=0)
+            counts = np.add.reduceat(counts, indexes)
+
+        return cls(levels, n_frames, sound.fps, base, factor, source=source)
+
+    def query(self, start=0, stop=None, n_bins=1000):
+        """Summarizes a range of frames of the sound in ``n_bins`` ranges using
+        the coarsest level which has at least one range for each bin, so the
+        cost depends on ``n_bins`` and not on the length of the range.
+
+        The limits of the bins are aligned to the ranges of the level used.
+
+        Parameters
+        ----------
+
+        start : int, optional
+          Index of the first frame summarized.
+
+        stop : int, optional
+          Index of the frame after the last one summarized. By default, the
+          number of frames of the sound.
+
+        n_bins : int, optional
+          Number of bins.
+
+        Returns
+        -------
+
+        tuple
+          Time of the middle of each bin, in seconds since ``start``, and arrays
+          with the minimum, maximum and RMS values of each bin, with shape
+          ``(n_bins, n_channels)``. If the range has fewer than ``base`` frames
+          for each bin, so can't be summarized by the pyramid, returns ``None``.
+        """
+        start = max(start, 0)
+        stop = self.n_frames if stop is None else min(stop, self.n_frames)
+        if stop - start < n_bins * self.base:
+            return None
+
+        level, bin_frames = (0, self.base)
+        while (
+            level + 1 < len(self.levels)
+            and bin_frames * self.factor * n_bins <= stop - start
+        ):
+            level, bin_frames = (level + 1, bin_frames * self.factor)
+        minimums, maximums, rms = self.levels[level]
+
+        first, last = (start // bin_frames, -(-stop // bin_frames))
+        indexes = np.arange(n_bins) * (last - first) // n_bins
+        counts = np.full(last - first, bin_frames)
+        counts[0] -= start - first * bin_frames
+        counts[-1] -= last * bin_frames - stop
+        squares = rms[first:last].astype(np.float64) ** 2 * counts[:, np.newaxis]
+        bin_counts = np.add.reduceat(counts, indexes)
+
+        edges = np.append(first + indexes, last) * bin_frames
+        times = ((edges[:-1] + edges[1:]) / 2 - start) / self.fps
+        return (
+            times,
+            np.minimum.reduceat(minimums[first:last], indexes, axis=0),
+            np.maximum.reduceat(maximums[first:last], indexes, axis=0),
+            np.sqrt(np.add.reduceat(squares, indexes, axis=0) / bin_counts[:, None]),
+        )
+
+    def is_stale(self, filename):
+        """Checks if an audio file has been modified or removed since the
+        pyramid was built from it.
+        """
+        try:
+            return self.source is None or _source_stat(filename) != self.source
+        except OSError:
+            return True
+
+    def save(self, filename):
+        """Saves the pyramid to a file. The file is written under a unique
+        temporary name and renamed when complete, so readers never find
+        partial files, even if multiple processes save it at the same time.
+        """
+        arrays = {
+            "header": np.array(
+                [_FORMAT_VERSION, self.n_frames, self.fps, self.base, self.factor]
+                + list(self.source or (-1, -1)),
+                dtype=np.int64,
+            ),
+        }
+        for i, (minimums, maximums, rms) in enumerate(self.levels):
+            arrays.update(
+                {f"minimums{i}": minimums, f"maximums{i}": maximums, f"rms{i}": rms}
+            )
+
+        fd, partial_filename = tempfile.mkstemp(
+            prefix=f".partial-{os.path.basename(filename)}-",
+            dir=os.path.dirname(os.path.abspath(filename)),
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(partial_filename, filename)
+        except BaseException:
+            os.remove(partial_filename)
+            raise
+
+    @classmethod
+    def load(cls, filename):
+        """Loads a pyramid saved by :py:meth:`waves.sound.peaks.PeakPyramid.save`.
+
+        Returns ``None`` if the file doesn't exist, can't be read, like
+        truncated files, or has been saved by an incompatible version.
+        """
+        try:
+            with np.load(filename) as arrays:
+                header = arrays["header"].tolist()
+                if header[0] != _FORMAT_VERSION:
+                    return None
+                _, n_frames, fps, base, factor, mtime_ns, size = header
+                levels = []
+                while f"minimums{len(levels)}" in arrays:
+                    i = len(levels)
+                    levels.append(
+                        (
+                            arrays[f"minimums{i}"],
+                            arrays[f"maximums{i}"],
+                            arrays[f"rms{i}"],
+                        )
+                    )
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        if not levels:
+            return None
+
+        source = None if size < 0 else (mtime_ns, size)
+        return cls(levels, n_frames, fps, base, factor, source=source)
+
+
+def get_peaks(sound, sidecar=None, rebuild=False, **kwargs):
+    """Returns the peak pyramid of a sound opened from a file, loading it from
+    its sidecar file if is up to date, otherwise building it and saving it.
+
+    Parameters
+    ----------
+
+    sound : :py:class:`waves.Sound`
+      Sound opened from a file. The whole file is summarized, even if the
+      sound is a slice of it.
+
+    sidecar : str, optional
+      Path to the sidecar peak file. By default, the path of the audio file
+      followed by :py:data:`waves.sound.peaks.SIDECAR_EXTENSION`.
+
+    rebuild : bool, optional
+      Build the pyramid even if the sidecar file is up to date.
+
+    kwargs
+      Arguments passed to :py:meth:`waves.sound.peaks.PeakPyramid.build`.
+
+    Returns
+    -------
+
+    :py:class:`waves.sound.peaks.PeakPyramid`
+      Peak pyramid of the audio file. If the sidecar file can't be written, the
+      pyramid is returned without saving it.
+    """
+    if not sound.filename or sound.time_to_frame is not None or sound.operation:
+        raise ValueError("Peak files can only be built for sounds read from files")
+    if sidecar is None:
+        sidecar = sidecar_filename(sound.filename)
+
+    if not rebuild:
+        pyramid = PeakPyramid.load(sidecar)
+        if (
+            pyramid is not None
+            and pyramid.dtype == np.dtype(sound.dtype)
+            and not pyramid.is_stale(sound.filename)
+        ):
+            return pyramid
+
+    whole_sound = sound.from_file(sound.filename)
+    whole_sound.dtype = sound.dtype
+    pyramid = PeakPyramid.build(whole_sound, **kwargs)
+    try:
+        pyramid.save(sidecar)
+    except OSError:
+        pass  # read only directory, the pyramid is only kept in memory
+    return pyramid
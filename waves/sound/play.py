@@ -1,16 +1,70 @@
 """Playable sounds interface."""
+import itertools
+
 import numpy as np
 
-from waves.players.pygame import play_sound
+from waves.players.pygame import StreamPlayer
+from waves.sound.pcm import convert_samples
+
+
+#: Duration of the chunks of frames played by default, in seconds.
+PLAY_BUFFER_SECONDS = 0.1
+
+# size of the samples of the mixer for the types played as they are, other types
+# are converted to 32 bits floating point samples
+_MIXER_SIZES = {
+    np.dtype(np.int8): -8,
+    np.dtype(np.uint8): 8,
+    np.dtype(np.int16): -16,
+    np.dtype(np.uint16): 16,
+    np.dtype(np.float32): 32,
+}
+
+
+def _iter_loops(sound, loops, fade_ms, buffersize, out):
+    """Generates the chunks of a sound played ``loops`` times after the first
+    one, forever if ``loops`` is negative, fading in only the first time.
+    """
+    first = sound.fade(fade_in=fade_ms / 1000) if fade_ms > 0 else sound
+    for i in itertools.count() if loops < 0 else range(loops + 1):
+        if i and sound.n_frames == 0:
+            return
+        yield from (sound if i else first).iter_chunks(buffersize=buffersize, out=out)
+
+
+def _limit_frames(chunks, n_frames):
+    """Generates chunks until ``n_frames`` frames have been generated."""
+    for chunk in chunks:
+        if len(chunk) >= n_frames:
+            yield chunk[:n_frames]
+            return
+        n_frames -= len(chunk)
+        yield chunk
+
+
+def play(sound, wait=True, buffersize=None, n_buffers=4, loops=0, maxtime=0, fade_ms=0):
+    if buffersize is None:
+        buffersize = max(int(sound.fps * PLAY_BUFFER_SECONDS), 1)
+    # the chunks are copied by Pygame, so all of them are read into one array
+    out = np.empty(sound._frames_shape(buffersize), dtype=sound.dtype)
 
+    chunks = _iter_loops(sound, loops, fade_ms, buffersize, out)
+    if maxtime > 0:
+        chunks = _limit_frames(chunks, max(int(sound.fps * maxtime / 1000), 1))
+    # the frames are played as decoded, whatever the sample width in file
+    size = _MIXER_SIZES.get(np.dtype(sound.dtype))
+    if size is None:
+        # like 24 and 32 bits samples, decoded as int32, not supported by Pygame
+        size = 32
+        chunks = (convert_samples(chunk, np.float32) for chunk in chunks)
 
-def play(sound, wait=True, **kwargs):
-    return play_sound(
-        sound.dataframes,
+    player = StreamPlayer(
+        chunks,
         frequency=sound.fps,
-        size=(sound.n_bytes << 3)
-        * (-1 if np.issubdtype(sound.dtype, np.signedinteger) else 1),
+        size=size,
         n_channels=sound.n_channels,
-        wait=wait if not isinstance(wait, bool) else sound.duration,
-        **kwargs
-    )
+        n_buffers=n_buffers,
+    ).play()
+    if wait:
+        player.wait(None if isinstance(wait, bool) else wait)
+    return player
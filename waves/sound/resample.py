@@ -0,0 +1,318 @@
+"""Sample rate conversion of sounds.
+
+The conversion is done by a polyphase windowed sinc filter. For a conversion
+from ``fps`` to ``new_fps`` frames per second, being ``up / down`` the ratio
+``new_fps / fps`` reduced to its lowest terms, the output frame ``n`` is placed
+after the input frame ``n * down // up``, at a fractional position which can
+take only ``up`` values, or phases. The coefficients of the filter for each
+phase are computed once for each ratio and quality.
+
+Each ``up`` output frames are computed from ``down`` input frames plus the
+length of the filter, so for common ratios, like ``160 / 147`` converting from
+44100 to 48000 frames per second, all the frames of a block are computed by a
+single matrix product over a strided view of the input frames:
+
+>>> from waves import Sound
+>>>
+>>> sound = Sound.from_file("tests/files/stereo.wav")
+>>> resampled = sound.resample(48000)
+>>> resampled.fps, resampled.n_frames
+(48000, 60100)
+"""
+import functools
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from waves.sound.ops import Operation, _new_sound
+from waves.sound.pcm import convert_samples
+
+
+#: Parameters of the filter for each quality, as the number of zero crossings of
+#: the sinc function at each side of the filter, the ``beta`` parameter of its
+#: Kaiser window and the fraction of the Nyquist frequency which is preserved.
+QUALITIES = {
+    "fast": (8, 6.0, 0.85),
+    "medium": (16, 8.6, 0.92),
+    "high": (32, 10.0, 0.95),
+}
+
+# Maximum number of coefficients of the matrices used to compute all the phases
+# at once. Ratios with larger matrices compute each output frame separately.
+_MAX_MATRIX_SIZE = 0b1 << 20
+
+# Maximum number of frames computed at once, limiting the memory used
+_MAX_BLOCKSIZE = 0b10000000000000000  # 65536 frames
+
+
+@functools.lru_cache(maxsize=16)
+def filter_table(up, down, quality="medium"):
+    """Computes the coefficients of the polyphase filter used to convert sample
+    rates by the ratio ``up / down``, which must be reduced to its lowest terms.
+
+    The tables are cached, so they're computed only once for each ratio and
+    quality.
+
+    Parameters
+    ----------
+
+    up : int
+      Numerator of the ratio of the conversion.
+
+    down : int
+      Denominator of the ratio of the conversion.
+
+    quality : str, optional
+      Quality of the filter, one of :py:data:`waves.sound.resample.QUALITIES`.
+
+    Returns
+    -------
+
+    np.ndarray
+      Read only array with shape ``(up, n_taps)``, where each row contains the
+      coefficients by which the input frames are multiplied for each phase,
+      starting by the frame placed ``n_taps // 2 - 1`` frames before the input
+      frame which precedes the output frame.
+
+    Examples
+    --------
+
+    >>> from waves.sound.resample import filter_table
+    >>>
+    >>> filter_table(160, 147).shape
+    (160, 36)
+    >>> filter_table(160, 147).sum(axis=1).round(12).tolist() == [1.0] * 160
+    True
+    """
+    if quality not in QUALITIES:
+        raise ValueError(
+            f"Invalid quality '{quality}', must be one of {', '.join(QUALITIES)}"
+        )
+    zero_crossings, beta, rolloff = QUALITIES[quality]
+    cutoff = rolloff * min(1, up / down)
+    half_taps = int(math.ceil(zero_crossings / cutoff))
+
+    times = np.arange(-half_taps + 1, half_taps + 1) - np.arange(up)[:, None] / up
+    window = np.i0(beta * np.sqrt(np.clip(1 - (times / half_taps) ** 2, 0, 1)))
+    table = np.sinc(cutoff * times) * window
+    table /= table.sum(axis=1, keepdims=True)  # unity gain for each phase
+
+    table.setflags(write=False)
+    return table
+
+
+@functools.lru_cache(maxsize=16)
+def _phases_matrix(up, down, quality):
+    """Builds the matrix which computes the ``up`` output frames of a period
+    from its input frames, or ``None`` if would be too large.
+    """
+    table = filter_table(up, down, quality)
+    first_frames = np.arange(up) * down // up
+    n_inputs = first_frames[-1] + table.shape[1]
+    if n_inputs * up > _MAX_MATRIX_SIZE:
+        return None
+
+    matrix = np.zeros((n_inputs, up))
+    for i, first_frame in enumerate(first_frames.tolist()):
+        phase = i * down % up
+        matrix[first_frame : first_frame + table.shape[1], i] = table[phase]
+    matrix.setflags(write=False)
+    return matrix
+
+
+class Resample(Operation):
+    """Operation which converts the sample rate of a sound.
+
+    The input frames of the last block rendered are kept, so rendering
+    consecutive blocks, as done by :py:meth:`waves.Sound.iter_chunks`, reads
+    each input frame only once even if the filter needs frames from the
+    previous block.
+
+    Parameters
+    ----------
+
+    sound : :py:class:`waves.Sound`
+      Input sound.
+
+    fps : int
+      Sample rate of the result.
+
+    quality : str, optional
+      Quality of the filter, one of :py:data:`waves.sound.resample.QUALITIES`.
+    """
+
+    def __init__(self, sound, fps, quality="medium"):
+        self.sound = sound
+        self.fps = fps
+        self.quality = quality
+
+        divisor = math.gcd(fps, sound.fps)
+        self.up, self.down = (fps // divisor, sound.fps // divisor)
+        self.table = filter_table(self.up, self.down, quality)
+        self.matrix = _phases_matrix(self.up, self.down, quality)
+
+        self._n_input_frames = sound.n_frames
+        self._input = (0, None)
+
+    def __getstate__(self):
+        # the filter is rebuilt from the cache and the kept input is discarded
+        state = self.__dict__.copy()
+        state.update(table=None, matrix=None, _input=(0, None))
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.table = filter_table(self.up, self.down, self.quality)
+        self.matrix = _phases_matrix(self.up, self.down, self.quality)
+
+    def n_frames(self, n_input_frames):
+        """Returns the number of frames of the result for a number of input
+        frames.
+        """
+        return -(-n_input_frames * self.up // self.down)
+
+    def _read_input(self, start, stop):
+        """Returns the input frames between ``start`` and ``stop`` converted to
+        floating point numbers, with silence before the first frame and after
+        the last one.
+        """
+        first = max(start, 0)
+        last = stop
+        if self._n_input_frames is not None:
+            last = min(last, self._n_input_frames)
+
+        blocks = []
+        cached_start, cached = self._input
+        if cached is not None and cached_start <= first < cached_start + len(cached):
+            blocks.append(cached[first - cached_start : last - cached_start])
+        position = first + (len(blocks[0]) if blocks else 0)
+        if position < last:
+            block = convert_samples(self.sound._read_block(position, last), np.float64)
+            if len(block) < last - position:
+                self._n_input_frames = position + len(block)
+            blocks.append(block)
+
+        channels_shape = () if self.sound.n_channels == 1 else (self.sound.n_channels,)
+        frames = np.concatenate(
+            blocks or [np.empty((0,) + channels_shape, dtype=np.float64)]
+        )
+        self._input = (first, frames)
+
+        n_after = stop - start - (first - start) - len(frames)
+        if first == start and not n_after:
+            return frames
+        return np.concatenate(
+            (
+                np.zeros((first - start,) + channels_shape),
+                frames,
+                np.zeros((n_after,) + channels_shape),
+            )
+        )
+
+    def _render_periods(self, start, stop):
+        """Renders the output frames between ``start`` and ``stop`` computing
+        whole periods of ``up`` frames by a matrix product.
+        """
+        first_period, last_period = (start // self.up, -(-stop // self.up))
+        n_periods = last_period - first_period
+        input_start = first_period * self.down - self.table.shape[1] // 2 + 1
+        n_inputs = self.matrix.shape[0]
+        frames = self._read_input(
+            input_start, input_start + (n_periods - 1) * self.down + n_inputs
+        )
+
+        block_start = start - first_period * self.up
+        block_stop = block_start + stop - start
+        if frames.ndim == 1:
+            frames = frames[:, np.newaxis]
+        channels = []
+        for channel in range(frames.shape[1]):
+            samples = np.ascontiguousarray(frames[:, channel])
+            periods = as_strided(
+                samples,
+                shape=(n_periods, n_inputs),
+                strides=(samples.strides[0] * self.down, samples.strides[0]),
+            )
+            channels.append((periods @ self.matrix).ravel()[block_start:block_stop])
+        return channels[0] if len(channels) == 1 else np.stack(channels, axis=1)
+
+    def _render_frames(self, start, stop):
+        """Renders the output frames between ``start`` and ``stop`` computing
+        each one from its input frames.
+        """
+        first_frames, phases = np.divmod(np.arange(start, stop) * self.down, self.up)
+        n_taps = self.table.shape[1]
+        input_start = first_frames[0] - n_taps // 2 + 1
+        frames = self._read_input(input_start, first_frames[-1] + n_taps // 2 + 1)
+
+        indexes = (first_frames - first_frames[0])[:, np.newaxis] + np.arange(n_taps)
+        coefficients = self.table[phases]
+        if frames.ndim == 1:
+            return np.einsum("ft,ft->f", coefficients, frames[indexes])
+        return np.stack(
+            [
+                np.einsum("ft,ft->f", coefficients, frames[:, channel][indexes])
+                for channel in range(frames.shape[1])
+            ],
+            axis=1,
+        )
+
+    def render(self, start, stop):
+        if self.matrix is None:
+            # the input frames are gathered for each output frame
+            render, blocksize = (self._render_frames, _MAX_BLOCKSIZE >> 4)
+        else:
+            render, blocksize = (self._render_periods, _MAX_BLOCKSIZE)
+
+        blocks = []
+        for block_start in range(start, stop, blocksize):
+            block_stop = min(block_start + blocksize, stop)
+            if self._n_input_frames is not None:
+                block_stop = min(block_stop, self.n_frames(self._n_input_frames))
+            if block_start >= block_stop:
+                break
+            block = render(block_start, block_stop)
+            if self._n_input_frames is not None:
+                # the end of the input could have been found rendering the block
+                block = block[: self.n_frames(self._n_input_frames) - block_start]
+            blocks.append(block)
+            if len(block) < block_stop - block_start:
+                break
+
+        if not blocks:
+            shape = (0,) if self.sound.n_channels == 1 else (0, self.sound.n_channels)
+            return np.empty(shape, dtype=self.sound.dtype)
+        samples = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        return convert_samples(samples, self.sound.dtype)
+
+
+def resample(sound, fps, quality="medium"):
+    """Converts the sample rate of a sound.
+
+    Parameters
+    ----------
+
+    fps : int
+      Number of frames per second of the result.
+
+    quality : str, optional
+      Quality of the filter used, ``"fast"``, ``"medium"`` or ``"high"``. Higher
+      qualities preserve more high frequencies and attenuate more the aliasing,
+      but use longer filters, so are slower.
+
+    Returns
+    -------
+
+    :py:class:`waves.Sound`
+      Sound with the new sample rate, rendered lazily.
+    """
+    if fps == sound.fps:
+        return sound[:]
+    operation = Resample(sound, fps, quality=quality)
+    return _new_sound(
+        sound,
+        operation,
+        fps=fps,
+        n_frames=None if sound.n_frames is None else operation.n_frames(sound.n_frames),
+    )